@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Benchmarks of the render and refresh paths across matrix sizes
+# bench.py
+#
+# On the board: copy next to neopixel_matrix.py and `import bench; bench.run(out='bench.jsonl')`
+# On a PC (host backend): python -m benchmarks.bench [--frames N] [--out FILE] [--compare OLD_FILE]
+#
+# Every measurement is printed and (optionally) appended to `out` as one JSON object per line:
+#   {"bench": "show", "geometry": "8x32", "backend": "device", "kernels": "viper", "frames": 50, "fps": 92.1,
+#    "p50_us": 10812, "p90_us": 10990, "p99_us": 11204, "max_us": 11204,
+#    "alloc_bytes_per_frame": 0, "max_frame_alloc_bytes": 0, "alloc_method": "gc.mem_alloc"}
+# `compare(old, new)` lists the benchmarks whose fps dropped by more than a threshold.
+
+import gc
+import json
+import sys
+
+try: import neopixel_matrix as neopixel_matrix_module
+except ImportError: import micropython_neopixel_matrix.neopixel_matrix as neopixel_matrix_module
+
+try: import effects
+except ImportError: import micropython_neopixel_matrix.effects as effects
+
+try: from backend import utime, HOST
+except ImportError: from micropython_neopixel_matrix.backend import utime, HOST
+
+try: import kernels
+except ImportError: import micropython_neopixel_matrix.kernels as kernels
+
+NeoPixelMatrix = neopixel_matrix_module.NeoPixelMatrix
+Color = neopixel_matrix_module.Color
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+DATA_PIN = 23
+# (width, height): 8x32 up to 64x64
+GEOMETRIES = ((32, 8), (32, 16), (32, 32), (64, 32), (64, 64))
+FRAMES = 50
+WARMUP_FRAMES = 3
+
+
+class _NoCollect:
+    """
+    Stands in for the `gc` module inside neopixel_matrix while allocations are counted,
+    so an explicit `gc.collect()` in the refresh path doesn't hide them.
+    """
+
+    @staticmethod
+    def collect() -> None:
+        pass
+
+    def __getattr__(self, name:str):
+        return getattr(gc, name)
+
+
+def cases(matrix):
+    """
+    Return (name, frame) pairs for every measured operation on the given matrix.
+    Each `frame(i)` renders and shows frame number `i`; consecutive frames differ,
+    so unchanged-frame skipping doesn't flatter the numbers.
+    """
+    colors = (Color.RED, Color.BLUE)
+
+    def show(i):
+        matrix.fb.pixel(0, 0, i & 1)
+        matrix.mark_dirty()
+        matrix.show()
+
+    def fill(i):
+        matrix.fill(colors[i & 1])
+        matrix.show()
+
+    def text(i):
+        matrix.text(str(i % 1000), color=Color.GREEN)
+
+    def progress_bar(i):
+        matrix.draw_progress_bar(i % 100, 100, color=Color.ORANGE)
+
+    def scroll(mode):
+        state = [None]
+
+        def scroll_step(i):
+            try:
+                next(state[0])
+            except (StopIteration, TypeError):
+                matrix.scroll_mode = mode
+                state[0] = matrix._scroll_steps("The quick brown fox jumps over the lazy dog", 0, 0, Color.YELLOW, True, True)
+                next(state[0])
+            matrix.show()
+        return scroll_step
+
+    def effect(effect_class, *args):
+        instance = effect_class(matrix, *args)
+
+        def effect_frame(i):
+            matrix._show_effect(instance, i)
+        return effect_frame
+
+    return (
+        ("show", show),
+        ("fill", fill),
+        ("text", text),
+        ("draw_progress_bar", progress_bar),
+        ("scroll_text_step", scroll(NeoPixelMatrix.SCROLL_FRAMEBUFFER)),
+        ("scroll_text_step_viewport", scroll(NeoPixelMatrix.SCROLL_VIEWPORT)),
+        ("effect_rainbow", effect(effects.Rainbow)),
+        ("effect_gradient", effect(effects.Gradient, Color.BLUE, Color.ORANGE, 2)),
+        ("effect_plasma", effect(effects.Plasma)),
+        ("effect_fire", effect(effects.Fire)),
+        ("effect_sparkle", effect(effects.Sparkle)),
+    )
+
+
+def percentile(sorted_values:list, p:int) -> int:
+    return sorted_values[min(len(sorted_values) - 1, (len(sorted_values) * p) // 100)]
+
+
+def measure_time(frame, frames:int) -> dict:
+    """
+    Time `frames` calls of `frame(i)` with `utime.ticks_us()`.
+    """
+    for i in range(WARMUP_FRAMES):
+        frame(i)
+
+    latencies = []
+    total_start = utime.ticks_us()
+    for i in range(frames):
+        start = utime.ticks_us()
+        frame(i)
+        latencies.append(utime.ticks_diff(utime.ticks_us(), start))
+    total = utime.ticks_diff(utime.ticks_us(), total_start)
+
+    latencies.sort()
+    return {
+        "frames": frames,
+        "fps": round(frames * 1000000 / max(1, total), 1),
+        "p50_us": percentile(latencies, 50),
+        "p90_us": percentile(latencies, 90),
+        "p99_us": percentile(latencies, 99),
+        "max_us": latencies[-1],
+    }
+
+
+def measure_allocations(frame, frames:int) -> dict:
+    """
+    Count the heap allocated per frame and the most any single frame allocated.
+
+    On MicroPython this uses `gc.mem_alloc()` with the collector disabled, so both are gross numbers
+    of bytes allocated; the result says nothing about the peak size of the heap. On CPython it uses
+    `tracemalloc`: the bytes still allocated after the frames, and the largest growth of the traced
+    memory during one frame.
+    """
+    collector = neopixel_matrix_module.gc
+    neopixel_matrix_module.gc = _NoCollect()
+    try:
+        if hasattr(gc, 'mem_alloc'):
+            gc.collect()
+            gc.disable()
+            try:
+                start = gc.mem_alloc()
+                most = 0
+                for i in range(frames):
+                    before = gc.mem_alloc()
+                    frame(i)
+                    most = max(most, gc.mem_alloc() - before)
+                allocated = gc.mem_alloc() - start
+            finally:
+                gc.enable()
+                gc.collect()
+            return {"alloc_bytes_per_frame": allocated // frames, "max_frame_alloc_bytes": most, "alloc_method": "gc.mem_alloc"}
+
+        if tracemalloc is None:
+            return {"alloc_method": None}
+
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            most = 0
+            for i in range(frames):
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                frame(i)
+                most = max(most, tracemalloc.get_traced_memory()[1] - before)
+            allocated = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+        return {"alloc_bytes_per_frame": allocated // frames, "max_frame_alloc_bytes": most, "alloc_method": "tracemalloc"}
+    finally:
+        neopixel_matrix_module.gc = collector
+
+
+def run(frames:int=FRAMES, geometries=GEOMETRIES, out:str=None, only:tuple=None) -> list:
+    """
+    Run all benchmarks and return the result records; with `out`, also append them to that file.
+
+    Arguments:
+        (Optional:)
+        - frames     : int:    Frames measured per benchmark. Defaults to 50.
+        - geometries : tuple:  (width, height) pairs to benchmark. Defaults to 8x32 ... 64x64.
+        - out        : str:    A file to append the JSON records to. Defaults to None.
+        - only       : tuple:  Names of the benchmarks to run. Defaults to all of them.
+    """
+    backend_name = "host" if HOST else "device"
+    kernels_name = "viper" if kernels.NATIVE else "python"
+    results = []
+
+    for width, height in geometries:
+        geometry = "{}x{}".format(height, width)
+        try:
+            matrix = NeoPixelMatrix(DATA_PIN, width, height, brightness=0.5)
+        except MemoryError:
+            record = {"bench": "setup", "geometry": geometry, "backend": backend_name, "error": "MemoryError"}
+            _emit(record, results, out)
+            continue
+
+        for name, frame in cases(matrix):
+            if only and name not in only:
+                continue
+            record = {"bench": name, "geometry": geometry, "backend": backend_name, "kernels": kernels_name}
+            try:
+                record.update(measure_time(frame, frames))
+                record.update(measure_allocations(frame, max(1, frames // 5)))
+            except MemoryError:
+                record["error"] = "MemoryError"
+            _emit(record, results, out)
+
+        del matrix
+        gc.collect()
+
+    return results
+
+
+def _emit(record:dict, results:list, out:str) -> None:
+    results.append(record)
+    line = json.dumps(record)
+    print(line)
+    if out:
+        with open(out, "a") as f:
+            f.write(line + "\n")
+
+
+def load(path:str) -> list:
+    """
+    Read the records of a results file written by `run(out=...)`.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(old:list, new:list, threshold:float=0.1) -> list:
+    """
+    Compare two result lists and return the regressions: benchmarks whose fps dropped by more than
+    `threshold` (relative), as (bench, geometry, old_fps, new_fps) tuples. Only runs with the same
+    backend and kernels (see kernels.py) are compared.
+    """
+    baseline = {}
+    for record in old:
+        if "fps" in record:
+            baseline[_compare_key(record)] = record["fps"]
+
+    regressions = []
+    for record in new:
+        key = _compare_key(record)
+        if "fps" in record and key in baseline and record["fps"] < baseline[key] * (1 - threshold):
+            regressions.append((record["bench"], record["geometry"], baseline[key], record["fps"]))
+    return regressions
+
+
+def _compare_key(record:dict) -> tuple:
+    # Records written before the kernels were recorded have no "kernels" field
+    return record["bench"], record["geometry"], record["backend"], record.get("kernels")
+
+
+def main(argv:list) -> int:
+    frames, out, old = FRAMES, None, None
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == "--frames":
+            frames = int(args.pop(0))
+        elif arg == "--out":
+            out = args.pop(0)
+        elif arg == "--compare":
+            old = args.pop(0)
+        else:
+            print("usage: bench.py [--frames N] [--out FILE] [--compare OLD_FILE]")
+            return 2
+
+    results = run(frames=frames, out=out)
+    if old:
+        regressions = compare(load(old), results)
+        for bench, geometry, old_fps, new_fps in regressions:
+            print("REGRESSION {} {}: {} -> {} fps".format(bench, geometry, old_fps, new_fps))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
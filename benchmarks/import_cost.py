@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Time and heap taken by importing the package and its modules
+# import_cost.py
+#
+# On the board: copy next to the package (or the flat modules) and `import import_cost; import_cost.run()`
+# On a PC (host backend): python -m benchmarks.import_cost
+#
+# Every import starts from a clean slate: the modules of the package are removed from `sys.modules`
+# first. The heap is measured with `gc.mem_free()` on MicroPython and `tracemalloc` on CPython.
+
+import gc
+import sys
+
+try:
+    import utime as _time
+    ticks_us, ticks_diff = _time.ticks_us, _time.ticks_diff
+except ImportError:
+    import time as _time
+    ticks_us, ticks_diff = lambda: int(_time.perf_counter() * 1000000), lambda a, b: a - b
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# What a sync-only program imports, the package as a whole and the optional modules
+PACKAGE_IMPORTS = (
+    "micropython_neopixel_matrix",
+    "micropython_neopixel_matrix.neopixel_matrix",
+    "micropython_neopixel_matrix.neopixel_matrix_async",
+    "micropython_neopixel_matrix.neopixel_matrix_mock",
+)
+FLAT_IMPORTS = ("neopixel_matrix", "neopixel_matrix_async", "neopixel_matrix_mock")
+# The modules of the package as named in `sys.modules` in a flat deployment
+FLAT_MODULES = ("backend", "canvas", "kernels", "kernels_viper", "layers", "neopixel_matrix",
+                "neopixel_matrix_async", "neopixel_matrix_mock", "text_cache", "font", "outputs",
+                "display_list", "effects", "animation", "widgets", "receiver", "recorder")
+REPEATS = 5
+
+
+def _forget() -> None:
+    """
+    Remove the package's modules from `sys.modules`, so the next import runs them again.
+    """
+    for name in list(sys.modules):
+        if name.startswith("micropython_neopixel_matrix") or name in FLAT_MODULES:
+            del sys.modules[name]
+    gc.collect()
+
+
+def measure(name:str) -> dict:
+    """
+    Import a module from scratch and return the time and heap it took.
+
+    Arguments:
+        - name : str:  The module to import, e.g. "micropython_neopixel_matrix".
+    """
+    _forget()
+    if hasattr(gc, 'mem_free'):
+        free = gc.mem_free()
+        start = ticks_us()
+        __import__(name)
+        elapsed = ticks_diff(ticks_us(), start)
+        gc.collect()
+        return {"import": name, "us": elapsed, "heap_bytes": free - gc.mem_free(), "heap_method": "gc.mem_free"}
+
+    if tracemalloc is not None:
+        tracemalloc.start()
+    try:
+        start = ticks_us()
+        __import__(name)
+        elapsed = ticks_diff(ticks_us(), start)
+        heap = tracemalloc.get_traced_memory()[0] if tracemalloc is not None else None
+    finally:
+        if tracemalloc is not None:
+            tracemalloc.stop()
+    return {"import": name, "us": elapsed, "heap_bytes": heap, "heap_method": "tracemalloc" if heap is not None else None}
+
+
+def run(imports:tuple=None, repeats:int=REPEATS) -> list:
+    """
+    Measure every import `repeats` times, print the best time and the heap of each and return them.
+
+    Arguments:
+        (Optional:)
+        - imports : tuple:  The modules to import. Defaults to the package's, or the flat modules if there is no package.
+        - repeats : int:    Imports measured per module. Defaults to 5.
+    """
+    if imports is None:
+        try:
+            __import__("micropython_neopixel_matrix")
+            imports = PACKAGE_IMPORTS
+        except ImportError:
+            imports = FLAT_IMPORTS
+
+    results = []
+    for name in imports:
+        records = [measure(name) for _ in range(repeats)]
+        record = min(records, key=lambda r: r["us"])
+        record["heap_bytes"] = min(r["heap_bytes"] for r in records) if record["heap_bytes"] is not None else None
+        print("{:52} {:8} us {:8} bytes".format(name, record["us"], record["heap_bytes"]))
+        results.append(record)
+    _forget()
+    return results
+
+
+if __name__ == '__main__':
+    run()
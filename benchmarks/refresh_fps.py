@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Frames/sec of the framebuffer -> NeoPixel refresh, per-pixel loop vs. precomputed pixel map
+# refresh_fps.py
+#
+# On the board: copy next to neopixel_matrix.py and `import refresh_fps; refresh_fps.run()`
+# On a PC (host backend): python -m benchmarks.refresh_fps
+
+try: from neopixel_matrix import NeoPixelMatrix, Color
+except ImportError: from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix, Color
+
+try: from backend import utime
+except ImportError: from micropython_neopixel_matrix.backend import utime
+
+import gc
+
+DATA_PIN = 23
+GEOMETRIES = ((32, 8), (32, 16), (64, 32))  # (width, height): 8x32, 16x32 and 32x64 panels
+FRAMES = 20
+
+
+def legacy_update_np_from_fb(matrix) -> None:
+    """
+    The refresh loop as it was before the pixel map: zig-zag order, `_transform_coordinates()`
+    and `fb.pixel()` evaluated for every pixel on every frame.
+    """
+    gc.collect()
+    counter = 0
+    matrix.np.fill(matrix.bg_color)
+    for w in reversed(range(matrix.width)):
+        if w % 2 == 0:
+            row_order = reversed(range(matrix.height))
+        else:
+            row_order = range(matrix.height)
+
+        for h in row_order:
+            x, y = matrix._transform_coordinates(w, h)
+            rgb565 = matrix.fb.pixel(x, y)
+            rgb888_pixel = matrix._apply_brightness(Color.rgb565_to_rgb888(rgb565))
+            if rgb888_pixel != matrix.bg_color:
+                matrix.np[counter] = rgb888_pixel
+            counter += 1
+
+
+def frames_per_second(refresh, frames:int=FRAMES) -> float:
+    """
+    Run `refresh()` `frames` times and return the achieved frames per second.
+    `np.write()` is left out on purpose: its ~30 µs per LED is fixed by the WS2812 protocol.
+    """
+    start = utime.ticks_us()
+    for _ in range(frames):
+        refresh()
+    elapsed_us = utime.ticks_diff(utime.ticks_us(), start)
+    return frames * 1000000 / elapsed_us
+
+
+def run(frames:int=FRAMES) -> None:
+    print("{:>8} {:>12} {:>12} {:>8}".format("geometry", "before fps", "after fps", "speedup"))
+    for width, height in GEOMETRIES:
+        matrix = NeoPixelMatrix(DATA_PIN, width, height, brightness=0.5)
+        matrix.manual_refresh = True
+        matrix.text("Bench", 0, 0, Color.ORANGE)
+
+        before = frames_per_second(lambda: legacy_update_np_from_fb(matrix), frames)
+        after = frames_per_second(matrix._update_np_from_fb, frames)
+        print("{:>8} {:>12.1f} {:>12.1f} {:>7.2f}x".format(
+            "{}x{}".format(height, width), before, after, after / before))
+
+        del matrix
+        gc.collect()
+
+
+if __name__ == '__main__':
+    run()
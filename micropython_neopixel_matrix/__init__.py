@@ -1,3 +1,30 @@
-from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
-import micropython_neopixel_matrix.neopixel_matrix_async
-import micropython_neopixel_matrix.neopixel_matrix_mock
\ No newline at end of file
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# __init__.py
+
+# Nothing is imported up front: the names below and the submodules load on first access
+# (`from micropython_neopixel_matrix import NeoPixelMatrix`, `micropython_neopixel_matrix.neopixel_matrix_async`),
+# so a sync-only program never pays for the async and mock modules or uasyncio.
+
+# name -> the submodule defining it
+_EXPORTS = {
+    'Color': 'neopixel_matrix',
+    'NeoPixelMatrix': 'neopixel_matrix',
+    'NeoPixelMatrixAsync': 'neopixel_matrix_async',
+    'MockNeoPixelMatrix': 'neopixel_matrix_mock',
+}
+_SUBMODULES = ('neopixel_matrix', 'neopixel_matrix_async', 'neopixel_matrix_mock')
+
+
+def __getattr__(name:str):
+    if name in _EXPORTS:
+        module = __import__('micropython_neopixel_matrix.' + _EXPORTS[name], None, None, (name,))
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = __import__('micropython_neopixel_matrix.' + name, None, None, (name,))
+    else:
+        raise AttributeError(name)
+    # Later lookups find it directly
+    globals()[name] = value
+    return value
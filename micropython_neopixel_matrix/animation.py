@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# animation.py
+
+try: import ustruct as struct
+except ImportError: import struct
+
+# Animation file layout (little-endian), written by tools/anim_encode.py:
+#
+#   header   : magic b'NPXA', version (B), flags (B), width (H), height (H), frame count (H), colors (H)
+#   palette  : colors * (r, g, b) bytes
+#   frames   : duration in ms (H), flags (B), payload length (I), payload
+#
+# A payload is a sequence of (skip, count, index) byte triples, walking the pixels row by row:
+# skip `skip` pixels (they keep the color of the previous frame), then set `count` pixels to
+# palette color `index`. Pixels after the last triple are unchanged as well. Key frames
+# (flag bit 0) set every pixel; the first frame always is one.
+MAGIC = b'NPXA'
+VERSION = 1
+HEADER = '<4sBBHHHH'
+FRAME_HEADER = '<HBI'
+KEY_FRAME = 0x01
+
+
+class AnimationReader:
+    """
+    Streams the frames of an animation file into a NeoPixel byte buffer.
+
+    Only the header, the palette and one small read buffer are held in RAM; every frame is read
+    with `readinto()` in chunks of `chunk_size` bytes and decoded straight into the strip buffer.
+
+    Arguments:
+        - stream     : file:  The animation file, opened in binary mode.
+        (Optional:)
+        - chunk_size : int:   The size of the read buffer in bytes (rounded down to whole triples). Defaults to 768.
+    """
+
+    def __init__(self, stream, chunk_size:int=768) -> None:
+        self.stream = stream
+        header = stream.read(struct.calcsize(HEADER))
+        magic, version, _, self.width, self.height, self.frame_count, colors = struct.unpack(HEADER, header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an animation file of version {}".format(VERSION))
+        self.palette = stream.read(colors * 3)
+        self._frames_start = len(header) + colors * 3
+        self._frame_header = bytearray(struct.calcsize(FRAME_HEADER))
+        self._chunk = bytearray(max(3, chunk_size - chunk_size % 3))
+        self._chunk_view = memoryview(self._chunk)
+        self.frame = 0
+
+    def rewind(self) -> None:
+        """
+        Go back to the first frame.
+        """
+        self.stream.seek(self._frames_start)
+        self.frame = 0
+
+    def read_frame(self, np_buf, strip_index, palette_r, palette_g, palette_b, order:tuple) -> int:
+        """
+        Decode the next frame into the NeoPixel byte buffer, on top of the previous one.
+
+        Arguments:
+            - np_buf       : bytearray:  The NeoPixel byte buffer.
+            - strip_index  : array:      The strip index of every pixel, row by row (see `NeoPixelMatrix._build_pixel_map()`).
+            - palette_r    : bytearray:  The strip byte of the red channel of every palette color.
+            - palette_g    : bytearray:  The same for green.
+            - palette_b    : bytearray:  The same for blue.
+            - order        : tuple:      The byte positions of red, green and blue in a strip pixel.
+
+        Return value:
+            - duration     : int:        How long the frame is shown in ms, or None after the last frame.
+        """
+        if self.frame >= self.frame_count:
+            return None
+        stream = self.stream
+        if stream.readinto(self._frame_header) != len(self._frame_header):
+            return None
+        duration, _, remaining = struct.unpack(FRAME_HEADER, self._frame_header)
+
+        o_r, o_g, o_b = order[0], order[1], order[2]
+        chunk = self._chunk
+        chunk_view = self._chunk_view
+        i = 0
+        while remaining > 0:
+            size = min(remaining, len(chunk))
+            n = stream.readinto(chunk_view[:size]) if size < len(chunk) else stream.readinto(chunk)
+            if n != size:
+                raise ValueError("Animation file is truncated")
+            remaining -= n
+            for k in range(0, n, 3):
+                i += chunk[k]
+                count = chunk[k + 1]
+                color = chunk[k + 2]
+                r = palette_r[color]
+                g = palette_g[color]
+                b = palette_b[color]
+                for _ in range(count):
+                    j = strip_index[i] * 3
+                    np_buf[j + o_r] = r
+                    np_buf[j + o_g] = g
+                    np_buf[j + o_b] = b
+                    i += 1
+
+        self.frame += 1
+        return duration
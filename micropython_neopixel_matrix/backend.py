@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# backend.py
+
+# The hardware modules the library is built on. On MicroPython these are the real
+# `machine`, `neopixel`, `framebuf`, `utime` and `uasyncio` modules; anywhere they are
+# missing (CPython on a PC, CI) the pure-Python stand-ins in `host_backend.py` take
+# their place, so the whole rendering pipeline runs, can be profiled and tested there.
+# `asyncio` is only imported when it is first asked for (see `__getattr__()`).
+#
+# Set the environment variable NEOPIXEL_MATRIX_BACKEND=host to use the stand-ins even
+# if modules with these names happen to be installed.
+
+try:
+    from os import environ
+    _force_host = environ.get('NEOPIXEL_MATRIX_BACKEND') == 'host'
+except ImportError:
+    _force_host = False
+
+HOST = _force_host
+if not HOST:
+    try:
+        import machine
+        import neopixel
+        import framebuf
+        import utime
+    except ImportError:
+        HOST = True
+
+if HOST:
+    try: import host_backend
+    except ImportError: from micropython_neopixel_matrix import host_backend
+    machine = neopixel = framebuf = utime = host_backend
+
+
+def __getattr__(name:str):
+    # `from backend import asyncio`: import it now, sync-only programs never load uasyncio
+    if name != 'asyncio':
+        raise AttributeError(name)
+    global asyncio
+    if HOST:
+        asyncio = host_backend.asyncio
+    else:
+        try: import uasyncio as asyncio
+        except ImportError: import asyncio
+    return asyncio
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# canvas.py
+
+try: from backend import framebuf
+except ImportError: from micropython_neopixel_matrix.backend import framebuf
+
+try: import kernels
+except ImportError: from micropython_neopixel_matrix import kernels
+
+
+class GRBCanvas:
+    """
+    A drawing surface whose buffer has the byte layout of the NeoPixel strip itself.
+
+    Pixels are stored in strip order (through the matrix' pixel map) with the strip's
+    byte order (GRB on WS2812b) and full 8 bits per channel, so a refresh only has to scale the
+    bytes by the brightness, or just copy them at full brightness. The drawing methods follow
+    `framebuf.FrameBuffer` (same names, arguments, clipping and algorithms); colors are 24-bit
+    integers 0xRRGGBB instead of RGB565 values.
+
+    Canvases are created by `NeoPixelMatrix(..., canvas=NeoPixelMatrix.CANVAS_GRB888)`.
+
+    Arguments:
+        - width       : int:    The width of the canvas in pixels.
+        - height      : int:    The height of the canvas in pixels.
+        - strip_index : array:  The strip index of every pixel, row by row (y * width + x).
+        (Optional:)
+        - order       : tuple:  The byte positions of red, green and blue in a strip pixel. Defaults to GRB.
+    """
+
+    def __init__(self, width:int, height:int, strip_index, order:tuple=(1, 0, 2, 3)) -> None:
+        self.width = width
+        self.height = height
+        self.buf = bytearray(width * height * 3)
+        self._strip_index = strip_index
+        self._o_r, self._o_g, self._o_b = order[0], order[1], order[2]
+
+        # 1-bit scratch bitmap for text: the glyphs overlapping the canvas plus one on either side
+        self._text_width = ((width + 7) // 8 + 2) * 8
+        self._text_fb = framebuf.FrameBuffer(bytearray(self._text_width), self._text_width, 8, framebuf.MONO_HLSB)
+
+        # Parameters of the scroll kernel
+        self._job = kernels.new_job()
+        self._job[kernels.WIDTH] = width
+
+    def remap(self, strip_index) -> None:
+        """
+        Switch to a new pixel map (e.g. after a direction change), keeping the picture.
+        """
+        old_buf = bytes(self.buf)
+        old_index = self._strip_index
+        buf = self.buf
+        for i in range(self.width * self.height):
+            src = old_index[i] * 3
+            dst = strip_index[i] * 3
+            buf[dst] = old_buf[src]
+            buf[dst + 1] = old_buf[src + 1]
+            buf[dst + 2] = old_buf[src + 2]
+        self._strip_index = strip_index
+
+    # -- pixel access ------------------------------------------------------
+
+    def _set(self, x:int, y:int, c:int) -> None:
+        i = self._strip_index[y * self.width + x] * 3
+        buf = self.buf
+        buf[i + self._o_r] = (c >> 16) & 0xFF
+        buf[i + self._o_g] = (c >> 8) & 0xFF
+        buf[i + self._o_b] = c & 0xFF
+
+    def _get(self, x:int, y:int) -> int:
+        i = self._strip_index[y * self.width + x] * 3
+        buf = self.buf
+        return (buf[i + self._o_r] << 16) | (buf[i + self._o_g] << 8) | buf[i + self._o_b]
+
+    def pixel(self, x:int, y:int, c:int=None):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+        return None
+
+    # -- fills -------------------------------------------------------------
+
+    def fill(self, c:int) -> None:
+        # Every pixel gets the same three bytes, so the strip order doesn't matter here:
+        # set the first pixel and keep doubling the filled part
+        buf = self.buf
+        buf[self._o_r] = (c >> 16) & 0xFF
+        buf[self._o_g] = (c >> 8) & 0xFF
+        buf[self._o_b] = c & 0xFF
+        view = memoryview(buf)
+        n = len(buf)
+        filled = 3
+        while filled < n:
+            k = min(filled, n - filled)
+            view[filled:filled + k] = view[0:k]
+            filled += k
+
+    def fill_rect(self, x:int, y:int, w:int, h:int, c:int) -> None:
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 or y >= self.height or x >= self.width:
+            return
+        xend = min(self.width, x + w)
+        yend = min(self.height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+
+        buf = self.buf
+        strip_index = self._strip_index
+        width = self.width
+        r, g, b = (c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF
+        o_r, o_g, o_b = self._o_r, self._o_g, self._o_b
+        for yy in range(y, yend):
+            row = yy * width
+            for xx in range(x, xend):
+                i = strip_index[row + xx] * 3
+                buf[i + o_r] = r
+                buf[i + o_g] = g
+                buf[i + o_b] = b
+
+    def hline(self, x:int, y:int, w:int, c:int) -> None:
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x:int, y:int, h:int, c:int) -> None:
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x:int, y:int, w:int, h:int, c:int, f:bool=False) -> None:
+        if f:
+            self.fill_rect(x, y, w, h, c)
+        else:
+            self.fill_rect(x, y, w, 1, c)
+            self.fill_rect(x, y + h - 1, w, 1, c)
+            self.fill_rect(x, y, 1, h, c)
+            self.fill_rect(x + w - 1, y, 1, h, c)
+
+    # -- lines and polygons ------------------------------------------------
+
+    def line(self, x1:int, y1:int, x2:int, y2:int, c:int) -> None:
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+
+        w, h = self.width, self.height
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                if 0 <= y1 < w and 0 <= x1 < h:
+                    self._set(y1, x1, c)
+            elif 0 <= x1 < w and 0 <= y1 < h:
+                self._set(x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+
+        if 0 <= x2 < w and 0 <= y2 < h:
+            self._set(x2, y2, c)
+
+    def poly(self, x:int, y:int, coords, c:int, f:bool=False) -> None:
+        n = len(coords) // 2
+        if n == 0:
+            return
+
+        if not f:
+            px1, py1 = coords[0], coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                px2, py2 = coords[i - 1], coords[i]
+                self.line(x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+                i -= 2
+            return
+
+        y_min = y_max = coords[1]
+        for i in range(3, n * 2, 2):
+            y_min = min(y_min, coords[i])
+            y_max = max(y_max, coords[i])
+
+        for row in range(y_min, y_max + 1):
+            nodes = []
+            px1, py1 = coords[0], coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                px2, py2 = coords[i - 1], coords[i]
+                if py1 != py2 and ((py1 > row >= py2) or (py1 <= row < py2)):
+                    # Fixed point, rounded like framebuf's C integer division (towards zero)
+                    num = 32 * (px2 - px1) * (row - py1)
+                    den = py2 - py1
+                    q = abs(num) // abs(den)
+                    if (num < 0) != (den < 0):
+                        q = -q
+                    total = 32 * px1 + q + 16
+                    node = abs(total) // 32
+                    nodes.append(node if total >= 0 else -node)
+                elif row == max(py1, py2):
+                    if py1 < py2:
+                        self.pixel(x + px2, y + py2, c)
+                    elif py2 < py1:
+                        self.pixel(x + px1, y + py1, c)
+                    else:
+                        self.line(x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+                i -= 2
+
+            nodes.sort()
+            for i in range(0, len(nodes) - 1, 2):
+                self.fill_rect(x + nodes[i], y + row, nodes[i + 1] - nodes[i] + 1, 1, c)
+
+    # -- text, scroll and blit ---------------------------------------------
+
+    def text(self, s:str, x:int, y:int, c:int=0xFFFFFF) -> None:
+        """
+        Draw text with framebuf's 8x8 font; only the glyphs overlapping the canvas are rendered.
+        """
+        if y <= -8 or y >= self.height:
+            return
+        first = max(0, -x // 8)
+        last = min(len(s), (self.width - x + 7) // 8)
+        if first >= last:
+            return
+
+        # Render the visible glyphs into the 1-bit scratch bitmap, then copy its set pixels
+        text_fb = self._text_fb
+        text_fb.fill(0)
+        origin = x + first * 8  # canvas x of the scratch bitmap's column 0
+        text_fb.text(s[first:last], 0, 0, 1)
+
+        x0 = max(0, origin)
+        x1 = min(self.width, origin + (last - first) * 8)
+        for yy in range(max(0, y), min(self.height, y + 8)):
+            for xx in range(x0, x1):
+                if text_fb.pixel(xx - origin, yy - y):
+                    self._set(xx, yy, c)
+
+    def scroll(self, xstep:int, ystep:int) -> None:
+        if xstep < 0:
+            sx, xend = 0, self.width + xstep
+            if xend <= 0:
+                return
+        else:
+            sx, xend = self.width - 1, xstep - 1
+            if xend >= sx:
+                return
+        if ystep < 0:
+            y, yend = 0, self.height + ystep
+            if yend <= 0:
+                return
+        else:
+            y, yend = self.height - 1, ystep - 1
+            if yend >= y:
+                return
+
+        job = self._job
+        job[kernels.X0], job[kernels.X1] = sx, xend
+        job[kernels.Y0], job[kernels.Y1] = y, yend
+        job[kernels.XSTEP], job[kernels.YSTEP] = xstep, ystep
+        kernels.shift(self.buf, self._strip_index, job)
+
+    def blit(self, source, x:int, y:int, key:int=-1) -> None:
+        """
+        Copy another `GRBCanvas` onto this one at (x, y); pixels of color `key` are skipped.
+        """
+        if x >= self.width or y >= self.height or -x >= source.width or -y >= source.height:
+            return
+        x0, y0 = max(0, x), max(0, y)
+        x0end = min(self.width, x + source.width)
+        y0end = min(self.height, y + source.height)
+
+        for yy in range(y0, y0end):
+            for xx in range(x0, x0end):
+                col = source._get(xx - x, yy - y)
+                if col != key:
+                    self._set(xx, yy, col)
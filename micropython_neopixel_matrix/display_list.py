@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# display_list.py
+
+try: from collections import OrderedDict
+except ImportError: from ucollections import OrderedDict
+
+# Operation codes of a display list entry; the rest of the entry are the arguments
+FILL = 0
+PIXEL = 1
+LINE = 2
+RECT = 3
+TEXT = 4
+PROGRESS_BAR = 5
+BLIT = 6
+
+
+class DisplayList:
+    """
+    A recorded sequence of drawing operations, shown as one scene by `NeoPixelMatrix.show_list()`.
+
+    Recording doesn't draw anything. The list is replayed onto the background color in one pass
+    and refreshed once, however many primitives it has. Lists with the same operations have the
+    same `key`, under which a `SceneCache` keeps the rasterized scene, so showing an unchanged
+    scene again skips the drawing and the conversion.
+
+    Colors are RGB tuples or lists (or palette indices on an indexed canvas), as for the drawing
+    methods of `NeoPixelMatrix`; they are recorded as tuples, so the key stays hashable. Blit
+    sources are part of the key by identity: pass a new `version` when the content of a source
+    changes.
+
+    Example usage:
+
+        scene = DisplayList()
+        scene.rect((0, 0), (31, 7), Color.BLUE, fill=False)
+        scene.text("12:30", 2, 0, Color.WHITE)
+        matrix.show_list(scene)
+    """
+
+    def __init__(self) -> None:
+        self.ops = []
+        self._key = None
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def key(self) -> tuple:
+        """
+        The content of the list as a hashable tuple; equal lists have equal keys.
+        """
+        if self._key is None:
+            self._key = tuple(self.ops)
+        return self._key
+
+    def _add(self, op:tuple) -> None:
+        self.ops.append(op)
+        self._key = None
+
+    @staticmethod
+    def _color(color):
+        # A list can't be part of the key
+        return color if isinstance(color, (int, tuple)) else tuple(color)
+
+    def clear(self) -> None:
+        """
+        Remove all operations.
+        """
+        self.ops = []
+        self._key = None
+
+    def fill(self, color:tuple) -> None:
+        self._add((FILL, DisplayList._color(color)))
+
+    def pixel(self, x:int, y:int, color:tuple) -> None:
+        self._add((PIXEL, x, y, DisplayList._color(color)))
+
+    def line(self, pos1:tuple, pos2:tuple, color:tuple) -> None:
+        self._add((LINE, pos1[0], pos1[1], pos2[0], pos2[1], DisplayList._color(color)))
+
+    def rect(self, pos1:tuple, pos2:tuple, color:tuple, fill:bool=True) -> None:
+        self._add((RECT, pos1[0], pos1[1], pos2[0], pos2[1], DisplayList._color(color), fill))
+
+    def text(self, string:str, x:int=0, y:int=0, color:tuple=(255, 0, 0), center:bool=False) -> None:
+        """
+        Record a text. Unlike `NeoPixelMatrix.text()` it doesn't clear the display; text beyond its
+        right edge is clipped.
+        """
+        self._add((TEXT, string, x, y, DisplayList._color(color), center))
+
+    def progress_bar(self, progress:int, max_progress:int, color:tuple=(255, 0, 0), margin:int=2, height:int=4) -> None:
+        """
+        Record a progress bar, like `NeoPixelMatrix.draw_progress_bar()` draws it (without clearing the display).
+        """
+        self._add((PROGRESS_BAR, progress, max_progress, DisplayList._color(color), margin, height))
+
+    def blit(self, source, x:int, y:int, key:int=-1, version:int=0) -> None:
+        """
+        Record a blit of a framebuffer (in the format of the canvas) at (x, y); `key` is the transparent color.
+        """
+        self._add((BLIT, source, x, y, key, version))
+
+    def render(self, matrix) -> None:
+        """
+        Draw the operations onto the framebuffer of the matrix, which is cleared to its background color first.
+        """
+        fb = matrix.fb
+        color = matrix._color
+        fb.fill(color(matrix.bg_color))
+        for op in self.ops:
+            code = op[0]
+            if code == FILL:
+                fb.fill(color(op[1]))
+            elif code == PIXEL:
+                fb.pixel(op[1], op[2], color(op[3]))
+            elif code == LINE:
+                fb.line(op[1], op[2], op[3], op[4], color(op[5]))
+            elif code == RECT:
+                x0, y0, x1, y1 = op[1], op[2], op[3], op[4]
+                fb.poly(0, 0, bytearray([x0, y0, x1, y0, x1, y1, x0, y1]), color(op[5]), op[6])
+            elif code == TEXT:
+                x = matrix._center_text(op[1]) if op[5] else op[2]
+                matrix._draw_text_to_buffer(op[1], x, op[3], op[4], fb)
+            elif code == PROGRESS_BAR:
+                progress, max_progress, c, margin, height = op[1], op[2], color(op[3]), op[4], op[5]
+                max_width = matrix.width - (2*margin)
+                current_width = round(max_width / max_progress * progress)
+                fb.fill_rect(2, margin, current_width, height, c)
+                fb.rect(2, margin, max_width, height, c)
+            elif code == BLIT:
+                fb.blit(op[1], op[2], op[3], op[4])
+
+
+class SceneCache:
+    """
+    A least-recently-used cache of rasterized display lists, keyed by their content and the
+    background color and font of the matrix.
+
+    Every entry holds a copy of the framebuffer and of the strip bytes it converts to; showing a
+    cached scene copies both back. The entries belong to one output version of the matrix: once the
+    brightness, gamma, palette, wiring or framebuffer size changed, the cache is cleared on the next
+    lookup, so no bytes are kept for scenes that would have to be converted again. Entries are
+    evicted, least recently used first, once they together exceed `max_bytes`.
+
+    Example usage:
+
+        matrix = NeoPixelMatrix(23, 32, 8, scene_cache=SceneCache(max_bytes=8192))
+    """
+
+    def __init__(self, max_bytes:int=4096) -> None:
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._version = None  # the output version of the matrix the entries were converted with
+
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def reset_stats(self) -> None:
+        """
+        Reset the `hits`, `misses` and `evictions` counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self) -> None:
+        """
+        Drop all cached scenes.
+        """
+        self._entries = OrderedDict()
+        self.bytes_used = 0
+
+    def get(self, key, version:int):
+        """
+        Return the entry (fb bytes, strip bytes) of a scene, or None. A new output version of the
+        matrix drops all entries.
+        """
+        if version != self._version:
+            self.clear()
+            self._version = version
+        entries = self._entries
+        entry = entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        # Re-inserting moves the entry to the most recently used end
+        entries[key] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, key, fb_buf, np_buf, version:int) -> None:
+        """
+        Store copies of the framebuffer and strip bytes of a scene, converted with the given output version.
+        """
+        if version != self._version:
+            self.clear()
+            self._version = version
+        size = len(fb_buf) + len(np_buf)
+        if size > self.max_bytes:
+            return
+
+        entries = self._entries
+        old = entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= len(old[0]) + len(old[1])
+        while entries and self.bytes_used + size > self.max_bytes:
+            # The first key of an OrderedDict is the least recently used one
+            evicted = entries.pop(next(iter(entries)))
+            self.bytes_used -= len(evicted[0]) + len(evicted[1])
+            self.evictions += 1
+
+        entries[key] = (bytearray(fb_buf), bytearray(np_buf))
+        self.bytes_used += size
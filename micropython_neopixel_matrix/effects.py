@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# effects.py
+
+import math
+from array import array
+
+
+def _hue_wheel() -> tuple:
+    """
+    Build the fully saturated hue wheel: 256 hues, red -> green -> blue -> red, one table per channel.
+    """
+    r, g, b = bytearray(256), bytearray(256), bytearray(256)
+    for hue in range(256):
+        region = (hue * 6) >> 8        # 0-5: the sixth of the wheel
+        up = (hue * 6) & 0xFF          # rising channel within it
+        down = 255 - up                # falling channel within it
+        if region == 0:
+            r[hue], g[hue] = 255, up
+        elif region == 1:
+            r[hue], g[hue] = down, 255
+        elif region == 2:
+            g[hue], b[hue] = 255, up
+        elif region == 3:
+            g[hue], b[hue] = down, 255
+        elif region == 4:
+            r[hue], b[hue] = up, 255
+        else:
+            r[hue], b[hue] = 255, down
+    return r, g, b
+
+
+# Lookup tables shared by all effects; the render loops only index them with integers
+HUE_R, HUE_G, HUE_B = _hue_wheel()
+# One sine period in 256 steps, scaled to 0-255
+SINE = bytearray(int(127.5 + 127.5 * math.sin(2 * math.pi * i / 256)) for i in range(256))
+
+
+class Effect:
+    """
+    Base class of the effects: a frame source that renders whole frames straight into the NeoPixel
+    byte buffer of a matrix. Play one with `NeoPixelMatrix.play_effect()`, or call `render(frame)`
+    and `matrix._write()` from your own loop.
+
+    Everything per pixel is integer arithmetic and lookups in tables built once: the hue wheel and
+    sine tables above, and per effect the color tables with the matrix's brightness and gamma
+    applied. These are rebuilt whenever brightness, gamma or wiring change.
+
+    A subclass defines `_build_tables()`, which `_prepare()` calls to (re)build its tables, and
+    `render(frame)`, which calls `_prepare()` and then writes frame number `frame` into the
+    NeoPixel byte buffer of the matrix. The base class has neither, so it can't be played itself.
+
+    Arguments:
+        - matrix : NeoPixelMatrix:  The matrix to render for.
+    """
+
+    def __init__(self, matrix) -> None:
+        self.matrix = matrix
+        self._version = None
+
+    def _prepare(self) -> None:
+        """
+        Rebuild the pixel coordinates and color tables if the matrix output changed since the last frame.
+        """
+        matrix = self.matrix
+        if self._version == matrix._output_version:
+            return
+        self._version = matrix._output_version
+
+        # Display coordinates of every LED, in strip order
+        width, height = matrix.width, matrix.height
+        strip_index = matrix._strip_index
+        xs = array('H', bytes(2 * width * height))
+        ys = array('H', bytes(2 * width * height))
+        for y in range(height):
+            for x in range(width):
+                i = strip_index[y * width + x]
+                xs[i] = x
+                ys[i] = y
+        self._xs, self._ys = xs, ys
+        self._order = matrix._order
+        self._build_tables()
+
+    def _scaled(self, table) -> bytearray:
+        """
+        Return a copy of a channel table with the brightness and gamma of the matrix applied.
+        """
+        lut = self.matrix._lut_888
+        if lut is None:
+            return bytearray(table)
+        return bytearray(lut[v] for v in table)
+
+    def _render_lines(self, coords, line_r, line_g, line_b) -> None:
+        """
+        Write the colors of whole columns (or rows): every LED gets the color of its coordinate in `coords`.
+        """
+        buf = self.matrix.np.buf
+        o_r, o_g, o_b = self._order[0], self._order[1], self._order[2]
+        j = 0
+        for i in range(len(coords)):
+            c = coords[i]
+            buf[j + o_r] = line_r[c]
+            buf[j + o_g] = line_g[c]
+            buf[j + o_b] = line_b[c]
+            j += 3
+
+
+class Rainbow(Effect):
+    """
+    A rainbow sweeping across the matrix.
+
+    Arguments:
+        - matrix   : NeoPixelMatrix:  The matrix to render for.
+        (Optional:)
+        - speed    : int:             Hue steps (of 256) the rainbow moves per frame. Defaults to 4.
+        - spread   : int:             Hue steps between two neighbouring columns. Defaults to 8.
+        - vertical : bool:            Sweep along the rows instead of the columns. Defaults to False.
+    """
+
+    def __init__(self, matrix, speed:int=4, spread:int=8, vertical:bool=False) -> None:
+        super().__init__(matrix)
+        self.speed = speed
+        self.spread = spread
+        self.vertical = vertical
+
+    def _build_tables(self) -> None:
+        self._hue_r, self._hue_g, self._hue_b = self._scaled(HUE_R), self._scaled(HUE_G), self._scaled(HUE_B)
+        size = self.matrix.height if self.vertical else self.matrix.width
+        self._line_r, self._line_g, self._line_b = bytearray(size), bytearray(size), bytearray(size)
+
+    def render(self, frame:int) -> None:
+        self._prepare()
+        hue_r, hue_g, hue_b = self._hue_r, self._hue_g, self._hue_b
+        line_r, line_g, line_b = self._line_r, self._line_g, self._line_b
+        spread = self.spread
+        hue = (frame * self.speed) & 0xFF
+        for c in range(len(line_r)):
+            h = (hue + c * spread) & 0xFF
+            line_r[c] = hue_r[h]
+            line_g[c] = hue_g[h]
+            line_b[c] = hue_b[h]
+        self._render_lines(self._ys if self.vertical else self._xs, line_r, line_g, line_b)
+
+
+class Gradient(Effect):
+    """
+    A linear gradient between two colors, optionally moving back and forth.
+
+    Arguments:
+        - matrix   : NeoPixelMatrix:              The matrix to render for.
+        - start    : tuple(r:int, g:int, b:int):  The color at the left (or top) edge.
+        - end      : tuple(r:int, g:int, b:int):  The color at the right (or bottom) edge.
+        (Optional:)
+        - speed    : int:                         Steps (of 256 per round trip) the gradient moves per frame. Defaults to 0.
+        - vertical : bool:                        Run from top to bottom instead of left to right. Defaults to False.
+    """
+
+    def __init__(self, matrix, start:tuple, end:tuple, speed:int=0, vertical:bool=False) -> None:
+        super().__init__(matrix)
+        self.start = start
+        self.end = end
+        self.speed = speed
+        self.vertical = vertical
+
+    def _build_tables(self) -> None:
+        # Entries 0-127 blend start -> end, 128-255 end -> start, so a moving gradient doesn't jump
+        tables = []
+        for a, b in zip(self.start, self.end):
+            table = bytearray(256)
+            for i in range(128):
+                table[i] = table[255 - i] = a + (b - a) * i // 127
+            tables.append(self._scaled(table))
+        self._table_r, self._table_g, self._table_b = tables
+        size = self.matrix.height if self.vertical else self.matrix.width
+        self._positions = bytearray(127 * c // max(1, size - 1) for c in range(size))
+        self._line_r, self._line_g, self._line_b = bytearray(size), bytearray(size), bytearray(size)
+
+    def render(self, frame:int) -> None:
+        self._prepare()
+        table_r, table_g, table_b = self._table_r, self._table_g, self._table_b
+        line_r, line_g, line_b = self._line_r, self._line_g, self._line_b
+        positions = self._positions
+        shift = (frame * self.speed) & 0xFF
+        for c in range(len(positions)):
+            p = (positions[c] + shift) & 0xFF
+            line_r[c] = table_r[p]
+            line_g[c] = table_g[p]
+            line_b[c] = table_b[p]
+        self._render_lines(self._ys if self.vertical else self._xs, line_r, line_g, line_b)
+
+
+class Plasma(Effect):
+    """
+    A plasma: the sum of three moving sine waves, colored through the hue wheel.
+
+    Arguments:
+        - matrix : NeoPixelMatrix:  The matrix to render for.
+        (Optional:)
+        - speed  : int:             How fast the waves move. Defaults to 3.
+        - scale  : int:             Sine steps (of 256) per pixel; larger values give finer patterns. Defaults to 16.
+    """
+
+    def __init__(self, matrix, speed:int=3, scale:int=16) -> None:
+        super().__init__(matrix)
+        self.speed = speed
+        self.scale = scale
+
+    def _build_tables(self) -> None:
+        self._hue_r, self._hue_g, self._hue_b = self._scaled(HUE_R), self._scaled(HUE_G), self._scaled(HUE_B)
+
+    def render(self, frame:int) -> None:
+        self._prepare()
+        buf = self.matrix.np.buf
+        xs, ys = self._xs, self._ys
+        hue_r, hue_g, hue_b = self._hue_r, self._hue_g, self._hue_b
+        o_r, o_g, o_b = self._order[0], self._order[1], self._order[2]
+        scale = self.scale
+        t1 = (frame * self.speed) & 0xFF
+        t2 = (frame * self.speed * 3 // 2) & 0xFF
+        t3 = SINE[(frame * self.speed // 2) & 0xFF] >> 2
+        sine = SINE
+        j = 0
+        for i in range(len(xs)):
+            x = xs[i] * scale
+            y = ys[i] * scale
+            h = (sine[(x + t1) & 0xFF] + sine[(y + t2) & 0xFF] + sine[((x + y) // 2 + t3) & 0xFF] + t1) & 0xFF
+            buf[j + o_r] = hue_r[h]
+            buf[j + o_g] = hue_g[h]
+            buf[j + o_b] = hue_b[h]
+            j += 3
+
+
+class Fire(Effect):
+    """
+    Flames rising from the bottom edge (after the well-known Fire2012 algorithm): every column has
+    a heat map that cools down, drifts upwards and gets random sparks at the bottom.
+
+    Arguments:
+        - matrix   : NeoPixelMatrix:  The matrix to render for.
+        (Optional:)
+        - cooling  : int:             How fast the flames cool down; larger values give shorter flames. Defaults to 55.
+        - sparking : int:             The chance (of 255) of a new spark per column and frame. Defaults to 120.
+        - seed     : int:             The seed of the random generator. Defaults to 0xACE1.
+    """
+
+    def __init__(self, matrix, cooling:int=55, sparking:int=120, seed:int=0xACE1) -> None:
+        super().__init__(matrix)
+        self.cooling = cooling
+        self.sparking = sparking
+        self._seed = seed or 1
+        self._heat = bytearray(matrix.width * matrix.height)
+
+    def _build_tables(self) -> None:
+        # Heat -> black, red, yellow, white
+        r, g, b = bytearray(256), bytearray(256), bytearray(256)
+        for heat in range(256):
+            t = heat * 3
+            if t < 256:
+                r[heat] = t
+            elif t < 512:
+                r[heat], g[heat] = 255, t - 256
+            else:
+                r[heat], g[heat], b[heat] = 255, 255, t - 512
+        self._heat_r, self._heat_g, self._heat_b = self._scaled(r), self._scaled(g), self._scaled(b)
+
+    def render(self, frame:int) -> None:
+        self._prepare()
+        matrix = self.matrix
+        width, height = matrix.width, matrix.height
+        heat = self._heat
+        seed = self._seed
+        cool = self.cooling * 10 // height + 2
+        sparking = self.sparking
+
+        for x in range(width):
+            column = x * height  # heat[column] is the bottom row
+            for k in range(column, column + height):
+                # 16-bit Galois LFSR: a random generator that stays within small ints
+                seed = (seed >> 1) ^ (0xB400 if seed & 1 else 0)
+                h = heat[k] - seed % cool
+                heat[k] = h if h > 0 else 0
+            for k in range(column + height - 1, column + 1, -1):
+                heat[k] = (heat[k - 1] + 2 * heat[k - 2]) // 3
+            seed = (seed >> 1) ^ (0xB400 if seed & 1 else 0)
+            if seed & 0xFF < sparking:
+                k = column + seed % min(3, height)
+                h = heat[k] + 160 + (seed >> 8) % 96
+                heat[k] = h if h < 255 else 255
+        self._seed = seed
+
+        buf = matrix.np.buf
+        xs, ys = self._xs, self._ys
+        heat_r, heat_g, heat_b = self._heat_r, self._heat_g, self._heat_b
+        o_r, o_g, o_b = self._order[0], self._order[1], self._order[2]
+        top = height - 1
+        j = 0
+        for i in range(len(xs)):
+            h = heat[xs[i] * height + top - ys[i]]
+            buf[j + o_r] = heat_r[h]
+            buf[j + o_g] = heat_g[h]
+            buf[j + o_b] = heat_b[h]
+            j += 3
+
+
+class Sparkle(Effect):
+    """
+    Random pixels light up in a color and fade out.
+
+    Arguments:
+        - matrix  : NeoPixelMatrix:              The matrix to render for.
+        (Optional:)
+        - color   : tuple(r:int, g:int, b:int):  The color of the sparkles. Defaults to white.
+        - density : int:                         New sparkles per frame. Defaults to 3.
+        - fade    : int:                         How much of its brightness (of 256) a pixel keeps per frame. Defaults to 200.
+        - seed    : int:                         The seed of the random generator. Defaults to 0xACE1.
+    """
+
+    def __init__(self, matrix, color:tuple=(255, 255, 255), density:int=3, fade:int=200, seed:int=0xACE1) -> None:
+        super().__init__(matrix)
+        self.color = color
+        self.density = density
+        self.fade = fade
+        self._seed = seed or 1
+
+    def _build_tables(self) -> None:
+        self._fade = bytearray((v * self.fade) >> 8 for v in range(256))
+        self._color = self._scaled(self.color)
+
+    def render(self, frame:int) -> None:
+        self._prepare()
+        buf = self.matrix.np.buf
+        fade = self._fade
+        for i in range(len(buf)):
+            buf[i] = fade[buf[i]]
+
+        color = self._color
+        o_r, o_g, o_b = self._order[0], self._order[1], self._order[2]
+        leds = len(buf) // 3
+        seed = self._seed
+        for _ in range(self.density):
+            seed = (seed >> 1) ^ (0xB400 if seed & 1 else 0)
+            j = (seed % leds) * 3
+            buf[j + o_r] = color[0]
+            buf[j + o_g] = color[1]
+            buf[j + o_b] = color[2]
+        self._seed = seed
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# font.py
+
+
+class Font:
+    """
+    A variable-width bitmap font, drawn column by column.
+
+    The glyphs come from a font module generated by `tools/bdf2font.py`. Its tables are plain
+    `bytes` objects, so a frozen font module is read straight from flash and costs no RAM:
+
+        - HEIGHT  : int:    The height of every glyph in pixels.
+        - FIRST   : int:    The code point of the first glyph.
+        - SPACING : int:    Empty columns between two glyphs.
+        - WIDTHS  : bytes:  The width of every glyph in columns.
+        - OFFSETS : bytes:  The index of every glyph's first column in COLUMNS (16-bit little-endian).
+        - COLUMNS : bytes:  The glyph columns; (HEIGHT + 7) // 8 bytes each, least significant bit at the top.
+
+    Characters without a glyph are drawn as '?'. Measuring text only adds up table entries.
+
+    Example usage:
+
+        import font_petme128
+        font = Font(font_petme128)
+        matrix = NeoPixelMatrix(23, 32, 8, font=font)
+        matrix.scroll_text("Proportional text scrolls faster")
+
+    Arguments:
+        - module : module:  The font module (anything with the attributes above).
+    """
+
+    def __init__(self, module) -> None:
+        self.height = module.HEIGHT
+        self.first = module.FIRST
+        self.spacing = module.SPACING
+        self.widths = module.WIDTHS
+        self.offsets = module.OFFSETS
+        self.columns = module.COLUMNS
+        self.count = len(self.widths)
+        self.column_bytes = (self.height + 7) // 8
+        self.max_width = max(self.widths)
+        self._fallback = ord('?') - self.first if 0 <= ord('?') - self.first < self.count else 0
+
+    def _index(self, char:str) -> int:
+        index = ord(char) - self.first
+        if 0 <= index < self.count:
+            return index
+        return self._fallback
+
+    def char_width(self, char:str) -> int:
+        """
+        Return the width of a character in pixels, without the spacing after it.
+        """
+        return self.widths[self._index(char)]
+
+    def text_width(self, string:str) -> int:
+        """
+        Return the width of the given string in pixels.
+        """
+        if not string:
+            return 0
+        widths = self.widths
+        first = self.first
+        count = self.count
+        width = 0
+        for char in string:
+            index = ord(char) - first
+            width += widths[index if 0 <= index < count else self._fallback]
+        return width + self.spacing * (len(string) - 1)
+
+    def draw(self, buffer, string:str, x:int, y:int, color:int, clip_width:int=0x7FFF) -> int:
+        """
+        Draw the given string onto a framebuffer (or `GRBCanvas`).
+
+        Glyphs left of the buffer are skipped by their width alone and drawing stops at `clip_width`,
+        so only the visible glyphs are touched; inside a glyph only the set pixels are drawn.
+
+        Arguments:
+            - buffer     : FrameBuffer:  The buffer to draw on.
+            - string     : str:          The text to draw.
+            - x          : int:          The x-coordinate of the top-left corner of the text.
+            - y          : int:          The y-coordinate of the top-left corner of the text.
+            - color      : int:          The color in the format of the buffer.
+            (Optional:)
+            - clip_width : int:          The width of the buffer; nothing is drawn from there on.
+
+        Return value:
+            - x          : int:          The x-coordinate right after the text, where the next one would start.
+        """
+        widths = self.widths
+        offsets = self.offsets
+        columns = self.columns
+        column_bytes = self.column_bytes
+        spacing = self.spacing
+        first = self.first
+        count = self.count
+        pixel = buffer.pixel
+
+        for char in string:
+            if x >= clip_width:
+                break
+            index = ord(char) - first
+            if not 0 <= index < count:
+                index = self._fallback
+            width = widths[index]
+            if x + width > 0:
+                column = (offsets[2 * index] | (offsets[2 * index + 1] << 8)) * column_bytes
+                for cx in range(x, x + width):
+                    if cx >= 0:
+                        row = y
+                        for b in range(column_bytes):
+                            bits = columns[column + b]
+                            cy = row
+                            while bits:
+                                if bits & 1:
+                                    pixel(cx, cy, color)
+                                bits >>= 1
+                                cy += 1
+                            row += 8
+                    column += column_bytes
+            x += width + spacing
+        return x
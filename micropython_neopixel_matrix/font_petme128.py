@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Font tables generated by tools/bdf2font.py from petme128_8x8.bdf - do not edit
+# font_petme128.py
+
+HEIGHT = 8
+FIRST = 32
+SPACING = 1
+WIDTHS = (
+    b'\x03\x02\x06\x08\x06\x06\x07\x04\x04\x04\x08\x06\x03\x06\x02\x07'
+    b'\x06\x06\x06\x06\x07\x06\x06\x06\x06\x06\x02\x03\x06\x06\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x06\x06\x04\x06\x06\x06\x07\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x07\x06\x06\x06\x04\x07\x04\x06\x08'
+    b'\x04\x06\x06\x06\x06\x06\x06\x06\x06\x02\x06\x06\x04\x07\x06\x06'
+    b'\x06\x06\x06\x06\x06\x06\x06\x07\x06\x06\x06\x06\x02\x06\x07'
+)
+OFFSETS = (
+    b'\x00\x00\x03\x00\x05\x00\x0b\x00\x13\x00\x19\x00\x1f\x00\x26\x00'
+    b'\x2a\x00\x2e\x00\x32\x00\x3a\x00\x40\x00\x43\x00\x49\x00\x4b\x00'
+    b'\x52\x00\x58\x00\x5e\x00\x64\x00\x6a\x00\x71\x00\x77\x00\x7d\x00'
+    b'\x83\x00\x89\x00\x8f\x00\x91\x00\x94\x00\x9a\x00\xa0\x00\xa6\x00'
+    b'\xac\x00\xb2\x00\xb8\x00\xbe\x00\xc4\x00\xca\x00\xd0\x00\xd6\x00'
+    b'\xdc\x00\xe2\x00\xe6\x00\xec\x00\xf2\x00\xf8\x00\xff\x00\x05\x01'
+    b'\x0b\x01\x11\x01\x17\x01\x1d\x01\x23\x01\x29\x01\x2f\x01\x35\x01'
+    b'\x3c\x01\x42\x01\x48\x01\x4e\x01\x52\x01\x59\x01\x5d\x01\x63\x01'
+    b'\x6b\x01\x6f\x01\x75\x01\x7b\x01\x81\x01\x87\x01\x8d\x01\x93\x01'
+    b'\x99\x01\x9f\x01\xa1\x01\xa7\x01\xad\x01\xb1\x01\xb8\x01\xbe\x01'
+    b'\xc4\x01\xca\x01\xd0\x01\xd6\x01\xdc\x01\xe2\x01\xe8\x01\xee\x01'
+    b'\xf5\x01\xfb\x01\x01\x02\x07\x02\x0d\x02\x0f\x02\x15\x02'
+)
+COLUMNS = (
+    b'\x00\x00\x00\x4f\x4f\x07\x07\x00\x00\x07\x07\x14\x7f\x7f\x14\x14'
+    b'\x7f\x7f\x14\x24\x2e\x6b\x6b\x3a\x12\x63\x33\x18\x0c\x66\x63\x32'
+    b'\x7f\x4d\x4d\x77\x72\x50\x04\x06\x03\x01\x1c\x3e\x63\x41\x41\x63'
+    b'\x3e\x1c\x08\x2a\x3e\x1c\x1c\x3e\x2a\x08\x08\x08\x3e\x3e\x08\x08'
+    b'\x80\xe0\x60\x08\x08\x08\x08\x08\x08\x60\x60\x40\x60\x30\x18\x0c'
+    b'\x06\x02\x3e\x7f\x49\x45\x7f\x3e\x40\x44\x7f\x7f\x40\x40\x62\x73'
+    b'\x51\x49\x4f\x46\x22\x63\x49\x49\x7f\x36\x18\x18\x14\x16\x7f\x7f'
+    b'\x10\x27\x67\x45\x45\x7d\x39\x3e\x7f\x49\x49\x7b\x32\x03\x03\x79'
+    b'\x7d\x07\x03\x36\x7f\x49\x49\x7f\x36\x26\x6f\x49\x49\x7f\x3e\x24'
+    b'\x24\x80\xe4\x64\x08\x1c\x36\x63\x41\x41\x14\x14\x14\x14\x14\x14'
+    b'\x41\x41\x63\x36\x1c\x08\x02\x03\x51\x59\x0f\x06\x3e\x7f\x41\x4d'
+    b'\x4f\x2e\x7c\x7e\x0b\x0b\x7e\x7c\x7f\x7f\x49\x49\x7f\x36\x3e\x7f'
+    b'\x41\x41\x63\x22\x7f\x7f\x41\x63\x3e\x1c\x7f\x7f\x49\x49\x41\x41'
+    b'\x7f\x7f\x09\x09\x01\x01\x3e\x7f\x41\x49\x7b\x3a\x7f\x7f\x08\x08'
+    b'\x7f\x7f\x41\x7f\x7f\x41\x20\x60\x41\x7f\x3f\x01\x7f\x7f\x1c\x36'
+    b'\x63\x41\x7f\x7f\x40\x40\x40\x40\x7f\x7f\x06\x0c\x06\x7f\x7f\x7f'
+    b'\x7f\x0e\x1c\x7f\x7f\x3e\x7f\x41\x41\x7f\x3e\x7f\x7f\x09\x09\x0f'
+    b'\x06\x1e\x3f\x21\x61\x7f\x5e\x7f\x7f\x19\x39\x6f\x46\x26\x6f\x49'
+    b'\x49\x7b\x32\x01\x01\x7f\x7f\x01\x01\x3f\x7f\x40\x40\x7f\x3f\x1f'
+    b'\x3f\x60\x60\x3f\x1f\x7f\x7f\x30\x18\x30\x7f\x7f\x63\x77\x1c\x1c'
+    b'\x77\x63\x07\x0f\x78\x78\x0f\x07\x61\x71\x59\x4d\x47\x43\x7f\x7f'
+    b'\x41\x41\x02\x06\x0c\x18\x30\x60\x40\x41\x41\x7f\x7f\x08\x0c\x06'
+    b'\x06\x0c\x08\xc0\xc0\xc0\xc0\xc0\xc0\xc0\xc0\x01\x03\x06\x04\x20'
+    b'\x74\x54\x54\x7c\x78\x7f\x7f\x44\x44\x7c\x38\x38\x7c\x44\x44\x6c'
+    b'\x28\x38\x7c\x44\x44\x7f\x7f\x38\x7c\x54\x54\x5c\x58\x08\x7e\x7f'
+    b'\x09\x03\x02\x98\xbc\xa4\xa4\xfc\x7c\x7f\x7f\x04\x04\x7c\x78\x7d'
+    b'\x7d\x40\xc0\x80\x80\xfd\x7d\x7f\x7f\x30\x38\x6c\x44\x41\x7f\x7f'
+    b'\x40\x7c\x7c\x18\x30\x18\x7c\x7c\x7c\x7c\x04\x04\x7c\x78\x38\x7c'
+    b'\x44\x44\x7c\x38\xfc\xfc\x24\x24\x3c\x18\x18\x3c\x24\x24\xfc\xfc'
+    b'\x7c\x7c\x04\x04\x0c\x08\x48\x5c\x54\x54\x74\x24\x04\x04\x3e\x7e'
+    b'\x44\x44\x3c\x7c\x40\x40\x7c\x7c\x1c\x3c\x60\x60\x3c\x1c\x1c\x7c'
+    b'\x70\x38\x70\x7c\x1c\x44\x6c\x38\x38\x6c\x44\x9c\xbc\xa0\xe0\x7c'
+    b'\x3c\x44\x64\x74\x5c\x4c\x44\x08\x08\x3e\x77\x41\x41\xff\xff\x41'
+    b'\x41\x77\x3e\x08\x08\x02\x03\x01\x03\x02\x03\x01'
+)
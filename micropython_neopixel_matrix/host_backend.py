@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Pure-Python stand-ins for machine / neopixel / framebuf / utime / uasyncio, used on CPython
+# host_backend.py
+
+import time as _time
+
+
+# ---------------------------------------------------------------------------
+# framebuf
+# ---------------------------------------------------------------------------
+
+MONO_VLSB = 0
+MVLSB = MONO_VLSB
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# font_petme128_8x8, the 8x8 font framebuf.text() uses (ASCII 32..127).
+# Each character is 8 column bytes, least significant bit at the top.
+FONT_8X8 = bytes((
+    0x00,0x00,0x00,0x00,0x00,0x00,0x00,0x00, # 32=' '
+    0x00,0x00,0x00,0x4f,0x4f,0x00,0x00,0x00, # 33='!'
+    0x00,0x07,0x07,0x00,0x00,0x07,0x07,0x00, # 34='"'
+    0x14,0x7f,0x7f,0x14,0x14,0x7f,0x7f,0x14, # 35='#'
+    0x00,0x24,0x2e,0x6b,0x6b,0x3a,0x12,0x00, # 36='$'
+    0x00,0x63,0x33,0x18,0x0c,0x66,0x63,0x00, # 37='%'
+    0x00,0x32,0x7f,0x4d,0x4d,0x77,0x72,0x50, # 38='&'
+    0x00,0x00,0x00,0x04,0x06,0x03,0x01,0x00, # 39='''
+    0x00,0x00,0x1c,0x3e,0x63,0x41,0x00,0x00, # 40='('
+    0x00,0x00,0x41,0x63,0x3e,0x1c,0x00,0x00, # 41=')'
+    0x08,0x2a,0x3e,0x1c,0x1c,0x3e,0x2a,0x08, # 42='*'
+    0x00,0x08,0x08,0x3e,0x3e,0x08,0x08,0x00, # 43='+'
+    0x00,0x00,0x80,0xe0,0x60,0x00,0x00,0x00, # 44=','
+    0x00,0x08,0x08,0x08,0x08,0x08,0x08,0x00, # 45='-'
+    0x00,0x00,0x00,0x60,0x60,0x00,0x00,0x00, # 46='.'
+    0x00,0x40,0x60,0x30,0x18,0x0c,0x06,0x02, # 47='/'
+    0x00,0x3e,0x7f,0x49,0x45,0x7f,0x3e,0x00, # 48='0'
+    0x00,0x40,0x44,0x7f,0x7f,0x40,0x40,0x00, # 49='1'
+    0x00,0x62,0x73,0x51,0x49,0x4f,0x46,0x00, # 50='2'
+    0x00,0x22,0x63,0x49,0x49,0x7f,0x36,0x00, # 51='3'
+    0x00,0x18,0x18,0x14,0x16,0x7f,0x7f,0x10, # 52='4'
+    0x00,0x27,0x67,0x45,0x45,0x7d,0x39,0x00, # 53='5'
+    0x00,0x3e,0x7f,0x49,0x49,0x7b,0x32,0x00, # 54='6'
+    0x00,0x03,0x03,0x79,0x7d,0x07,0x03,0x00, # 55='7'
+    0x00,0x36,0x7f,0x49,0x49,0x7f,0x36,0x00, # 56='8'
+    0x00,0x26,0x6f,0x49,0x49,0x7f,0x3e,0x00, # 57='9'
+    0x00,0x00,0x00,0x24,0x24,0x00,0x00,0x00, # 58=':'
+    0x00,0x00,0x80,0xe4,0x64,0x00,0x00,0x00, # 59=';'
+    0x00,0x08,0x1c,0x36,0x63,0x41,0x41,0x00, # 60='<'
+    0x00,0x14,0x14,0x14,0x14,0x14,0x14,0x00, # 61='='
+    0x00,0x41,0x41,0x63,0x36,0x1c,0x08,0x00, # 62='>'
+    0x00,0x02,0x03,0x51,0x59,0x0f,0x06,0x00, # 63='?'
+    0x00,0x3e,0x7f,0x41,0x4d,0x4f,0x2e,0x00, # 64='@'
+    0x00,0x7c,0x7e,0x0b,0x0b,0x7e,0x7c,0x00, # 65='A'
+    0x00,0x7f,0x7f,0x49,0x49,0x7f,0x36,0x00, # 66='B'
+    0x00,0x3e,0x7f,0x41,0x41,0x63,0x22,0x00, # 67='C'
+    0x00,0x7f,0x7f,0x41,0x63,0x3e,0x1c,0x00, # 68='D'
+    0x00,0x7f,0x7f,0x49,0x49,0x41,0x41,0x00, # 69='E'
+    0x00,0x7f,0x7f,0x09,0x09,0x01,0x01,0x00, # 70='F'
+    0x00,0x3e,0x7f,0x41,0x49,0x7b,0x3a,0x00, # 71='G'
+    0x00,0x7f,0x7f,0x08,0x08,0x7f,0x7f,0x00, # 72='H'
+    0x00,0x00,0x41,0x7f,0x7f,0x41,0x00,0x00, # 73='I'
+    0x00,0x20,0x60,0x41,0x7f,0x3f,0x01,0x00, # 74='J'
+    0x00,0x7f,0x7f,0x1c,0x36,0x63,0x41,0x00, # 75='K'
+    0x00,0x7f,0x7f,0x40,0x40,0x40,0x40,0x00, # 76='L'
+    0x00,0x7f,0x7f,0x06,0x0c,0x06,0x7f,0x7f, # 77='M'
+    0x00,0x7f,0x7f,0x0e,0x1c,0x7f,0x7f,0x00, # 78='N'
+    0x00,0x3e,0x7f,0x41,0x41,0x7f,0x3e,0x00, # 79='O'
+    0x00,0x7f,0x7f,0x09,0x09,0x0f,0x06,0x00, # 80='P'
+    0x00,0x1e,0x3f,0x21,0x61,0x7f,0x5e,0x00, # 81='Q'
+    0x00,0x7f,0x7f,0x19,0x39,0x6f,0x46,0x00, # 82='R'
+    0x00,0x26,0x6f,0x49,0x49,0x7b,0x32,0x00, # 83='S'
+    0x00,0x01,0x01,0x7f,0x7f,0x01,0x01,0x00, # 84='T'
+    0x00,0x3f,0x7f,0x40,0x40,0x7f,0x3f,0x00, # 85='U'
+    0x00,0x1f,0x3f,0x60,0x60,0x3f,0x1f,0x00, # 86='V'
+    0x00,0x7f,0x7f,0x30,0x18,0x30,0x7f,0x7f, # 87='W'
+    0x00,0x63,0x77,0x1c,0x1c,0x77,0x63,0x00, # 88='X'
+    0x00,0x07,0x0f,0x78,0x78,0x0f,0x07,0x00, # 89='Y'
+    0x00,0x61,0x71,0x59,0x4d,0x47,0x43,0x00, # 90='Z'
+    0x00,0x00,0x7f,0x7f,0x41,0x41,0x00,0x00, # 91='['
+    0x00,0x02,0x06,0x0c,0x18,0x30,0x60,0x40, # 92='\'
+    0x00,0x00,0x41,0x41,0x7f,0x7f,0x00,0x00, # 93=']'
+    0x00,0x08,0x0c,0x06,0x06,0x0c,0x08,0x00, # 94='^'
+    0xc0,0xc0,0xc0,0xc0,0xc0,0xc0,0xc0,0xc0, # 95='_'
+    0x00,0x00,0x01,0x03,0x06,0x04,0x00,0x00, # 96='`'
+    0x00,0x20,0x74,0x54,0x54,0x7c,0x78,0x00, # 97='a'
+    0x00,0x7f,0x7f,0x44,0x44,0x7c,0x38,0x00, # 98='b'
+    0x00,0x38,0x7c,0x44,0x44,0x6c,0x28,0x00, # 99='c'
+    0x00,0x38,0x7c,0x44,0x44,0x7f,0x7f,0x00, # 100='d'
+    0x00,0x38,0x7c,0x54,0x54,0x5c,0x58,0x00, # 101='e'
+    0x00,0x08,0x7e,0x7f,0x09,0x03,0x02,0x00, # 102='f'
+    0x00,0x98,0xbc,0xa4,0xa4,0xfc,0x7c,0x00, # 103='g'
+    0x00,0x7f,0x7f,0x04,0x04,0x7c,0x78,0x00, # 104='h'
+    0x00,0x00,0x00,0x7d,0x7d,0x00,0x00,0x00, # 105='i'
+    0x00,0x40,0xc0,0x80,0x80,0xfd,0x7d,0x00, # 106='j'
+    0x00,0x7f,0x7f,0x30,0x38,0x6c,0x44,0x00, # 107='k'
+    0x00,0x00,0x41,0x7f,0x7f,0x40,0x00,0x00, # 108='l'
+    0x00,0x7c,0x7c,0x18,0x30,0x18,0x7c,0x7c, # 109='m'
+    0x00,0x7c,0x7c,0x04,0x04,0x7c,0x78,0x00, # 110='n'
+    0x00,0x38,0x7c,0x44,0x44,0x7c,0x38,0x00, # 111='o'
+    0x00,0xfc,0xfc,0x24,0x24,0x3c,0x18,0x00, # 112='p'
+    0x00,0x18,0x3c,0x24,0x24,0xfc,0xfc,0x00, # 113='q'
+    0x00,0x7c,0x7c,0x04,0x04,0x0c,0x08,0x00, # 114='r'
+    0x00,0x48,0x5c,0x54,0x54,0x74,0x24,0x00, # 115='s'
+    0x00,0x04,0x04,0x3e,0x7e,0x44,0x44,0x00, # 116='t'
+    0x00,0x3c,0x7c,0x40,0x40,0x7c,0x7c,0x00, # 117='u'
+    0x00,0x1c,0x3c,0x60,0x60,0x3c,0x1c,0x00, # 118='v'
+    0x00,0x1c,0x7c,0x70,0x38,0x70,0x7c,0x1c, # 119='w'
+    0x00,0x44,0x6c,0x38,0x38,0x6c,0x44,0x00, # 120='x'
+    0x00,0x9c,0xbc,0xa0,0xe0,0x7c,0x3c,0x00, # 121='y'
+    0x00,0x44,0x64,0x74,0x5c,0x4c,0x44,0x00, # 122='z'
+    0x00,0x08,0x08,0x3e,0x77,0x41,0x41,0x00, # 123='{'
+    0x00,0x00,0x00,0xff,0xff,0x00,0x00,0x00, # 124='|'
+    0x00,0x41,0x41,0x77,0x3e,0x08,0x08,0x00, # 125='}'
+    0x00,0x02,0x03,0x01,0x03,0x02,0x03,0x01, # 126='~'
+    0xaa,0x55,0xaa,0x55,0xaa,0x55,0xaa,0x55, # 127
+))
+
+
+class FrameBuffer:
+    """
+    A bytearray-backed re-implementation of MicroPython's `framebuf.FrameBuffer`.
+
+    Pixel layouts, clipping and drawing algorithms follow `extmod/modframebuf.c`, so
+    a buffer filled on the host holds the same bytes it would on the device.
+    """
+
+    def __init__(self, buffer, width:int, height:int, format:int, stride:int=None) -> None:
+        if stride is None:
+            stride = width
+        if format in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        elif format == GS2_HMSB:
+            stride = (stride + 3) & ~3
+        elif format == GS4_HMSB:
+            stride = (stride + 1) & ~1
+
+        self.buf = memoryview(buffer).cast('B') if not isinstance(buffer, bytearray) else buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        self.stride = stride
+
+    # -- pixel access ------------------------------------------------------
+
+    def _set(self, x:int, y:int, c:int) -> None:
+        buf = self.buf
+        fmt = self.format
+        if fmt == RGB565:
+            i = (x + y * self.stride) << 1
+            buf[i] = c & 0xFF
+            buf[i + 1] = (c >> 8) & 0xFF
+        elif fmt == GS8:
+            buf[x + y * self.stride] = c & 0xFF
+        elif fmt == GS4_HMSB:
+            i = (x + y * self.stride) >> 1
+            if x & 1:
+                buf[i] = (c & 0x0F) | (buf[i] & 0xF0)
+            else:
+                buf[i] = ((c << 4) & 0xF0) | (buf[i] & 0x0F)
+        elif fmt == MONO_VLSB:
+            i = (y >> 3) * self.stride + x
+            bit = y & 7
+            buf[i] = (buf[i] & ~(1 << bit) & 0xFF) | ((c != 0) << bit)
+        elif fmt == GS2_HMSB:
+            i = (x + y * self.stride) >> 2
+            shift = (x & 3) << 1
+            buf[i] = (buf[i] & ~(0x03 << shift) & 0xFF) | ((c & 0x03) << shift)
+        else:
+            i = (x + y * self.stride) >> 3
+            bit = 7 - (x & 7) if fmt == MONO_HLSB else x & 7
+            buf[i] = (buf[i] & ~(1 << bit) & 0xFF) | ((c != 0) << bit)
+
+    def _get(self, x:int, y:int) -> int:
+        buf = self.buf
+        fmt = self.format
+        if fmt == RGB565:
+            i = (x + y * self.stride) << 1
+            return buf[i] | (buf[i + 1] << 8)
+        if fmt == GS8:
+            return buf[x + y * self.stride]
+        if fmt == GS4_HMSB:
+            b = buf[(x + y * self.stride) >> 1]
+            return b & 0x0F if x & 1 else b >> 4
+        if fmt == MONO_VLSB:
+            return (buf[(y >> 3) * self.stride + x] >> (y & 7)) & 1
+        if fmt == GS2_HMSB:
+            return (buf[(x + y * self.stride) >> 2] >> ((x & 3) << 1)) & 0x03
+        bit = 7 - (x & 7) if fmt == MONO_HLSB else x & 7
+        return (buf[(x + y * self.stride) >> 3] >> bit) & 1
+
+    def pixel(self, x:int, y:int, c:int=None):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+        return None
+
+    # -- fills -------------------------------------------------------------
+
+    def _fill_rect(self, x:int, y:int, w:int, h:int, c:int) -> None:
+        if h < 1 or w < 1 or x + w <= 0 or y + h <= 0 or y >= self.height or x >= self.width:
+            return
+        xend = min(self.width, x + w)
+        yend = min(self.height, y + h)
+        x = max(x, 0)
+        y = max(y, 0)
+        if self.format == RGB565:
+            buf = self.buf
+            row = bytes((c & 0xFF, (c >> 8) & 0xFF)) * (xend - x)
+            stride2 = self.stride << 1
+            for yy in range(y, yend):
+                start = yy * stride2 + (x << 1)
+                buf[start:start + len(row)] = row
+        elif self.format == GS8:
+            buf = self.buf
+            row = bytes((c & 0xFF,)) * (xend - x)
+            for yy in range(y, yend):
+                start = yy * self.stride + x
+                buf[start:start + len(row)] = row
+        else:
+            for yy in range(y, yend):
+                for xx in range(x, xend):
+                    self._set(xx, yy, c)
+
+    def fill(self, c:int) -> None:
+        self._fill_rect(0, 0, self.width, self.height, c)
+
+    def fill_rect(self, x:int, y:int, w:int, h:int, c:int) -> None:
+        self._fill_rect(x, y, w, h, c)
+
+    def hline(self, x:int, y:int, w:int, c:int) -> None:
+        self._fill_rect(x, y, w, 1, c)
+
+    def vline(self, x:int, y:int, h:int, c:int) -> None:
+        self._fill_rect(x, y, 1, h, c)
+
+    def rect(self, x:int, y:int, w:int, h:int, c:int, f:bool=False) -> None:
+        if f:
+            self._fill_rect(x, y, w, h, c)
+        else:
+            self._fill_rect(x, y, w, 1, c)
+            self._fill_rect(x, y + h - 1, w, 1, c)
+            self._fill_rect(x, y, 1, h, c)
+            self._fill_rect(x + w - 1, y, 1, h, c)
+
+    # -- lines and polygons ------------------------------------------------
+
+    def line(self, x1:int, y1:int, x2:int, y2:int, c:int) -> None:
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+
+        w, h = self.width, self.height
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                if 0 <= y1 < w and 0 <= x1 < h:
+                    self._set(y1, x1, c)
+            elif 0 <= x1 < w and 0 <= y1 < h:
+                self._set(x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+
+        if 0 <= x2 < w and 0 <= y2 < h:
+            self._set(x2, y2, c)
+
+    def poly(self, x:int, y:int, coords, c:int, f:bool=False) -> None:
+        n = len(coords) // 2
+        if n == 0:
+            return
+
+        if not f:
+            px1, py1 = coords[0], coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                px2, py2 = coords[i - 1], coords[i]
+                self.line(x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+                i -= 2
+            return
+
+        ys = [coords[i + 1] for i in range(0, n * 2, 2)]
+        for row in range(min(ys), max(ys) + 1):
+            nodes = []
+            px1, py1 = coords[0], coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                px2, py2 = coords[i - 1], coords[i]
+                if py1 != py2 and ((py1 > row >= py2) or (py1 <= row < py2)):
+                    # C integer division truncates towards zero
+                    num = 32 * (px2 - px1) * (row - py1)
+                    den = py2 - py1
+                    q = abs(num) // abs(den)
+                    if (num < 0) != (den < 0):
+                        q = -q
+                    total = 32 * px1 + q + 16
+                    node = abs(total) // 32
+                    nodes.append(node if total >= 0 else -node)
+                elif row == max(py1, py2):
+                    if py1 < py2:
+                        self.pixel(x + px2, y + py2, c)
+                    elif py2 < py1:
+                        self.pixel(x + px1, y + py1, c)
+                    else:
+                        self.line(x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+                i -= 2
+
+            nodes.sort()
+            for i in range(0, len(nodes) - 1, 2):
+                self._fill_rect(x + nodes[i], y + row, nodes[i + 1] - nodes[i] + 1, 1, c)
+
+    # -- text, scroll and blit ---------------------------------------------
+
+    def text(self, s:str, x0:int, y0:int, c:int=1) -> None:
+        w, h = self.width, self.height
+        for ch in s:
+            code = ord(ch)
+            if code < 32 or code > 127:
+                code = 127
+            base = (code - 32) << 3
+            for j in range(8):
+                x = x0 + j
+                if 0 <= x < w:
+                    column = FONT_8X8[base + j]
+                    y = y0
+                    while column:
+                        if column & 1 and 0 <= y < h:
+                            self._set(x, y, c)
+                        column >>= 1
+                        y += 1
+            x0 += 8
+
+    def scroll(self, xstep:int, ystep:int) -> None:
+        if xstep < 0:
+            sx, xend, dx = 0, self.width + xstep, 1
+            if xend <= 0:
+                return
+        else:
+            sx, xend, dx = self.width - 1, xstep - 1, -1
+            if xend >= sx:
+                return
+        if ystep < 0:
+            y, yend, dy = 0, self.height + ystep, 1
+        else:
+            y, yend, dy = self.height - 1, ystep - 1, -1
+
+        if self.format == RGB565 and ystep == 0 and xstep < 0:
+            # Row-wise memmove; same result as the pixel loop below
+            buf = self.buf
+            stride2 = self.stride << 1
+            n = xend << 1
+            shift = (-xstep) << 1
+            for yy in range(self.height):
+                start = yy * stride2
+                buf[start:start + n] = buf[start + shift:start + shift + n]
+            return
+
+        while y != yend:
+            x = sx
+            while x != xend:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+            y += dy
+
+    def blit(self, fbuf, x:int, y:int, key:int=-1, palette=None) -> None:
+        if x >= self.width or y >= self.height or -x >= fbuf.width or -y >= fbuf.height:
+            return
+        x0 = max(0, x)
+        y0 = max(0, y)
+        x1 = max(0, -x)
+        y1 = max(0, -y)
+        x0end = min(self.width, x + fbuf.width)
+        y0end = min(self.height, y + fbuf.height)
+
+        get = fbuf._get
+        pal = palette._get if palette is not None else None
+        put = self._set
+        while y0 < y0end:
+            cx1 = x1
+            for cx0 in range(x0, x0end):
+                col = get(cx1, y1)
+                if pal is not None:
+                    col = pal(col, 0)
+                if col != key:
+                    put(cx0, y0, col)
+                cx1 += 1
+            y1 += 1
+            y0 += 1
+
+
+# ---------------------------------------------------------------------------
+# machine / neopixel
+# ---------------------------------------------------------------------------
+
+class Pin:
+    IN = 0
+    OUT = 1
+
+    def __init__(self, id, mode:int=-1, *args, **kwargs) -> None:
+        self.id = id
+        self.mode = mode
+        self._value = 0
+
+    def value(self, v=None):
+        if v is None:
+            return self._value
+        self._value = 1 if v else 0
+
+
+class NeoPixel:
+    """
+    In-memory NeoPixel strip with the same `buf` layout as MicroPython's `neopixel.NeoPixel`.
+    `write()` only counts frames, so the full render pipeline runs without hardware.
+    """
+    ORDER = (1, 0, 2, 3)
+
+    def __init__(self, pin, n:int, bpp:int=3, timing:int=1) -> None:
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.timing = timing
+        self.buf = bytearray(n * bpp)
+        self.writes = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __setitem__(self, i:int, v) -> None:
+        offset = i * self.bpp
+        for j in range(self.bpp):
+            self.buf[offset + self.ORDER[j]] = v[j]
+
+    def __getitem__(self, i:int) -> tuple:
+        offset = i * self.bpp
+        return tuple(self.buf[offset + self.ORDER[j]] for j in range(self.bpp))
+
+    def fill(self, v) -> None:
+        b = self.buf
+        l = len(self.buf)
+        bpp = self.bpp
+        for i in range(bpp):
+            c = v[i]
+            j = self.ORDER[i]
+            while j < l:
+                b[j] = c
+                j += bpp
+
+    def write(self) -> None:
+        self.writes += 1
+
+
+# ---------------------------------------------------------------------------
+# utime
+# ---------------------------------------------------------------------------
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALFPERIOD = _TICKS_PERIOD >> 1
+
+
+def ticks_ms() -> int:
+    return (_time.perf_counter_ns() // 1000000) & _TICKS_MAX
+
+
+def ticks_us() -> int:
+    return (_time.perf_counter_ns() // 1000) & _TICKS_MAX
+
+
+def ticks_cpu() -> int:
+    return _time.perf_counter_ns() & _TICKS_MAX
+
+
+def ticks_add(ticks:int, delta:int) -> int:
+    return (ticks + delta) & _TICKS_MAX
+
+
+def ticks_diff(ticks1:int, ticks2:int) -> int:
+    diff = (ticks1 - ticks2) & _TICKS_MAX
+    return ((diff + _TICKS_HALFPERIOD) & _TICKS_MAX) - _TICKS_HALFPERIOD
+
+
+def sleep(seconds:float) -> None:
+    _time.sleep(seconds)
+
+
+def sleep_ms(ms:int) -> None:
+    _time.sleep(ms / 1000)
+
+
+def sleep_us(us:int) -> None:
+    _time.sleep(us / 1000000)
+
+
+# ---------------------------------------------------------------------------
+# uasyncio
+# ---------------------------------------------------------------------------
+
+class _UAsyncio:
+    """
+    CPython's asyncio with the uasyncio-only names added; asyncio is imported on first use.
+    """
+
+    def __getattr__(self, name:str):
+        import asyncio
+        return getattr(asyncio, name)
+
+    @staticmethod
+    def sleep_ms(ms:int):
+        import asyncio
+        return asyncio.sleep(ms / 1000)
+
+
+asyncio = _UAsyncio()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# instrumentation.py
+
+from array import array
+
+try: from backend import utime
+except ImportError: from micropython_neopixel_matrix.backend import utime
+
+
+class FrameProbe:
+    """
+    Per-stage timing of the refresh path, kept in a fixed-size ring buffer of frame records.
+
+    Every refresh is split into four stages, timed in microseconds with `utime.ticks_us()`:
+        - DRAW    : The time between the end of the previous refresh and the start of this one,
+                    i.e. what the application spent drawing the frame.
+        - GC      : The garbage collection at the start of the refresh.
+        - CONVERT : Compositing the layers and converting the framebuffer into the strip buffer.
+        - WRITE   : Sending the strip buffer to the LEDs (or finding it unchanged).
+
+    All memory is allocated up front, so recording a frame doesn't allocate. Probes are created
+    with `NeoPixelMatrix.enable_instrumentation()`; a matrix without a probe doesn't time anything.
+
+    Example usage:
+
+        probe = matrix.enable_instrumentation(frames=64)
+        ...
+        print(probe.summary())  # {'draw': {'min': ..., 'avg': ..., 'max': ..., 'p95': ...}, ...}
+
+    Arguments:
+        (Optional:)
+        - frames   : int:       The number of frame records kept. Defaults to 64.
+        - callback : callable:  Called after every recorded frame with the frame record, an array
+                                indexed by the stage constants. The array is reused for the next frame,
+                                so copy it if you keep it. Defaults to None.
+    """
+
+    DRAW = 0
+    GC = 1
+    CONVERT = 2
+    WRITE = 3
+    STAGES = ("draw", "gc", "convert", "write")
+
+    def __init__(self, frames:int=64, callback=None) -> None:
+        self.frames = frames
+        self.callback = callback
+        self._records = array('L', [0] * (frames * 4))
+        self._record = array('L', [0, 0, 0, 0])  # the frame being recorded
+        self._started = False
+        self._t = 0
+        self._last_end = None
+        self.count = 0  # frames recorded since the last reset
+
+    def __len__(self) -> int:
+        return min(self.count, self.frames)
+
+    def reset(self) -> None:
+        """
+        Drop all recorded frames.
+        """
+        self.count = 0
+        self._started = False
+        self._last_end = None
+
+    def begin(self) -> None:
+        """
+        Start recording a frame; the time since the end of the last one is its DRAW stage.
+        """
+        now = utime.ticks_us()
+        record = self._record
+        record[FrameProbe.GC] = record[FrameProbe.CONVERT] = record[FrameProbe.WRITE] = 0
+        record[FrameProbe.DRAW] = 0 if self._last_end is None else max(0, utime.ticks_diff(now, self._last_end))
+        self._t = now
+        self._started = True
+
+    def restart(self) -> None:
+        """
+        Start timing the next stage from now, leaving out the time since the last one ended.
+        """
+        self._t = utime.ticks_us()
+
+    def lap(self, stage:int) -> None:
+        """
+        End the given stage; the next one is timed from now.
+        """
+        now = utime.ticks_us()
+        self._record[stage] += max(0, utime.ticks_diff(now, self._t))
+        self._t = now
+
+    def end(self) -> None:
+        """
+        End the WRITE stage and store the frame record.
+        """
+        if not self._started:
+            return  # enabled in the middle of a refresh
+        self.lap(FrameProbe.WRITE)
+        self._started = False
+        self._last_end = self._t
+
+        record = self._record
+        base = (self.count % self.frames) * 4
+        records = self._records
+        for stage in range(4):
+            records[base + stage] = record[stage]
+        self.count += 1
+
+        if self.callback is not None:
+            self.callback(record)
+
+    def values(self, stage:int=None) -> list:
+        """
+        Return the recorded times of a stage, oldest first; without a stage, the total time per frame.
+        """
+        n = len(self)
+        first = self.count - n
+        records = self._records
+        result = []
+        for frame in range(first, first + n):
+            base = (frame % self.frames) * 4
+            if stage is None:
+                result.append(records[base] + records[base + 1] + records[base + 2] + records[base + 3])
+            else:
+                result.append(records[base + stage])
+        return result
+
+    def stats(self, stage:int=None) -> dict:
+        """
+        Summarize the recorded times of a stage (or the totals) in microseconds.
+
+        Return value:
+            - stats : dict:  {'min': int, 'avg': float, 'max': int, 'p95': int}, all 0 without frames.
+        """
+        values = self.values(stage)
+        if not values:
+            return {"min": 0, "avg": 0, "max": 0, "p95": 0}
+        values.sort()
+        return {
+            "min": values[0],
+            "avg": sum(values) / len(values),
+            "max": values[-1],
+            "p95": values[min(len(values) - 1, (len(values) * 95) // 100)],
+        }
+
+    def summary(self) -> dict:
+        """
+        Return the `stats()` of every stage by name, plus the frame totals under 'total'.
+        """
+        result = {}
+        for stage in range(4):
+            result[FrameProbe.STAGES[stage]] = self.stats(stage)
+        result["total"] = self.stats()
+        return result
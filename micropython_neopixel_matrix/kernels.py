@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# kernels.py
+
+# The inner loops of a refresh as plain functions over raw buffers: the framebuffer -> strip
+# conversions, the brightness scaling of the GRB888 canvas and its scrolling.
+#
+# `kernels_viper.py` has the same functions compiled to machine code by MicroPython's viper
+# emitter. They are picked at import time where the emitter is available; everywhere else
+# (CPython, ports built without it) the pure-Python versions below are used. `NATIVE` tells
+# which ones are in use, `PYTHON` always holds the pure-Python ones.
+#
+# Viper functions take at most four arguments on older firmware, so every kernel gets its
+# parameters and lookup tables in one `job` array('i') (see `new_job()`), laid out as below.
+
+from array import array
+
+# Parameters
+ORDER = 0                     # 3 entries: the byte positions of red, green and blue in a strip pixel
+X0, Y0, X1, Y1 = 3, 4, 5, 6   # the display area [X0, X1) x [Y0, Y1) to convert (`shift`: see there)
+WIDTH = 7                     # the width of the display
+STRIDE = 8                    # the length of a framebuffer row in pixels
+VIEW = 9                      # the framebuffer column shown at the left edge of the display
+ENTRIES = 10                  # the number of entries of each palette table
+START, END = 11, 12           # the range of bytes to scale
+DEPTH = 13                    # bits per pixel of an indexed framebuffer: 4 (GS4_HMSB) or 8 (GS8)
+XSTEP, YSTEP = 14, 15         # the scroll distance
+# Lookup tables, one after the other: red (32), green (64) and blue (32) of RGB565; red, green
+# and blue of a palette (ENTRIES each); or one table of 256 for every byte
+TABLES = 16
+
+
+def new_job(tables:tuple=()) -> array:
+    """
+    Create a job array holding the given lookup tables after the parameters.
+
+    Arguments:
+        (Optional:)
+        - tables : tuple:  The tables (bytearrays) to store, in the order the kernel expects them.
+    """
+    job = array('i', bytes(4 * (TABLES + sum(len(table) for table in tables))))
+    i = TABLES
+    for table in tables:
+        for value in table:
+            job[i] = value
+            i += 1
+    return job
+
+
+def rgb565(np_buf, fb_buf, strip_index, job) -> None:
+    """
+    Convert the display area of an RGB565 framebuffer (little-endian pixels) into strip bytes,
+    through the per-channel tables.
+    """
+    o_r, o_g, o_b = job[ORDER], job[ORDER + 1], job[ORDER + 2]
+    x0, x1 = job[X0], job[X1]
+    width, stride, view = job[WIDTH], job[STRIDE], job[VIEW]
+    lut_r, lut_g, lut_b = TABLES, TABLES + 32, TABLES + 96
+
+    for y in range(job[Y0], job[Y1]):
+        row = y * width
+        offset = (y * stride + view + x0) * 2
+        for x in range(x0, x1):
+            j = strip_index[row + x] * 3
+            lo = fb_buf[offset]
+            hi = fb_buf[offset + 1]
+            np_buf[j + o_r] = job[lut_r + (hi >> 3)]
+            np_buf[j + o_g] = job[lut_g + (((hi & 0x07) << 3) | (lo >> 5))]
+            np_buf[j + o_b] = job[lut_b + (lo & 0x1F)]
+            offset += 2
+
+
+def indexed(np_buf, fb_buf, strip_index, job) -> None:
+    """
+    Convert the display area of a GS4_HMSB or GS8 framebuffer of palette indices into strip bytes,
+    through the palette tables.
+    """
+    o_r, o_g, o_b = job[ORDER], job[ORDER + 1], job[ORDER + 2]
+    x0, x1 = job[X0], job[X1]
+    width, stride, view = job[WIDTH], job[STRIDE], job[VIEW]
+    palette_r = TABLES
+    palette_g = palette_r + job[ENTRIES]
+    palette_b = palette_g + job[ENTRIES]
+    gs4 = job[DEPTH] == 4
+
+    for y in range(job[Y0], job[Y1]):
+        row = y * width
+        offset = y * stride + view + x0
+        for x in range(x0, x1):
+            if gs4:
+                # GS4_HMSB: the even pixel is in the high nibble
+                c = fb_buf[offset >> 1]
+                c = c & 0x0F if offset & 1 else c >> 4
+            else:
+                c = fb_buf[offset]
+            j = strip_index[row + x] * 3
+            np_buf[j + o_r] = job[palette_r + c]
+            np_buf[j + o_g] = job[palette_g + c]
+            np_buf[j + o_b] = job[palette_b + c]
+            offset += 1
+
+
+def scale(np_buf, source, job) -> None:
+    """
+    Write the bytes [START, END) of `source` into `np_buf`, each looked up in the 256 entry table.
+    """
+    for i in range(job[START], job[END]):
+        np_buf[i] = job[TABLES + source[i]]
+
+
+def shift(buf, strip_index, job) -> None:
+    """
+    Scroll a buffer in strip order (3 bytes per pixel) by XSTEP, YSTEP pixels, like
+    `FrameBuffer.scroll()`: the pixels of the rows Y0 up to (not including) Y1 and the columns
+    X0 up to X1 are taken from (x - XSTEP, y - YSTEP); the caller picks the ranges and their
+    direction so no pixel is read after it was overwritten.
+    """
+    width = job[WIDTH]
+    xstep, ystep = job[XSTEP], job[YSTEP]
+    x0, x1, y, y1 = job[X0], job[X1], job[Y0], job[Y1]
+    dx = 1 if x1 > x0 else -1
+    dy = 1 if y1 > y else -1
+
+    while y != y1:
+        row = y * width
+        source_row = (y - ystep) * width - xstep
+        x = x0
+        while x != x1:
+            d = strip_index[row + x] * 3
+            s = strip_index[source_row + x] * 3
+            buf[d] = buf[s]
+            buf[d + 1] = buf[s + 1]
+            buf[d + 2] = buf[s + 2]
+            x += dx
+        y += dy
+
+
+PYTHON = {'rgb565': rgb565, 'indexed': indexed, 'scale': scale, 'shift': shift}
+
+# Prefer the compiled kernels
+try:
+    try: import kernels_viper as _native
+    except ImportError: from micropython_neopixel_matrix import kernels_viper as _native
+    rgb565, indexed, scale, shift = _native.rgb565, _native.indexed, _native.scale, _native.shift
+    NATIVE = True
+except (ImportError, SyntaxError, ValueError):
+    # No viper emitter (or not MicroPython at all): a compile error or an incompatible .mpy
+    NATIVE = False
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# kernels_viper.py
+
+# The kernels of `kernels.py`, compiled to machine code by the viper emitter; see there for what
+# they do and for the layout of the `job` array. Don't import this directly: `kernels.py` picks
+# these where they compile and falls back to its pure-Python versions elsewhere.
+#
+# Loads through ptr8/ptr16/ptr32 are unsigned in viper; every value used in arithmetic with
+# other ints is cast with int() (which also makes the signed scroll steps negative again).
+
+import micropython
+from micropython import const
+
+# The `job` layout of kernels.py, as compile-time constants
+_ORDER = const(0)
+_X0 = const(3)
+_Y0 = const(4)
+_X1 = const(5)
+_Y1 = const(6)
+_WIDTH = const(7)
+_STRIDE = const(8)
+_VIEW = const(9)
+_ENTRIES = const(10)
+_START = const(11)
+_END = const(12)
+_DEPTH = const(13)
+_XSTEP = const(14)
+_YSTEP = const(15)
+_TABLES = const(16)
+
+
+@micropython.viper
+def rgb565(np_buf, fb_buf, strip_index, job):
+    np = ptr8(np_buf)
+    fb = ptr8(fb_buf)
+    index = ptr16(strip_index)
+    p = ptr32(job)
+    o_r = int(p[_ORDER])
+    o_g = int(p[_ORDER + 1])
+    o_b = int(p[_ORDER + 2])
+    x0 = int(p[_X0])
+    x1 = int(p[_X1])
+    y = int(p[_Y0])
+    y1 = int(p[_Y1])
+    width = int(p[_WIDTH])
+    stride = int(p[_STRIDE])
+    view = int(p[_VIEW])
+
+    while y < y1:
+        row = y * width
+        offset = (y * stride + view + x0) << 1
+        x = x0
+        while x < x1:
+            j = int(index[row + x]) * 3
+            lo = int(fb[offset])
+            hi = int(fb[offset + 1])
+            np[j + o_r] = p[_TABLES + (hi >> 3)]
+            np[j + o_g] = p[_TABLES + 32 + (((hi & 0x07) << 3) | (lo >> 5))]
+            np[j + o_b] = p[_TABLES + 96 + (lo & 0x1F)]
+            offset += 2
+            x += 1
+        y += 1
+
+
+@micropython.viper
+def indexed(np_buf, fb_buf, strip_index, job):
+    np = ptr8(np_buf)
+    fb = ptr8(fb_buf)
+    index = ptr16(strip_index)
+    p = ptr32(job)
+    o_r = int(p[_ORDER])
+    o_g = int(p[_ORDER + 1])
+    o_b = int(p[_ORDER + 2])
+    x0 = int(p[_X0])
+    x1 = int(p[_X1])
+    y = int(p[_Y0])
+    y1 = int(p[_Y1])
+    width = int(p[_WIDTH])
+    stride = int(p[_STRIDE])
+    view = int(p[_VIEW])
+    palette_r = _TABLES
+    palette_g = palette_r + int(p[_ENTRIES])
+    palette_b = palette_g + int(p[_ENTRIES])
+    depth = int(p[_DEPTH])
+
+    while y < y1:
+        row = y * width
+        offset = y * stride + view + x0
+        x = x0
+        while x < x1:
+            if depth == 4:
+                # GS4_HMSB: the even pixel is in the high nibble
+                c = int(fb[offset >> 1])
+                if offset & 1:
+                    c = c & 0x0F
+                else:
+                    c = c >> 4
+            else:
+                c = int(fb[offset])
+            j = int(index[row + x]) * 3
+            np[j + o_r] = p[palette_r + c]
+            np[j + o_g] = p[palette_g + c]
+            np[j + o_b] = p[palette_b + c]
+            offset += 1
+            x += 1
+        y += 1
+
+
+@micropython.viper
+def scale(np_buf, source, job):
+    np = ptr8(np_buf)
+    src = ptr8(source)
+    p = ptr32(job)
+    i = int(p[_START])
+    end = int(p[_END])
+    while i < end:
+        np[i] = p[_TABLES + int(src[i])]
+        i += 1
+
+
+@micropython.viper
+def shift(buf, strip_index, job):
+    b = ptr8(buf)
+    index = ptr16(strip_index)
+    p = ptr32(job)
+    width = int(p[_WIDTH])
+    xstep = int(p[_XSTEP])
+    ystep = int(p[_YSTEP])
+    x0 = int(p[_X0])
+    x1 = int(p[_X1])
+    y = int(p[_Y0])
+    y1 = int(p[_Y1])
+    dx = 1
+    if x1 < x0:
+        dx = -1
+    dy = 1
+    if y1 < y:
+        dy = -1
+
+    while y != y1:
+        row = y * width
+        source_row = (y - ystep) * width - xstep
+        x = x0
+        while x != x1:
+            d = int(index[row + x]) * 3
+            s = int(index[source_row + x]) * 3
+            b[d] = b[s]
+            b[d + 1] = b[s + 1]
+            b[d + 2] = b[s + 2]
+            x += dx
+        y += dy
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# layers.py
+
+try: from neopixel_matrix import Color
+except ImportError: from micropython_neopixel_matrix.neopixel_matrix import Color
+
+try: from backend import framebuf
+except ImportError: from micropython_neopixel_matrix.backend import framebuf
+
+
+class Layer:
+    """
+    A named drawing surface with its own RGB565 framebuffer, composited onto the matrix on refresh.
+
+    Layers are created with `NeoPixelMatrix.add_layer()`. Draw into `layer.fb` (then call
+    `layer.mark_dirty()`) or use the helpers below, which mark the layer dirty themselves.
+    Only dirty layers trigger a recomposition, and only of the area they cover; the content
+    of other layers is kept and just blitted again where they overlap that area.
+
+    Arguments:
+        - name    : str:                         The name of the layer.
+        - width   : int:                         The width of the layer in pixels.
+        - height  : int:                         The height of the layer in pixels.
+        (Optional:)
+        - x       : int:                         The x-coordinate of the layer on the matrix. Defaults to 0.
+        - y       : int:                         The y-coordinate of the layer on the matrix. Defaults to 0.
+        - z       : int:                         The z-order; higher layers are drawn on top. Defaults to 0.
+        - key     : tuple(r:int, g:int, b:int):  Pixels of this color are transparent. Defaults to None (opaque).
+    """
+
+    def __init__(self, name:str, width:int, height:int, x:int=0, y:int=0, z:int=0, key:tuple=None) -> None:
+        self.name = name
+        self.width = width
+        self.height = height
+        self.buf = bytearray(width * height * 2)
+        self.fb = framebuf.FrameBuffer(self.buf, width, height, framebuf.RGB565)
+
+        self._x = x
+        self._y = y
+        self._z = z
+        self._visible = True
+        self.key = -1 if key is None else Color.rgb_to_rgb565(key)
+
+        self.dirty = True
+        # The matrix area this layer covered when it was last composited: None or `_composed_rect`
+        self._composed_box = None
+        self._composed_rect = [0, 0, 0, 0]
+
+        if key is not None:
+            self.fb.fill(self.key)
+
+    @property
+    def x(self) -> int:
+        return self._x
+
+    @property
+    def y(self) -> int:
+        return self._y
+
+    @property
+    def z(self) -> int:
+        return self._z
+
+    @z.setter
+    def z(self, z:int) -> None:
+        self._z = z
+        self.dirty = True
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible:bool) -> None:
+        if visible != self._visible:
+            self._visible = visible
+            self.dirty = True
+
+    def move(self, x:int, y:int) -> None:
+        """
+        Move the layer to the given position on the matrix.
+        """
+        if x != self._x or y != self._y:
+            self._x = x
+            self._y = y
+            self.dirty = True
+
+    def mark_dirty(self) -> None:
+        """
+        Tell the compositor that the content of `fb` changed.
+        """
+        self.dirty = True
+
+    def clear(self) -> None:
+        """
+        Fill the layer with its transparent key color (or black, if it has none).
+        """
+        self.fb.fill(self.key if self.key >= 0 else 0)
+        self.dirty = True
+
+    def fill(self, color:tuple) -> None:
+        """
+        Fill the whole layer with a color.
+        """
+        self.fb.fill(Color.to_rgb565(color))
+        self.dirty = True
+
+    def text(self, string:str, x:int=0, y:int=0, color:tuple=Color.RED) -> None:
+        """
+        Draw text onto the layer, without clearing it first.
+        """
+        self.fb.text(string, x, y, Color.to_rgb565(color))
+        self.dirty = True
+
+    def box(self) -> tuple:
+        """
+        Return the area [x0, y0, x1, y1) the layer covers on the matrix.
+        """
+        return self._x, self._y, self._x + self.width, self._y + self.height
+
+    def _composed(self) -> None:
+        """
+        Called by the compositor once the current state of the layer is on the matrix.
+        """
+        self.dirty = False
+        if self._visible:
+            box = self._composed_rect
+            box[0] = self._x
+            box[1] = self._y
+            box[2] = self._x + self.width
+            box[3] = self._y + self.height
+            self._composed_box = box
+        else:
+            self._composed_box = None
+
+    def blit_region(self, target, x0:int, y0:int, x1:int, y1:int) -> None:
+        """
+        Blit the part of the layer that lies inside the matrix area [x0, x1) x [y0, y1) onto `target`.
+        """
+        lx0 = max(x0, self._x)
+        ly0 = max(y0, self._y)
+        lx1 = min(x1, self._x + self.width)
+        ly1 = min(y1, self._y + self.height)
+        if lx0 >= lx1 or ly0 >= ly1:
+            return
+
+        if lx1 - lx0 == self.width and ly1 - ly0 == self.height:
+            target.blit(self.fb, self._x, self._y, self.key)
+            return
+
+        # A framebuffer view on just the rows/columns needed, sharing the layer's memory
+        offset = ((ly0 - self._y) * self.width + (lx0 - self._x)) * 2
+        view = framebuf.FrameBuffer(memoryview(self.buf)[offset:], lx1 - lx0, ly1 - ly0, framebuf.RGB565, self.width)
+        target.blit(view, lx0, ly0, self.key)
+
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# layout.py
+
+
+class Panel:
+    """
+    One LED panel of a chain, as wired and as mounted.
+
+    The wiring is described in the panel's own, unrotated frame: a `width x height` grid whose
+    first LED sits in the `start` corner and which is wired column by column (or row by row),
+    reversing direction on every other column (serpentine) unless `serpentine=False`.
+    The defaults match the 8x32 WS2812b matrices this library was written for.
+
+    The panel is then mounted on the canvas: rotated clockwise by `rotation` degrees, optionally
+    mirrored, with its top-left corner at (`x`, `y`).
+
+    Arguments:
+        - width      : int:   The width of the panel as wired, in pixels.
+        - height     : int:   The height of the panel as wired, in pixels.
+        (Optional:)
+        - x          : int:   The x-coordinate of the mounted panel's top-left corner on the canvas. Defaults to 0.
+        - y          : int:   The y-coordinate of the mounted panel's top-left corner on the canvas. Defaults to 0.
+        - rotation   : int:   The clockwise rotation of the panel: 0, 90, 180 or 270. Defaults to 0.
+        - flip_x     : bool:  If True, the mounted panel is mirrored horizontally. Defaults to False.
+        - flip_y     : bool:  If True, the mounted panel is mirrored vertically. Defaults to False.
+        - start      : int:   The corner of the first LED: Panel.TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT or BOTTOM_RIGHT. Defaults to Panel.TOP_LEFT.
+        - columns    : bool:  If True, the LEDs are wired column by column, otherwise row by row. Defaults to True.
+        - serpentine : bool:  If True, every other column (row) runs in the opposite direction. Defaults to True.
+    """
+
+    TOP_LEFT = 0
+    TOP_RIGHT = 1
+    BOTTOM_LEFT = 2
+    BOTTOM_RIGHT = 3
+
+    def __init__(self, width:int, height:int, x:int=0, y:int=0, rotation:int=0, flip_x:bool=False, flip_y:bool=False,
+                 start:int=TOP_LEFT, columns:bool=True, serpentine:bool=True) -> None:
+        if rotation not in (0, 90, 180, 270):
+            raise ValueError("Panel rotation must be 0, 90, 180 or 270, not {}".format(rotation))
+        self.width = width
+        self.height = height
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+        self.start = start
+        self.columns = columns
+        self.serpentine = serpentine
+
+    @property
+    def mounted_size(self) -> tuple:
+        """
+        The (width, height) the panel covers on the canvas, after rotation.
+        """
+        if self.rotation in (90, 270):
+            return self.height, self.width
+        return self.width, self.height
+
+    def coordinates(self):
+        """
+        Yield the canvas (x, y) coordinates of the panel's LEDs, in wiring order.
+        """
+        width, height = self.width, self.height
+        mounted_width, mounted_height = self.mounted_size
+        rotation = self.rotation
+
+        for i in range(width * height):
+            # Position in the panel's own frame, wired from the top-left corner
+            if self.columns:
+                u, v = i // height, i % height
+                if self.serpentine and u % 2:
+                    v = height - 1 - v
+            else:
+                v, u = i // width, i % width
+                if self.serpentine and v % 2:
+                    u = width - 1 - u
+
+            if self.start in (Panel.TOP_RIGHT, Panel.BOTTOM_RIGHT):
+                u = width - 1 - u
+            if self.start in (Panel.BOTTOM_LEFT, Panel.BOTTOM_RIGHT):
+                v = height - 1 - v
+
+            # Mounting: rotate clockwise, then mirror
+            if rotation == 90:
+                x, y = height - 1 - v, u
+            elif rotation == 180:
+                x, y = width - 1 - u, height - 1 - v
+            elif rotation == 270:
+                x, y = v, width - 1 - u
+            else:
+                x, y = u, v
+
+            if self.flip_x:
+                x = mounted_width - 1 - x
+            if self.flip_y:
+                y = mounted_height - 1 - y
+
+            yield self.x + x, self.y + y
+
+
+class PanelLayout:
+    """
+    A chain of panels forming one logical canvas.
+
+    The panels are listed in the order they are chained, starting with the one connected to the
+    data pin. Together they have to cover the canvas (their bounding box, from (0, 0)) exactly
+    once. `NeoPixelMatrix` compiles the layout into its pixel map at construction, so drawing on
+    the canvas costs the same per pixel as on a single panel.
+
+    Example usage:
+
+        # Four 8x32 panels stacked into a 32x32 canvas, every other one mounted upside down
+        layout = PanelLayout.grid(1, 4, 32, 8, rotation=(0, 180, 0, 180))
+        matrix = NeoPixelMatrix(23, layout.width, layout.height, layout=layout)
+
+    Arguments:
+        - panels : list of Panel:  The panels in chain order.
+    """
+
+    def __init__(self, panels:list) -> None:
+        if not panels:
+            raise ValueError("A panel layout needs at least one panel")
+        self.panels = list(panels)
+
+        width = height = 0
+        for panel in self.panels:
+            if panel.x < 0 or panel.y < 0:
+                raise ValueError("Panels must be placed at non-negative coordinates")
+            mounted_width, mounted_height = panel.mounted_size
+            width = max(width, panel.x + mounted_width)
+            height = max(height, panel.y + mounted_height)
+        self.width = width
+        self.height = height
+
+        covered = bytearray(width * height)
+        for panel in self.panels:
+            for x, y in panel.coordinates():
+                if covered[y * width + x]:
+                    raise ValueError("Panels overlap at ({}, {})".format(x, y))
+                covered[y * width + x] = 1
+        if 0 in covered:
+            raise ValueError("The panels don't cover the whole {}x{} canvas".format(width, height))
+
+    @staticmethod
+    def grid(columns:int, rows:int, panel_width:int, panel_height:int, rotation=0, flip_x=False, flip_y=False,
+             start=Panel.TOP_LEFT, snake:bool=False, **wiring):
+        """
+        Build a layout of `columns x rows` equally sized panels, chained row by row from the top-left.
+
+        Arguments:
+            - columns      : int:  The number of panels side by side.
+            - rows         : int:  The number of panels on top of each other.
+            - panel_width  : int:  The width of a panel as wired.
+            - panel_height : int:  The height of a panel as wired.
+            (Optional:)
+            - rotation     : int or tuple:  The rotation of every panel, or one per panel in chain order; non-square
+                                            panels can't mix 0/180 with 90/270. Defaults to 0.
+            - flip_x       : bool or tuple: Mirror the panels horizontally; one value or one per panel. Defaults to False.
+            - flip_y       : bool or tuple: Mirror the panels vertically; one value or one per panel. Defaults to False.
+            - start        : int or tuple:  The corner of the first LED of every panel, or one per panel. Defaults to Panel.TOP_LEFT.
+            - snake        : bool:          If True, the chain runs right to left on every other row of panels. Defaults to False.
+            - **wiring     :                `columns` and `serpentine` arguments passed on to every `Panel`.
+
+        Return value:
+            - layout       : PanelLayout:  The layout.
+        """
+        def per_panel(value, i):
+            return value[i] if isinstance(value, (tuple, list)) else value
+
+        if panel_width != panel_height:
+            # The grid cells have one size: a turned non-square panel would leave a gap next to the others
+            turned = set(per_panel(rotation, i) in (90, 270) for i in range(columns * rows))
+            if len(turned) > 1:
+                raise ValueError("Non-square panels in a grid must all be turned by 0/180 or all by 90/270; "
+                                 "place mixed rotations with Panel(x=, y=) instead")
+
+        panels = []
+        for row in range(rows):
+            for column in range(columns):
+                if snake and row % 2:
+                    column = columns - 1 - column
+                i = len(panels)
+                panel_rotation = per_panel(rotation, i)
+                size = panel_width, panel_height
+                if panel_rotation in (90, 270):
+                    size = panel_height, panel_width
+                panels.append(Panel(panel_width, panel_height, column * size[0], row * size[1], panel_rotation,
+                                    per_panel(flip_x, i), per_panel(flip_y, i), per_panel(start, i), **wiring))
+        return PanelLayout(panels)
+
+    def coordinates(self):
+        """
+        Yield the canvas (x, y) coordinates of all LEDs, in chain order.
+        """
+        for panel in self.panels:
+            yield from panel.coordinates()
@@ -4,13 +4,15 @@
 # neopixel_matrix.py
 
 import gc
-import utime
-import machine
-import neopixel
-import framebuf
 import time
 import random
-#from utils.timed_func import time_acc_function, timed_function
+from array import array
+
+try: from backend import machine, neopixel, framebuf, utime
+except ImportError: from micropython_neopixel_matrix.backend import machine, neopixel, framebuf, utime
+
+try: import kernels
+except ImportError: from micropython_neopixel_matrix import kernels
 
 
 class Color:
@@ -27,6 +29,10 @@ class Color:
     ORANGE = (255, 140, 0)
     PURPLE = (140, 0, 140)
 
+    # The encodings of the constants above, computed once below the class
+    _rgb565 = {}
+    _rgb888 = {}
+
     @staticmethod
     def random():
         return (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
@@ -68,6 +74,61 @@ class Color:
         r, g, b = rgb
         return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
 
+    @staticmethod
+    def rgb_to_rgb888(rgb:tuple) -> int:
+        """
+        Convert a RGB888 color tuple to a 24-bit integer (0xRRGGBB), the color format of `GRBCanvas`.
+
+        Arguments:
+            - rgb    : tuple:  The RGB color value as a tuple (r, g, b).
+
+        Return value:
+            - rgb888 : int:    The 24-bit RGB888 color value.
+        """
+        r, g, b = rgb
+        return (r << 16) | (g << 8) | b
+
+    @staticmethod
+    def to_rgb565(rgb:tuple) -> int:
+        """
+        Like `rgb_to_rgb565()`, but a lookup for the color constants.
+
+        Arguments:
+            - rgb    : tuple:  The RGB color value as a tuple (r, g, b).
+
+        Return value:
+            - rgb565 : int:    The 16-bit RGB565 color value.
+        """
+        try:
+            value = Color._rgb565.get(rgb)
+        except TypeError:
+            value = None  # a list: can't be a key
+        if value is None:
+            # Converting is cheaper than any cache bookkeeping for the other colors
+            return Color.rgb_to_rgb565(rgb)
+        return value
+
+    @staticmethod
+    def to_rgb888(rgb:tuple) -> int:
+        """
+        Like `rgb_to_rgb888()`, but a lookup for the color constants. The value is 0xRRGGBB, the color
+        format `GRBCanvas` takes; the canvas puts the bytes into strip order itself.
+
+        Arguments:
+            - rgb    : tuple:  The RGB color value as a tuple (r, g, b).
+
+        Return value:
+            - rgb888 : int:    The 24-bit RGB888 color value.
+        """
+        try:
+            value = Color._rgb888.get(rgb)
+        except TypeError:
+            value = None  # a list: can't be a key
+        if value is None:
+            # Converting is cheaper than any cache bookkeeping for the other colors
+            return Color.rgb_to_rgb888(rgb)
+        return value
+
     @staticmethod
     def rgb565_to_rgb888(color:int) -> tuple:
         """
@@ -89,26 +150,227 @@ class Color:
 
         return r, g, b
 
+# The encodings of the color constants, computed once at import
+for _rgb in (Color.RED, Color.GREEN, Color.BLUE, Color.WHITE, Color.YELLOW, Color.CYAN, Color.MAGENTA,
+             Color.BLACK, Color.PINK, Color.ORANGE, Color.PURPLE):
+    Color._rgb565[_rgb] = Color.rgb_to_rgb565(_rgb)
+    Color._rgb888[_rgb] = Color.rgb_to_rgb888(_rgb)
+del _rgb
+
 class NeoPixelMatrix:
     HORIZONTAL = 0
     VERTICAL = 1
 
-    def __init__(self, pin:int, width:int, height:int, direction:int=HORIZONTAL, brightness:float=1.0, bg_color:tuple=Color.BLACK) -> None:
+    # Scroll modes, see `scroll_text()`
+    SCROLL_FRAMEBUFFER = 0
+    SCROLL_VIEWPORT = 1
+
+    # Canvas modes, see `__init__()`
+    CANVAS_RGB565 = 0
+    CANVAS_GRB888 = 1
+    CANVAS_INDEXED4 = 2
+    CANVAS_INDEXED8 = 3
+
+    # Initial palette of the indexed canvases; the remaining entries are black
+    DEFAULT_PALETTE = (Color.BLACK, Color.RED, Color.GREEN, Color.BLUE, Color.WHITE, Color.YELLOW, Color.CYAN,
+                       Color.MAGENTA, Color.PINK, Color.ORANGE, Color.PURPLE)
+
+    GLYPH_WIDTH = 8
+
+    def __init__(self, pin:int, width:int, height:int, direction:int=HORIZONTAL, brightness:float=1.0, bg_color:tuple=Color.BLACK, gamma:float=None, text_cache=None, layout=None, outputs:list=None, canvas:int=CANVAS_RGB565, font=None, palette:list=None, scene_cache=None, threaded_outputs:bool=False) -> None:
+        if layout is not None and (layout.width, layout.height) != (width, height):
+            raise ValueError("The panel layout is {}x{}, not {}x{}".format(layout.width, layout.height, width, height))
         self.width = width
         self.height = height
-
-        self.pin = machine.Pin(pin, machine.Pin.OUT)
-        self.np = neopixel.NeoPixel(self.pin, width * height)
-        self.fb = framebuf.FrameBuffer(
-            bytearray(width * height * 2), width, height, framebuf.RGB565)
+        # Optional PanelLayout of chained panels; replaces the single serpentine wiring (and `direction`)
+        self.layout = layout
+
+        if outputs is not None:
+            # Several data pins, each driving its segment of the strip (see `StripGroup`)
+            try: from outputs import StripGroup
+            except ImportError: from micropython_neopixel_matrix.outputs import StripGroup
+
+            leds = sum(count for _, count in outputs)
+            if leds != width * height:
+                raise ValueError("The outputs drive {} LEDs, not {}".format(leds, width * height))
+            self.np = StripGroup(outputs, threaded_outputs)
+            self.pin = self.np.strips[0].pin
+        else:
+            self.pin = machine.Pin(pin, machine.Pin.OUT)
+            self.np = neopixel.NeoPixel(self.pin, width * height)
+        # CANVAS_RGB565: `fb` is a framebuf.FrameBuffer, converted into the strip buffer on every refresh.
+        # CANVAS_GRB888: `fb` is a GRBCanvas with the strip's layout and 8-bit channels, only scaled by the
+        # brightness (or copied) on refresh; layers, the text cache and viewport scrolling need RGB565.
+        # CANVAS_INDEXED4/8: `fb` is a GS4_HMSB/GS8 framebuffer of palette indices (16/256 colors), converted
+        # through the palette on refresh; layers and the text cache need RGB565.
+        self.canvas_mode = canvas
+        # Palette of the indexed canvases as r, g, b bytes per entry; None for the other canvases
+        self._palette = None
+        if canvas == NeoPixelMatrix.CANVAS_INDEXED4 or canvas == NeoPixelMatrix.CANVAS_INDEXED8:
+            self._palette = bytearray(3 * (16 if canvas == NeoPixelMatrix.CANVAS_INDEXED4 else 256))
+            colors = palette if palette is not None else NeoPixelMatrix.DEFAULT_PALETTE
+            if len(colors) > len(self._palette) // 3:
+                raise ValueError("The palette has {} colors; this canvas holds {}".format(len(colors), len(self._palette) // 3))
+            for i, color in enumerate(colors):
+                self._palette[3 * i:3 * i + 3] = bytes(color)
         self.fb_width = width
-
-        self.direction = direction
-        # Ensure the brightness value is within the range [0, 1]
-        self.brightness = max(0, min(1, brightness))
+        if canvas == NeoPixelMatrix.CANVAS_GRB888:
+            self.fb = self.fb_buf = None  # created once the pixel map exists
+        else:
+            self.fb_buf, self.fb = self._new_framebuffer(width)
+        # Left edge of the visible window inside the framebuffer (used by viewport scrolling)
+        self._view_x = 0
+
+        # Dirty-region tracking: `_dirty_box` is the [x0, y0, x1, y1) area touched by the drawing
+        # methods since the last refresh; `_dirty_full` forces a conversion of the whole frame.
+        # `_dirty_box` is either None or the preallocated `_dirty_rect`, so marking doesn't allocate.
+        self._dirty_full = True
+        self._dirty_box = None
+        self._dirty_rect = [0, 0, 0, 0]
+        # Copy of the last frame sent to the strip; unchanged frames are not written again
+        self._last_frame = bytearray(len(self.np.buf))
+        self.frames_written = 0
+        self.frames_skipped = 0
+        self.pixels_converted = 0
+
+        # Bumped whenever the same framebuffer would convert to other strip bytes (see `show_list()`)
+        self._output_version = 0
+
+        self._strip_index = None
+        self.direction = direction  # also builds the pixel map
+        # Byte positions of r, g and b inside one strip pixel (GRB on WS2812b)
+        self._order = getattr(self.np, 'ORDER', (1, 0, 2, 3))
+
+        if canvas == NeoPixelMatrix.CANVAS_GRB888:
+            try: from canvas import GRBCanvas
+            except ImportError: from micropython_neopixel_matrix.canvas import GRBCanvas
+            self.fb = GRBCanvas(width, height, self._strip_index, self._order)
+            self.fb_buf = self.fb.buf
+
+        self._gamma = gamma
+        self.brightness = brightness  # also builds the color tables
         self.bg_color = bg_color
 
+        # Optional TextCache; when set, text is blitted from cached bitmaps instead of re-rendered
+        self.text_cache = text_cache
+        # Optional variable-width Font; None uses framebuf's 8x8 font
+        self.font = font
+        # Optional SceneCache of rasterized display lists (see `show_list()`)
+        self.scene_cache = scene_cache
+
+        # Layers, composited onto `fb` on refresh (see `add_layer()`)
+        self._layers = []
+        self._layer_damage = None  # area uncovered by removed layers
+        self.compositions = 0
+
         self.manual_refresh = False
+        self.scroll_mode = NeoPixelMatrix.SCROLL_FRAMEBUFFER
+
+        # Optional FrameProbe timing the refresh stages (see `enable_instrumentation()`)
+        self._probe = None
+
+        # Garbage collection policy of the refresh path; by default collecting is up to the application
+        self.gc_every = 0      # collect every N refreshes (0: never)
+        self.gc_min_free = 0   # collect when less than this many bytes are free (0: never; MicroPython only)
+        self._frames_since_gc = 0
+
+    @property
+    def direction(self) -> int:
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction:int) -> None:
+        self._direction = direction
+        self._build_pixel_map()
+
+    @property
+    def brightness(self) -> float:
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, brightness:float) -> None:
+        # Ensure the brightness value is within the range [0, 1]
+        self._brightness = max(0, min(1, brightness))
+        self._build_color_tables()
+
+    @property
+    def gamma(self) -> float:
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self, gamma:float) -> None:
+        self._gamma = gamma
+        self._build_color_tables()
+
+    def _build_color_tables(self) -> None:
+        """
+        Build the per-channel lookup tables used by `_update_np_from_fb()`.
+
+        Each RGB565 channel (5 bits red, 6 bits green, 5 bits blue) gets a 32/64 entry table
+        mapping the raw channel value to the final strip byte, with the optional gamma curve
+        and the brightness already applied. With `gamma=None` the tables produce exactly the
+        bytes of `_apply_brightness(Color.rgb565_to_rgb888(...))`.
+        """
+        brightness = self._brightness
+        gamma = self._gamma
+
+        def channel_table(bits:int) -> bytearray:
+            shift = 8 - bits
+            table = bytearray(1 << bits)
+            for v in range(1 << bits):
+                v8 = v << shift
+                if gamma:
+                    v8 = int(((v8 / 255) ** gamma) * 255 + 0.5)
+                table[v] = int(v8 * brightness)
+            return table
+
+        self._lut_r = channel_table(5)
+        self._lut_g = channel_table(6)
+        self._lut_b = channel_table(5)
+        # GRB888 canvas: one table for all channels, or none if the bytes can be copied as they are
+        self._lut_888 = None if brightness >= 1 and not gamma else channel_table(8)
+        # The tables the conversion kernel of the canvas works with (see kernels.py)
+        self._job = None
+        if self._palette is not None:
+            self._build_palette_tables()
+        elif self.canvas_mode == NeoPixelMatrix.CANVAS_RGB565:
+            self._job = self._new_job((self._lut_r, self._lut_g, self._lut_b))
+        elif self._lut_888 is not None:
+            self._job = self._new_job((self._lut_888,))
+        self._output_version += 1
+        self._dirty_full = True
+
+    def _build_palette_tables(self) -> None:
+        """
+        Build the strip bytes of every palette entry, one table per channel, with the gamma curve
+        and the brightness applied (see `_build_color_tables()`).
+        """
+        palette = self._palette
+        lut = self._lut_888
+        entries = len(palette) // 3
+        tables = []
+        for channel in range(3):
+            table = bytearray(entries)
+            for i in range(entries):
+                value = palette[3 * i + channel]
+                table[i] = value if lut is None else lut[value]
+            tables.append(table)
+        self._palette_r, self._palette_g, self._palette_b = tables
+        self._job = self._new_job(tables)
+        self._job[kernels.ENTRIES] = entries
+        self._job[kernels.DEPTH] = 4 if self.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED4 else 8
+
+    def _new_job(self, tables:tuple):
+        """
+        Create the job array of a conversion kernel: the given lookup tables, the byte order
+        of the strip and the width of the display (see kernels.py).
+        """
+        job = kernels.new_job(tables)
+        job[kernels.ORDER] = self._order[0]
+        job[kernels.ORDER + 1] = self._order[1]
+        job[kernels.ORDER + 2] = self._order[2]
+        job[kernels.WIDTH] = self.width
+        return job
 
     def _transform_coordinates(self, x:int, y:int) -> tuple: # Doesnt work for me: it just flips everything on it's head
         """
@@ -121,7 +383,45 @@ class NeoPixelMatrix:
             y = self.height - 1 - y
         return x, y
 
+    def _build_pixel_map(self) -> None:
+        """
+        Build the pixel map: the display pixel -> strip index table the conversion kernels walk
+        (see `_update_np_from_fb()`).
+
+        The zig-zag (serpentine) wiring and `_transform_coordinates()`, or the panel layout, only
+        depend on the geometry and the direction, so they are evaluated once here instead of on
+        every frame. Has to be rebuilt whenever the direction changes.
+        """
+        # display pixel y * width + x -> strip index
+        strip_index = array('H', bytes(2 * self.width * self.height))
+
+        coordinates = self.layout.coordinates() if self.layout is not None else self._serpentine_coordinates()
+        for i, (x, y) in enumerate(coordinates):
+            strip_index[y * self.width + x] = i
+
+        self._strip_index = strip_index
+        self._output_version += 1
+        self._dirty_full = True
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888 and self.fb is not None:
+            self.fb.remap(strip_index)
+
+    def _serpentine_coordinates(self):
+        """
+        Yield the display (x, y) coordinates of the LEDs of a single serpentine panel, in strip order.
+        """
+        for w in reversed(range(self.width)):
+            # Determine the row iteration order based on whether the column is even or odd
+            if w % 2 == 0:
+                row_order = reversed(range(self.height))
+            else:
+                row_order = range(self.height)
+
+            for h in row_order:
+                yield self._transform_coordinates(w, h)
+
     def _get_text_width(self, string:str) -> int:
+        if self.font is not None:
+            return self.font.text_width(string)
         char_width, char_height = 8, 8  # Assuming each character is 8x8 pixels
         return len(string) * char_width
 
@@ -132,49 +432,480 @@ class NeoPixelMatrix:
             return 0
         return (self.width - text_width) // 2
 
-    #@timed_function
+    def mark_dirty(self, x:int=0, y:int=0, w:int=None, h:int=None) -> None:
+        """
+        Mark an area of the framebuffer as changed, so the next `show()` converts it.
+
+        The drawing methods of this class do this themselves. Call it after drawing on `self.fb`
+        directly; without arguments the whole frame is converted on the next refresh.
+
+        Arguments:
+            (Optional:)
+            - x : int:  The x-coordinate of the top-left corner of the changed area. Defaults to 0.
+            - y : int:  The y-coordinate of the top-left corner of the changed area. Defaults to 0.
+            - w : int:  The width of the changed area. Defaults to the whole frame.
+            - h : int:  The height of the changed area. Defaults to the whole frame.
+        """
+        if w is None or h is None:
+            self._dirty_full = True
+            return
+
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.fb_width, x + w), min(self.height, y + h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        box = self._dirty_box
+        if box is None:
+            box = self._dirty_rect
+            box[0] = x0
+            box[1] = y0
+            box[2] = x1
+            box[3] = y1
+            self._dirty_box = box
+        else:
+            box[0] = min(box[0], x0)
+            box[1] = min(box[1], y0)
+            box[2] = max(box[2], x1)
+            box[3] = max(box[3], y1)
+
+    def reset_stats(self) -> None:
+        """
+        Reset the refresh counters `frames_written`, `frames_skipped` and `pixels_converted`.
+        """
+        self.frames_written = 0
+        self.frames_skipped = 0
+        self.pixels_converted = 0
+
+    @property
+    def probe(self):
+        return self._probe
+
+    def enable_instrumentation(self, frames:int=64, callback=None):
+        """
+        Time every refresh stage (draw, gc, convert, write) into a ring buffer of frame records.
+        Without instrumentation, the refresh path only checks for a missing probe.
+
+        Arguments:
+            (Optional:)
+            - frames   : int:       The number of frame records kept. Defaults to 64.
+            - callback : callable:  Called with the record of every frame, e.g. to send it as telemetry. Defaults to None.
+
+        Return value:
+            - probe    : FrameProbe:  The probe, with `summary()` giving min/avg/max/p95 per stage.
+        """
+        try: from instrumentation import FrameProbe
+        except ImportError: from micropython_neopixel_matrix.instrumentation import FrameProbe
+
+        self._probe = FrameProbe(frames, callback)
+        return self._probe
+
+    def disable_instrumentation(self) -> None:
+        """
+        Stop timing the refresh stages and drop the probe.
+        """
+        self._probe = None
+
     def _update_np_from_fb(self) -> None:
         """
         Update the NeoPixel matrix with the current contents of the framebuffer.
-        
-        This method reads the pixel colors from the framebuffer, applies brightness adjustments,
-        and sets the corresponding NeoPixel matrix pixels to the transformed colors.
+
+        Only the dirty region recorded by the drawing methods (see `mark_dirty()`) is converted;
+        if nothing was recorded, e.g. because the caller drew on `self.fb` directly, the whole
+        frame is converted. The visible window starts at framebuffer column `_view_x`.
+
+        Nothing is allocated here in steady state (without layers); the garbage collector only
+        runs if `gc_every` or `gc_min_free` ask for it.
         """
-        gc.collect()
-        counter = 0
-        self.np.fill(self.bg_color)
-        for w in reversed(range(self.width)):
-            # Determine the row iteration order based on whether the column is even or odd
-            if w % 2 == 0:
-                row_order = reversed(range(self.height))
+        probe = self._probe
+        if probe is not None:
+            probe.begin()
+
+        if self.gc_every or self.gc_min_free:
+            self._collect_garbage()
+        if probe is not None:
+            probe.lap(probe.GC)
+
+        if self._layers or self._layer_damage is not None:
+            self._compose()
+
+        box = self._dirty_box
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            self._convert_canvas()
+        elif self._palette is not None:
+            if self._dirty_full or box is None:
+                self._convert_indexed(self._view_x, 0, self._view_x + self.width, self.height)
             else:
-                row_order = range(self.height)
+                self._convert_indexed(box[0], box[1], box[2], box[3])
+        elif self._dirty_full or box is None:
+            self._convert_frame()
+        else:
+            self._convert_region(box[0], box[1], box[2], box[3])
+        self._dirty_full = False
+        self._dirty_box = None
+        if probe is not None:
+            probe.lap(probe.CONVERT)
 
-            for h in row_order:
-                x, y = self._transform_coordinates(w, h)
-                rgb565 = self.fb.pixel(x, y)
-                rgb888_pixel = self._apply_brightness(Color.rgb565_to_rgb888(rgb565))
+    def _collect_garbage(self) -> None:
+        """
+        Run `gc.collect()` if the policy set by `gc_every` and `gc_min_free` asks for it.
+        """
+        self._frames_since_gc += 1
+        if self.gc_every and self._frames_since_gc >= self.gc_every:
+            collect = True
+        elif self.gc_min_free and hasattr(gc, 'mem_free'):
+            collect = gc.mem_free() < self.gc_min_free
+        else:
+            collect = False
 
-                # Only update non-bg-color pixels; makes the display update faster
-                if rgb888_pixel != self.bg_color:
-                    self.np[counter] = rgb888_pixel
+        if collect:
+            gc.collect()
+            self._frames_since_gc = 0
 
-                counter += 1
+    def add_layer(self, name:str, width:int=None, height:int=None, x:int=0, y:int=0, z:int=0, key:tuple=None):
+        """
+        Add a named layer with its own framebuffer. Layers are composited onto the matrix
+        framebuffer in z-order on every refresh in which one of them changed; once layers are
+        in use, draw into the layers rather than onto `fb` directly.
+
+        Arguments:
+            - name   : str:                         The name of the layer.
+            (Optional:)
+            - width  : int:                         The width of the layer. Defaults to the width of the matrix.
+            - height : int:                         The height of the layer. Defaults to the height of the matrix.
+            - x      : int:                         The x-coordinate of the layer on the matrix. Defaults to 0.
+            - y      : int:                         The y-coordinate of the layer on the matrix. Defaults to 0.
+            - z      : int:                         The z-order; higher layers are drawn on top. Defaults to 0.
+            - key    : tuple(r:int, g:int, b:int):  Pixels of this color are transparent. Defaults to None (opaque).
+
+        Return value:
+            - layer  : Layer:  The new layer.
+
+        Example:
+            ticker = matrix.add_layer("ticker", width=32, height=8, z=1, key=Color.BLACK)
+            ticker.text("News", 0, 0, Color.YELLOW)
+            matrix.show()
+        """
+        try: from layers import Layer
+        except ImportError: from micropython_neopixel_matrix.layers import Layer
+
+        if self.canvas_mode != NeoPixelMatrix.CANVAS_RGB565:
+            raise ValueError("Layers need the RGB565 canvas")
+
+        if self.get_layer(name) is not None:
+            raise ValueError("Layer '{}' already exists".format(name))
+
+        layer = Layer(name, width or self.width, height or self.height, x, y, z, key)
+        self._layers.append(layer)
+        return layer
+
+    def get_layer(self, name:str):
+        """
+        Return the layer with the given name, or None.
+        """
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def remove_layer(self, name:str) -> None:
+        """
+        Remove the layer with the given name; the area it covered is recomposed on the next refresh.
+        """
+        layer = self.get_layer(name)
+        if layer is None:
+            return
+        self._layers.remove(layer)
+        if layer._composed_box is not None:
+            self._layer_damage = self._union_box(self._layer_damage, layer._composed_box)
+
+    @staticmethod
+    def _layer_z(layer) -> int:
+        return layer.z
+
+    @staticmethod
+    def _union_box(box, other):
+        if other is None:
+            return box
+        if box is None:
+            return list(other)
+        return [min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3])]
+
+    def _compose(self) -> None:
+        """
+        Recompose the area touched by changed layers: fill it with the background color and
+        blit every visible layer that overlaps it, bottom to top. Layers that didn't change are
+        not redrawn, just blitted again, and only where they overlap a changed one.
+        """
+        layers = self._layers
+        # The union of the damaged areas, kept in locals so composing doesn't allocate
+        x0 = y0 = 0x7FFFFFFF
+        x1 = y1 = -0x7FFFFFFF
+        damage = self._layer_damage
+        if damage is not None:
+            x0, y0 = damage[0], damage[1]
+            x1, y1 = damage[2], damage[3]
+        for layer in layers:
+            if layer.dirty:
+                box = layer._composed_box
+                if box is not None:
+                    x0, y0 = min(x0, box[0]), min(y0, box[1])
+                    x1, y1 = max(x1, box[2]), max(y1, box[3])
+                if layer.visible:
+                    x0, y0 = min(x0, layer.x), min(y0, layer.y)
+                    x1, y1 = max(x1, layer.x + layer.width), max(y1, layer.y + layer.height)
+
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.fb_width, x1), min(self.height, y1)
+        if x0 < x1 and y0 < y1:
+            layers.sort(key=NeoPixelMatrix._layer_z)
+            self.fb.fill_rect(x0, y0, x1 - x0, y1 - y0, Color.to_rgb565(self.bg_color))
+            for layer in layers:
+                if layer.visible:
+                    layer.blit_region(self.fb, x0, y0, x1, y1)
+            self.mark_dirty(x0, y0, x1 - x0, y1 - y0)
+            self.compositions += 1
+
+        for layer in layers:
+            if layer.dirty:
+                layer._composed()
+        self._layer_damage = None
+
+    def _convert_frame(self) -> None:
+        """
+        Convert the visible window of the framebuffer into the NeoPixel byte buffer.
+
+        The conversion kernel (see kernels.py) reads the pixel colors straight from the framebuffer's
+        bytearray and writes the brightness/gamma adjusted channel bytes (see `_build_color_tables()`)
+        directly into the NeoPixel byte buffer, in strip order. No tuples are created per pixel.
+        """
+        self._convert_region(self._view_x, 0, self._view_x + self.width, self.height)
+
+    def _convert_canvas(self, start:int=0, end:int=None, canvas_buf=None) -> None:
+        """
+        Copy the GRB888 canvas into the NeoPixel byte buffer, scaling every byte by the brightness
+        and gamma table if there is one. The canvas is already in strip order and byte order.
+        `start` and `end` limit the copy to a range of strip bytes, `canvas_buf` replaces the canvas.
+        """
+        np_buf = self.np.buf
+        if canvas_buf is None:
+            canvas_buf = self.fb_buf
+        if end is None:
+            end = len(canvas_buf)
+        job = self._job
+        if job is None:
+            if start == 0 and end == len(canvas_buf):
+                np_buf[:] = canvas_buf
+            else:
+                np_buf[start:end] = memoryview(canvas_buf)[start:end]
+        else:
+            job[kernels.START] = start
+            job[kernels.END] = end
+            kernels.scale(np_buf, canvas_buf, job)
+
+        self.pixels_converted += (end - start) // 3
+
+    def _convert_region(self, x0:int, y0:int, x1:int, y1:int, fb_buf=None, view_x:int=None) -> None:
+        """
+        Convert the framebuffer area [x0, x1) x [y0, y1) into the NeoPixel byte buffer,
+        using the pixel map to find the strip index of every pixel.
+        `fb_buf` and `view_x` replace the framebuffer bytes and the visible window (see `NeoPixelMatrixAsync`).
+        """
+        if fb_buf is None:
+            fb_buf = self.fb_buf
+        if view_x is None:
+            view_x = self._view_x
+        # framebuffer -> display columns
+        x0 = max(x0 - view_x, 0)
+        x1 = min(x1 - view_x, self.width)
+        if x0 >= x1:
+            return
+
+        job = self._job
+        job[kernels.X0] = x0
+        job[kernels.Y0] = y0
+        job[kernels.X1] = x1
+        job[kernels.Y1] = y1
+        job[kernels.STRIDE] = self.fb_width
+        job[kernels.VIEW] = view_x
+        kernels.rgb565(self.np.buf, fb_buf, self._strip_index, job)
+
+        self.pixels_converted += (x1 - x0) * (y1 - y0)
+
+    def _convert_indexed(self, x0:int, y0:int, x1:int, y1:int, fb_buf=None, view_x:int=None) -> None:
+        """
+        Convert the area [x0, x1) x [y0, y1) of an indexed framebuffer into the NeoPixel byte buffer,
+        looking up every palette index in the strip byte tables of the palette.
+        `fb_buf` and `view_x` are as for `_convert_region()`.
+        """
+        if fb_buf is None:
+            fb_buf = self.fb_buf
+        if view_x is None:
+            view_x = self._view_x
+        x0 = max(x0 - view_x, 0)
+        x1 = min(x1 - view_x, self.width)
+        if x0 >= x1:
+            return
+
+        job = self._job
+        job[kernels.X0] = x0
+        job[kernels.Y0] = y0
+        job[kernels.X1] = x1
+        job[kernels.Y1] = y1
+        # GS4_HMSB rows start on a whole byte
+        job[kernels.STRIDE] = (self.fb_width + 1) & ~1 if self.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED4 else self.fb_width
+        job[kernels.VIEW] = view_x
+        kernels.indexed(self.np.buf, fb_buf, self._strip_index, job)
+
+        self.pixels_converted += (x1 - x0) * (y1 - y0)
+
+    def _write(self) -> None:
+        """
+        Send the NeoPixel byte buffer to the strip, unless it is identical to the last frame sent.
+        """
+        probe = self._probe
+        if probe is not None:
+            probe.restart()
+
+        np_buf = self.np.buf
+        if self.frames_written and np_buf == self._last_frame:
+            self.frames_skipped += 1
+        else:
+            self._last_frame[:] = np_buf
+            self._send()
+            self.frames_written += 1
+
+        if probe is not None:
+            probe.end()
+
+    def _send(self) -> None:
+        """
+        Send the NeoPixel byte buffer to the strip; subclasses without a strip (the mock) replace this.
+        """
+        self.np.write()
 
     def _draw_text_to_buffer(self, string:str, x:int, y:int, color:tuple, buffer) -> None:
         """
         Draw the given text string to the specified buffer at the given x and y coordinates.
+        Goes through `text_cache` if the matrix has one.
         """
-        buffer.text(string, x, y, Color.rgb_to_rgb565(color))
+        if self.text_cache is not None and self.canvas_mode == NeoPixelMatrix.CANVAS_RGB565:
+            self.text_cache.draw(buffer, string, x, y, Color.to_rgb565(color), self.font)
+        elif self.font is not None:
+            self.font.draw(buffer, string, x, y, self._color(color), self.fb_width)
+        else:
+            buffer.text(string, x, y, self._color(color))
 
     def _update_framebuffer_size(self, fb_width:int) -> None:
         """
         Update the framebuffer size if the given width is different from the current framebuffer width.
+        Also moves the visible window back to the left edge of the framebuffer.
         """
+        if self._view_x:
+            self._view_x = 0
+            self._dirty_full = True
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            return  # the canvas has the size of the display; drawing beyond it is clipped
         if self.fb_width != fb_width:
-            self.fb = framebuf.FrameBuffer(
-                bytearray(fb_width * self.height * 2), fb_width, self.height, framebuf.RGB565)
+            self.fb_buf, self.fb = self._new_framebuffer(fb_width)
             self.fb_width = fb_width
+            # The pixel map stays: it is indexed by display pixel, not by framebuffer offset
+            self._output_version += 1
+            self._dirty_full = True
+
+    def _new_framebuffer(self, fb_width:int) -> tuple:
+        """
+        Allocate a framebuffer of the given width in the format of the canvas (not for GRB888).
+
+        Return value:
+            - fb_buf : bytearray:    The pixel data.
+            - fb     : FrameBuffer:  The framebuffer drawing into it.
+        """
+        height = self.height
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED4:
+            fb_buf = bytearray(((fb_width + 1) // 2) * height)
+            return fb_buf, framebuf.FrameBuffer(fb_buf, fb_width, height, framebuf.GS4_HMSB)
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED8:
+            fb_buf = bytearray(fb_width * height)
+            return fb_buf, framebuf.FrameBuffer(fb_buf, fb_width, height, framebuf.GS8)
+        fb_buf = bytearray(fb_width * height * 2)
+        return fb_buf, framebuf.FrameBuffer(fb_buf, fb_width, height, framebuf.RGB565)
+
+    def _color(self, color:tuple) -> int:
+        """
+        Convert an RGB888 color tuple to the color format of the canvas. On an indexed canvas
+        this is the index of the first palette entry with that color; an int is taken as an index.
+        """
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            return Color.to_rgb888(color)
+        if self._palette is not None:
+            if isinstance(color, int):
+                return color
+            return self.palette_index(color)
+        return Color.to_rgb565(color)
+
+    def palette_index(self, color:tuple) -> int:
+        """
+        Return the index of the first palette entry with the given color (indexed canvases only).
+
+        Arguments:
+            - color : tuple(r:int, g:int, b:int):  The color to look up.
+
+        Return value:
+            - index : int:                         The palette index.
+        """
+        palette = self._palette
+        r, g, b = color
+        for i in range(0, len(palette), 3):
+            if palette[i] == r and palette[i + 1] == g and palette[i + 2] == b:
+                return i // 3
+        raise ValueError("{} is not in the palette".format(color))
+
+    def palette_color(self, index:int) -> tuple:
+        """
+        Return the color of a palette entry (indexed canvases only).
+        """
+        palette = self._palette
+        return palette[3 * index], palette[3 * index + 1], palette[3 * index + 2]
+
+    def set_palette_color(self, index:int, color:tuple) -> None:
+        """
+        Change one palette entry (indexed canvases only). Every pixel with this index shows the new color
+        on the next refresh, without touching the framebuffer, which makes color cycling and fades cheap.
+
+        Arguments:
+            - index : int:                         The palette index; 0-15 on CANVAS_INDEXED4, 0-255 on CANVAS_INDEXED8.
+            - color : tuple(r:int, g:int, b:int):  The new color.
+        """
+        palette = self._palette
+        if palette is None:
+            raise ValueError("Only the indexed canvases have a palette")
+        if not 0 <= index < len(palette) // 3:
+            raise IndexError("Palette index {} out of range".format(index))
+        r, g, b = color
+        palette[3 * index] = r
+        palette[3 * index + 1] = g
+        palette[3 * index + 2] = b
+        lut = self._lut_888
+        entries = len(palette) // 3
+        job = self._job
+        for i, table, value in ((0, self._palette_r, r), (1, self._palette_g, g), (2, self._palette_b, b)):
+            table[index] = job[kernels.TABLES + i * entries + index] = value if lut is None else lut[value]
+        self._output_version += 1
+        self._dirty_full = True
+
+    def set_palette(self, colors:list, start:int=0) -> None:
+        """
+        Change consecutive palette entries, starting at `start` (indexed canvases only).
+
+        Example:
+            # Cycle the colors of entries 1 to 6
+            colors = [np_matrix.palette_color(i) for i in range(1, 7)]
+            np_matrix.set_palette(colors[1:] + colors[:1], start=1)
+            np_matrix.show()
+        """
+        for i, color in enumerate(colors):
+            self.set_palette_color(start + i, color)
 
     def _apply_brightness(self, color:tuple) -> tuple:
         """
@@ -194,7 +925,8 @@ class NeoPixelMatrix:
         Arguments:
             - color : tuple(r:int, g:int, b:int):  The color of the line in the RGB888 color format
         """
-        self.fb.fill(Color.rgb_to_rgb565(color))
+        self.fb.fill(self._color(color))
+        self._dirty_full = True
 
     def line(self, pos1: tuple[int, int], pos2: tuple[int, int], color: tuple=Color.RED) -> None:
         """
@@ -207,7 +939,10 @@ class NeoPixelMatrix:
             - color : tuple(r:int, g:int, b:int):  The color of the line, as an (R, G, B) tuple. Default is Color.RED.
         """
 
-        self.fb.line(pos1[0], pos1[1], pos2[0], pos2[1], Color.rgb_to_rgb565(color))
+        self.fb.line(pos1[0], pos1[1], pos2[0], pos2[1], self._color(color))
+        x0, x1 = min(pos1[0], pos2[0]), max(pos1[0], pos2[0])
+        y0, y1 = min(pos1[1], pos2[1]), max(pos1[1], pos2[1])
+        self.mark_dirty(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
         if not self.manual_refresh: self.show()
 
     def rect(self, pos1: tuple[int, int], pos2: tuple[int, int], color: tuple=Color.RED, fill:bool=True) -> None:
@@ -221,8 +956,10 @@ class NeoPixelMatrix:
             - color : tuple(r:int, g:int, b:int):  The color of the rectangle, as an (R, G, B) tuple. Default is Color.RED.
             - fill  : bool:                        If True, the rectange will be filled with the given color; if False, only the outline will be drawn. Defaults to True.
         """
-        Color.rgb_to_rgb565(color)
-        self.fb.poly(0,0, bytearray([pos1[0],pos1[1], pos2[0],pos1[1], pos2[0],pos2[1], pos1[0],pos2[1]]), Color.rgb_to_rgb565(color), fill)
+        self.fb.poly(0,0, bytearray([pos1[0],pos1[1], pos2[0],pos1[1], pos2[0],pos2[1], pos1[0],pos2[1]]), self._color(color), fill)
+        x0, x1 = min(pos1[0], pos2[0]), max(pos1[0], pos2[0])
+        y0, y1 = min(pos1[1], pos2[1]), max(pos1[1], pos2[1])
+        self.mark_dirty(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
 
         if not self.manual_refresh: self.show()
 
@@ -231,7 +968,63 @@ class NeoPixelMatrix:
         Update the NeoPixel matrix with the current contents of the framebuffer.
         """
         self._update_np_from_fb()
-        self.np.write()
+        self._write()
+
+    def close(self) -> None:
+        """
+        Stop the writer threads of the outputs, if `threaded_outputs` started any. The matrix keeps
+        working; the outputs are then written one after the other.
+        """
+        close = getattr(self.np, 'close', None)
+        if close is not None:
+            close()
+
+    def show_list(self, display_list) -> None:
+        """
+        Show a `DisplayList` as the whole scene: its operations are drawn onto the background color
+        in one pass and the strip is refreshed once.
+
+        With a `scene_cache`, the rasterized scene is stored under the content of the list; showing
+        a list with the same content again only copies the cached framebuffer and strip bytes back
+        and writes them (or nothing, if the strip already shows them).
+
+        Arguments:
+            - display_list : DisplayList:  The scene to show.
+
+        Example:
+            scene = DisplayList()
+            scene.text("OPEN", 4, 0, Color.GREEN)
+            scene.rect((0, 7), (31, 7), Color.GREEN)
+            np_matrix.show_list(scene)
+        """
+        self._render_scene(display_list)
+        self._write()
+
+    def _render_scene(self, display_list) -> None:
+        """
+        Bring the framebuffer and the strip buffer to the scene of a display list, from the scene cache if possible.
+        """
+        self._update_framebuffer_size(self.width)  # scenes have the size of the display
+        # Layers are composited on top of the scene, so the cache holds no final frame with them
+        cache = self.scene_cache if not self._layers else None
+        entry = None
+        if cache is not None:
+            # The background and the font are drawn into the scene too, but aren't part of the output version
+            key = (display_list.key, display_list._color(self.bg_color), self.font)
+            entry = cache.get(key, self._output_version)
+
+        if entry is None:
+            display_list.render(self)
+            self._dirty_full = True
+            NeoPixelMatrix._update_np_from_fb(self)  # also for subclasses with an async one
+            if cache is not None:
+                cache.put(key, self.fb_buf, self.np.buf, self._output_version)
+            return
+
+        self.fb_buf[:] = entry[0]
+        self.np.buf[:] = entry[1]
+        self._dirty_full = False
+        self._dirty_box = None
 
     def clear(self, refresh: bool = True) -> None:
         """
@@ -263,7 +1056,7 @@ class NeoPixelMatrix:
         self._update_framebuffer_size(fb_width)
 
         # Clear the framebuffer before drawing new text
-        self.clear(refresh=False)
+        self.fill(self.bg_color)
         self._draw_text_to_buffer(string, x, y , color, self.fb)
         if not self.manual_refresh: self.show()
 
@@ -293,6 +1086,7 @@ class NeoPixelMatrix:
             starting_x = fb_width - text_width  # start at the right edge
         else:
             fb_width = max(text_width, self.width)
+            starting_x = x
 
         scroll_range = fb_width - self.width  # will stop at the left of the matrix
         if scroll_out:
@@ -315,24 +1109,195 @@ class NeoPixelMatrix:
             - scroll_in  : bool:                        If True, the text will scroll in from the right edge of the matrix. Defaults to True.
             - scroll_out : bool:                        If True, the text will scroll out to the left edge of the matrix. Defaults to True.
 
+        How the text is moved depends on `scroll_mode`:
+            - NeoPixelMatrix.SCROLL_FRAMEBUFFER: The whole text is drawn into a framebuffer as wide as the text
+              plus the display, which is then shifted by `fb.scroll()` on every step. (Default)
+            - NeoPixelMatrix.SCROLL_VIEWPORT:    The framebuffer is only one glyph wider than the display and
+              holds just the glyphs inside the visible window; each step moves the window. Memory and time per
+              step are the same for any length of text.
+
         Example:
             np_matrix.scroll_text("Hello, world!", color=Color.GREEN, delay=0.1, scroll_in=True, scroll_out=True)
         """
+        for _ in self._scroll_steps(string, x, y, color, scroll_in, scroll_out):
+            self.show()
+            time.sleep(delay)
+
+    def _scroll_steps(self, string:str, x:int, y:int, color:tuple, scroll_in:bool, scroll_out:bool):
+        """
+        Generator behind `scroll_text()`: prepares the framebuffer for each scrolling step and yields
+        before it is shown, so the sync and async variants only differ in how they refresh and wait.
+        """
         fb_width, starting_x, scroll_range = self._get_scroll_text_range(
             string=string, x=x, y=y, scroll_in=scroll_in, scroll_out=scroll_out
         )
 
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            # The canvas can't be wider than the display: redraw the text one column further left every step
+            for step in range(1, scroll_range + 1):
+                self.fill(self.bg_color)
+                self._draw_text_to_buffer(string, starting_x - step, y, color, self.fb)
+                yield
+            return
+
+        if self.scroll_mode == NeoPixelMatrix.SCROLL_VIEWPORT:
+            yield from self._scroll_steps_viewport(string, y, color, starting_x, scroll_range)
+            return
+
         self._update_framebuffer_size(fb_width)
 
-        self.clear(refresh=False)
+        self.fill(self.bg_color)
         self._draw_text_to_buffer(string, starting_x, y, color, self.fb)
 
+        bg_color = self._color(self.bg_color)
         for _ in range(scroll_range):
             self.fb.scroll(-1, 0)
-            self.show()
-            time.sleep(delay)
-            
-    
+            # scroll() leaves the vacated column as it was; clear it so a glyph ending there doesn't smear
+            self.fb.vline(self.fb_width - 1, 0, self.height, bg_color)
+            self._dirty_full = True
+            yield
+
+    def _scroll_steps_viewport(self, string:str, y:int, color:tuple, starting_x:int, scroll_range:int):
+        """
+        Viewport variant of `_scroll_steps()`.
+
+        The framebuffer covers the glyph-aligned text columns [glyph_x, glyph_x + width + GLYPH_WIDTH).
+        Each step only moves `_view_x` inside it; the few glyphs in the window are redrawn once every
+        GLYPH_WIDTH steps, when the window crosses into the next glyph.
+        """
+        glyph_width = NeoPixelMatrix.GLYPH_WIDTH
+        self._update_framebuffer_size(self.width + glyph_width)
+        fb_width = self.fb_width
+        glyph_x = None
+        c = self._color(color)
+        font = self.font
+        # Variable-width font: the first glyph not entirely left of the window, and its text column.
+        # The window only moves right, so the glyphs it left behind are passed over once
+        char, char_x = 0, 0
+
+        try:
+            for step in range(1, scroll_range + 1):
+                # Text column shown at the left edge of the display
+                text_x = step - starting_x
+                window_glyph_x = (text_x // glyph_width) * glyph_width
+
+                if window_glyph_x != glyph_x:
+                    glyph_x = window_glyph_x
+                    first = max(0, glyph_x // glyph_width)
+                    last = min(len(string), (glyph_x + fb_width + glyph_width - 1) // glyph_width)
+                    self.fill(self.bg_color)
+                    # Not through the text cache: its bitmap of the whole text would grow with the text again
+                    if font is not None:
+                        while char < len(string) and char_x + font.char_width(string[char]) <= glyph_x:
+                            char_x += font.char_width(string[char]) + font.spacing
+                            char += 1
+                        # No more glyphs than columns fit into the window; draw() stops at its right edge
+                        font.draw(self.fb, string[char:char + fb_width], char_x - glyph_x, y, c, fb_width)
+                    elif first < last:
+                        self.fb.text(string[first:last], first * glyph_width - glyph_x, y, c)
+
+                self._view_x = text_x - glyph_x
+                self._dirty_full = True
+                yield
+        finally:
+            # Move the pixels instead of the window, so the other drawing methods line up again
+            if self._view_x:
+                self.fb.scroll(-self._view_x, 0)
+                self._view_x = 0
+
+    def play_animation(self, source, loops:int=1, speed:float=1.0) -> None:
+        """
+        Play an animation file made by `tools/anim_encode.py`, streaming it frame by frame.
+
+        The frames are decoded straight into the NeoPixel buffer (with brightness and gamma applied
+        to the palette), bypassing the framebuffer, which is shown again on the next refresh.
+
+        Arguments:
+            - source : str or file:  The path of the animation file, or the file opened in binary mode.
+            (Optional:)
+            - loops  : int:          How often to play it; 0 repeats it forever. Defaults to 1.
+            - speed  : float:        Playback speed; 2.0 halves every frame's duration. Defaults to 1.0.
+
+        Example:
+            np_matrix.play_animation("logo.npxa", loops=3)
+        """
+        deadline = utime.ticks_ms()
+        for duration in self._animation_steps(source, loops, speed):
+            self._write()
+            deadline = utime.ticks_add(deadline, duration)
+            utime.sleep_ms(max(0, utime.ticks_diff(deadline, utime.ticks_ms())))
+
+    def play_effect(self, effect, frames:int=None, fps:int=30) -> None:
+        """
+        Play an effect from `effects.py` (or any frame source with a `render(frame)` method writing the
+        NeoPixel buffer) at a fixed frame rate. Like animations, effects bypass the framebuffer.
+
+        Arguments:
+            - effect : Effect:  The frame source.
+            (Optional:)
+            - frames : int:     How many frames to play; None plays forever. Defaults to None.
+            - fps    : int:     The frame rate. Defaults to 30.
+
+        Example:
+            np_matrix.play_effect(Plasma(np_matrix), frames=300)
+        """
+        start = utime.ticks_ms()
+        frame = 0
+        while frames is None or frame < frames:
+            self._show_effect(effect, frame)
+            frame += 1
+            utime.sleep_ms(max(0, utime.ticks_diff(utime.ticks_add(start, frame * 1000 // fps), utime.ticks_ms())))
+
+    def _show_effect(self, effect, frame:int) -> None:
+        effect.render(frame)
+        # The NeoPixel buffer no longer shows the framebuffer
+        self._dirty_full = True
+        self._write()
+
+    def _animation_steps(self, source, loops:int, speed:float):
+        """
+        Generator behind `play_animation()`: decodes the next frame into the NeoPixel buffer and
+        yields its duration in ms, so the sync and async variants only differ in how they wait.
+        """
+        try: from animation import AnimationReader
+        except ImportError: from micropython_neopixel_matrix.animation import AnimationReader
+
+        stream = open(source, 'rb') if isinstance(source, str) else source
+        try:
+            reader = AnimationReader(stream)
+            if (reader.width, reader.height) != (self.width, self.height):
+                raise ValueError("The animation is {}x{}, not {}x{}".format(reader.width, reader.height, self.width, self.height))
+
+            # The palette as strip bytes, with brightness and gamma applied once
+            palette = reader.palette
+            lut = self._lut_888
+            channels = []
+            for offset in range(3):
+                channel = bytearray(256)
+                for i in range(len(palette) // 3):
+                    value = palette[3 * i + offset]
+                    channel[i] = value if lut is None else lut[value]
+                channels.append(channel)
+            palette_r, palette_g, palette_b = channels
+
+            np_buf = self.np.buf
+            strip_index = self._strip_index
+            order = self._order
+            loop = 0
+            while loops == 0 or loop < loops:
+                reader.rewind()
+                while True:
+                    duration = reader.read_frame(np_buf, strip_index, palette_r, palette_g, palette_b, order)
+                    if duration is None:
+                        break
+                    yield int(duration / speed)
+                loop += 1
+        finally:
+            if stream is not source:
+                stream.close()
+            # The NeoPixel buffer no longer shows the framebuffer
+            self._dirty_full = True
+
     def draw_progress_bar(self, progress:int, max_progress:int, color:tuple=Color.RED, margin:int=2, height:int=4) -> None:
         """
         Draw a progress bar on the NeoPixel matrix.
@@ -354,7 +1319,8 @@ class NeoPixelMatrix:
         step = max_width / max_progress
         current_width = round(step * progress)
 
-        self.clear(refresh=False)
-        self.fb.fill_rect(2,margin,current_width, height, Color.rgb_to_rgb565(color))
-        self.fb.rect(2,margin,max_width, height, Color.rgb_to_rgb565(color))
+        c = self._color(color)
+        self.fill(self.bg_color)
+        self.fb.fill_rect(2,margin,current_width, height, c)
+        self.fb.rect(2,margin,max_width, height, c)
         if not self.manual_refresh: self.show()
@@ -7,42 +7,354 @@
 try: from neopixel_matrix import NeoPixelMatrix, Color
 except ImportError: from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix, Color
 
-import uasyncio as asyncio
-import framebuf
+try: from backend import asyncio, utime
+except ImportError: from micropython_neopixel_matrix.backend import asyncio, utime
+
+
+class FrameScheduler:
+    """
+    Runs animations at a fixed frame rate (or with a fixed frame period) on one NeoPixel matrix, with
+    a single refresh per tick.
+
+    An animation is any callable taking the frame number; it draws into the matrix framebuffer and
+    returns False once it is finished. Frame deadlines are derived from the start time on the
+    `utime.ticks_ms()` clock, so they don't drift with render time. When a tick runs late by a whole
+    frame period or more, the missed frames are dropped: animations jump ahead to the current frame
+    number instead of slowing down.
+
+    Example usage:
+
+        scheduler = FrameScheduler(matrix, fps=30)
+        scheduler.add(lambda frame: matrix.fb.pixel(frame % 32, 0, 0xF800))
+        await scheduler.run(frames=300)
+        print(scheduler.fps, scheduler.jitter_ms, scheduler.frames_dropped)
+
+    Arguments:
+        - matrix    : NeoPixelMatrixAsync:  The matrix the animations draw into.
+        (Optional:)
+        - fps       : int:    Frames per second. Defaults to 30.
+        - period_ms : float:  Time between two frames in milliseconds, instead of `fps` (e.g. for periods of a second or more).
+    """
+
+    def __init__(self, matrix, fps:int=30, period_ms:float=None) -> None:
+        self.matrix = matrix
+        # Frame n is due `n * num // den` ms after the start: exact integers, so fractional
+        # periods (1000 / 30 ms, or a period in microseconds) don't accumulate rounding
+        if period_ms is None:
+            self.target_fps = fps
+            self._period = (1000, fps)
+        else:
+            self.target_fps = 1000 / period_ms
+            self._period = (max(1, round(period_ms * 1000)), 1000)
+        self._animations = []
+        self._running = False
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """
+        Reset the frame statistics.
+        """
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.fps = 0              # achieved frames per second of the last run
+        self.jitter_ms = 0        # average lateness of a tick against its deadline
+        self.max_jitter_ms = 0    # worst lateness of a tick against its deadline
+        self._jitter_total = 0
+
+    def add(self, animation):
+        """
+        Register an animation. It is called once per tick with the frame number and can
+        return False to be removed. Returns the animation, so this can be used as a decorator.
+        """
+        self._animations.append(animation)
+        return animation
+
+    def remove(self, animation) -> None:
+        """
+        Unregister an animation.
+        """
+        if animation in self._animations:
+            self._animations.remove(animation)
+
+    def stop(self) -> None:
+        """
+        Make `run()` return after the current tick.
+        """
+        self._running = False
+
+    async def run(self, frames:int=None) -> None:
+        """
+        Run the registered animations until all of them are finished, `stop()` is called or,
+        if given, `frames` frames (rendered or dropped) have passed.
+        """
+        matrix = self.matrix
+        num, den = self._period
+        start = utime.ticks_ms()
+        frame = 0
+        self._running = True
+
+        # The animations draw, the scheduler refreshes once per tick
+        manual_refresh = matrix.manual_refresh
+        matrix.manual_refresh = True
+        try:
+            while self._running and self._animations and (frames is None or frame < frames):
+                late = utime.ticks_diff(utime.ticks_ms(), utime.ticks_add(start, frame * num // den))
+                if late * den >= num:
+                    # Behind by at least one full period: skip ahead to the frame due now
+                    missed = late * den // num
+                    frame += missed
+                    self.frames_dropped += missed
+                    late = utime.ticks_diff(utime.ticks_ms(), utime.ticks_add(start, frame * num // den))
+
+                late = max(0, late)
+                self._jitter_total += late
+                self.max_jitter_ms = max(self.max_jitter_ms, late)
+
+                for animation in list(self._animations):
+                    if animation(frame) is False:
+                        self.remove(animation)
+
+                await matrix.show()
+                self.frames_rendered += 1
+                self.jitter_ms = self._jitter_total / self.frames_rendered
+                frame += 1
+
+                wait = utime.ticks_diff(utime.ticks_add(start, frame * num // den), utime.ticks_ms())
+                await asyncio.sleep_ms(max(0, wait))
+        finally:
+            matrix.manual_refresh = manual_refresh
+            self._running = False
+            elapsed = utime.ticks_diff(utime.ticks_ms(), start)
+            if elapsed > 0:
+                self.fps = self.frames_rendered * 1000 / elapsed
+
+
+class _StepAnimation:
+    """
+    Adapts a generator that prepares one frame per `next()` (like `_scroll_steps()`) to a
+    `FrameScheduler` animation; dropped frames are stepped over without being shown.
+    """
+
+    def __init__(self, steps) -> None:
+        self.steps = steps
+        self.position = -1
+
+    def __call__(self, frame:int) -> bool:
+        try:
+            while self.position < frame:
+                next(self.steps)
+                self.position += 1
+        except StopIteration:
+            return False
+        return True
 
 
 class NeoPixelMatrixAsync(NeoPixelMatrix):
+    """
+    The matrix for uasyncio applications: a refresh converts the framebuffer in chunks of columns and
+    yields to the other tasks whenever it has run for `time_slice_ms`, so they are not stalled for a
+    whole frame.
 
-    def __init__(self, *args, **kwargs):
+    With `double_buffer=True`, `show()` copies the framebuffer (the back buffer) into a front buffer in
+    one step and returns; a task converts the frame from the front buffer and writes it while the
+    application already draws the next one into `fb`. `show()` waits for the previous frame to be
+    written before handing over the next one, `flush()` waits for the last one.
+
+    Arguments (on top of those of `NeoPixelMatrix`):
+        (Optional:)
+        - double_buffer : bool:  Convert and write frames while the next one is drawn. Defaults to False.
+        - time_slice_ms : int:   Longest stretch a refresh runs without yielding; 0 yields after every chunk. Defaults to 5.
+    """
+
+    # Framebuffer columns (or strip columns on a GRB888 canvas) converted between two looks at the clock
+    CHUNK_COLUMNS = 4
+
+    def __init__(self, *args, double_buffer:bool=False, time_slice_ms:int=5, **kwargs):
         super().__init__(*args, **kwargs)
+        self.double_buffer = double_buffer
+        self.time_slice_ms = time_slice_ms
+        self._front_buf = None  # copy of the framebuffer the pending frame is converted from
+        self._pending = None    # task converting and writing the last frame handed to show()
+        self.refresh_yields = 0
+
+    def _take_frame(self, full:bool=False) -> tuple:
+        """
+        Start a refresh: composite the layers and take over (and reset) the dirty region; with double
+        buffering also copy the framebuffer into the front buffer. Nothing yields in here, so drawing
+        done while the frame is converted is part of the next frame.
+
+        Return value:
+            - frame : tuple:  (framebuffer bytes, left edge of the visible window, dirty box or None for the whole frame)
+        """
+        probe = self._probe
+        if probe is not None:
+            probe.begin()
+        if self.gc_every or self.gc_min_free:
+            self._collect_garbage()
+        if probe is not None:
+            probe.lap(probe.GC)
+
+        if self._layers or self._layer_damage is not None:
+            self._compose()
+
+        box = self._dirty_box
+        if full or self._dirty_full or box is None:
+            box = None
+        else:
+            box = (box[0], box[1], box[2], box[3])  # `_dirty_rect` is reused by the next frame
+        self._dirty_full = False
+        self._dirty_box = None
+
+        fb_buf = self.fb_buf
+        if self.double_buffer:
+            front = self._front_buf
+            if front is None or len(front) != len(fb_buf):
+                front = self._front_buf = bytearray(len(fb_buf))
+            front[:] = fb_buf
+            fb_buf = front
+        return fb_buf, self._view_x, box
+
+    async def _convert_chunks(self, fb_buf, view_x:int, box) -> bool:
+        """
+        Convert a frame taken by `_take_frame()` into the strip buffer, a few columns at a time, yielding
+        whenever `time_slice_ms` has passed.
+
+        Return value:
+            - done : bool:  False if the pixel map or the color tables changed while yielding; the frame has to be converted again.
+        """
+        version = self._output_version
+        step = NeoPixelMatrixAsync.CHUNK_COLUMNS
+        if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            # The canvas is in strip order: convert runs of strip bytes
+            step *= self.height * 3
+            x0, x1 = 0, len(fb_buf)
+        elif box is None:
+            x0, y0, x1, y1 = view_x, 0, view_x + self.width, self.height
+        else:
+            x0, y0, x1, y1 = box
+        convert = self._convert_indexed if self._palette is not None else self._convert_region
+
+        start = utime.ticks_ms()
+        for x in range(x0, x1, step):
+            if self.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+                self._convert_canvas(x, min(x + step, x1), fb_buf)
+            else:
+                convert(x, y0, min(x + step, x1), y1, fb_buf, view_x)
+            if utime.ticks_diff(utime.ticks_ms(), start) >= self.time_slice_ms:
+                await asyncio.sleep_ms(0)  # Yield to other tasks
+                self.refresh_yields += 1
+                if self._output_version != version:
+                    return False
+                start = utime.ticks_ms()
+        return True
 
-    async def _update_np_from_fb(self):
-        # Calling the synchronous _update_np_from_fb method from the superclass
-        super()._update_np_from_fb()
+    async def _update_np_from_fb(self, frame:tuple=None):
+        # Convert in chunks instead of calling the synchronous _update_np_from_fb method from the superclass
+        if frame is None:
+            frame = self._take_frame()
+        while not await self._convert_chunks(*frame):
+            if len(frame[0]) == len(self.fb_buf):
+                # Convert the same frame again, whole; what was drawn since it was taken stays for the next one
+                frame = (frame[0], frame[1], None)
+            else:
+                frame = self._take_frame(True)  # the framebuffer was resized
+        probe = self._probe
+        if probe is not None:
+            probe.lap(probe.CONVERT)
         await asyncio.sleep_ms(0)  # Yield to other tasks
 
+    async def _present(self, frame:tuple):
+        await self._update_np_from_fb(frame)
+        self._write()
+
     async def show(self):
-        await self._update_np_from_fb()
-        self.np.write()
+        await self.flush()
+        frame = self._take_frame()
+        if self.double_buffer:
+            self._pending = asyncio.create_task(self._present(frame))
+        else:
+            await self._present(frame)
+
+    async def flush(self):
+        """
+        Wait until the last frame handed to `show()` is written to the strip (only pending with double buffering).
+        """
+        while self._pending is not None:
+            pending = self._pending
+            await pending
+            if self._pending is pending:
+                self._pending = None
 
     async def clear(self, refresh:bool=True):
         self.fill(self.bg_color)
         if refresh: await self.show()
 
+    def _draw(self, draw, *args):
+        # Run a synchronous drawing method of the superclass without its own (sync) show()
+        manual_refresh = self.manual_refresh
+        self.manual_refresh = True
+        try:
+            draw(*args)
+        finally:
+            self.manual_refresh = manual_refresh
+
     async def text(self, string, x=0, y=0, color=Color.RED, center=False):
-        super().text(string, x, y, color, center)
+        self._draw(super().text, string, x, y, color, center)
         await self.show()
 
     async def scroll_text(self, string, x=0, y=0, color=Color.RED, delay=0.07, scroll_in=True, scroll_out=True):
-        scroll_range = self._get_scroll_text_range(
-            string, x=x, y=y, color=color, scroll_in=scroll_in, scroll_out=scroll_out)
-        for _ in range(scroll_range):
-            self.fb.scroll(-1, 0)
-            await self.show()
-            await asyncio.sleep(delay)
+        steps = self._scroll_steps(string, x, y, color, scroll_in, scroll_out)
+        if delay <= 0:
+            for _ in steps:
+                await self.show()
+                await asyncio.sleep_ms(0)
+            await self.flush()
+            return
+
+        # One scrolling step every `delay` seconds; falls behind by dropping steps, not by slowing down
+        scheduler = FrameScheduler(self, period_ms=delay * 1000)
+        scheduler.add(_StepAnimation(steps))
+        await scheduler.run()
+        await self.flush()
+
+    async def play_animation(self, source, loops=1, speed=1.0):
+        await self.flush()  # the strip buffer is written directly
+        deadline = utime.ticks_ms()
+        for duration in self._animation_steps(source, loops, speed):
+            self._write()
+            deadline = utime.ticks_add(deadline, duration)
+            await asyncio.sleep_ms(max(0, utime.ticks_diff(deadline, utime.ticks_ms())))
+
+    async def play_effect(self, effect, frames=None, fps=30):
+        await self.flush()  # the strip buffer is written directly
+        start = utime.ticks_ms()
+        frame = 0
+        while frames is None or frame < frames:
+            self._show_effect(effect, frame)
+            frame += 1
+            await asyncio.sleep_ms(max(0, utime.ticks_diff(utime.ticks_add(start, frame * 1000 // fps), utime.ticks_ms())))
+
+    async def receive_frames(self, port=4048, bind='0.0.0.0', frames=None):
+        # Show raw frames sent over UDP (DDP) until `frames` were pushed; see `FrameReceiver`
+        try: from receiver import FrameReceiver
+        except ImportError: from micropython_neopixel_matrix.receiver import FrameReceiver
+
+        await self.flush()  # the strip buffer is written directly
+        receiver = FrameReceiver(self, port, bind)
+        try:
+            await receiver.run(frames)
+        finally:
+            receiver.close()
+        return receiver
+
+    async def show_list(self, display_list):
+        await self.flush()  # the strip buffer is written directly
+        self._render_scene(display_list)
+        self._write()
+        await asyncio.sleep_ms(0)  # Yield to other tasks
 
     async def draw_progress_bar(self, progress, max_progress, color=Color.RED, margin=2, height=4):
-        super().draw_progress_bar(progress, max_progress, color, margin, height)
+        self._draw(super().draw_progress_bar, progress, max_progress, color, margin, height)
         await self.show()
 
 
@@ -2,46 +2,135 @@
 try: from neopixel_matrix import NeoPixelMatrix, Color
 except ImportError: from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix, Color
 
-import uasyncio as asyncio
-
 import sys
+from array import array
 
 class MockNeoPixelMatrix(NeoPixelMatrix):
     """
     A subclass of the NeoPixelMatrix class, which simulates a NeoPixel matrix by printing
     the matrix content to the console.
 
-    The class overrides the show() method to display the matrix in the console instead
-    of updating the NeoPixel hardware. The matrix content is represented by '#' characters
-    for colored pixels and '-' characters for background pixels.
+    Instead of sending frames to NeoPixel hardware, every frame that would be written to the strip
+    is shown in the console (and optionally recorded). What is shown are the strip bytes, so
+    brightness, gamma, effects and animations look as they would on the LEDs. The console modes:
+
+        - MockNeoPixelMatrix.TEXT: '-' for every pixel that is dark on the strip (all channels 0,
+          whatever the background color) and '#' for all others, the whole frame every time. (Default)
+        - MockNeoPixelMatrix.ANSI: ANSI truecolor blocks; after the first frame only the cells that
+          changed are redrawn, with cursor-addressed updates, in a single write per frame.
+        - MockNeoPixelMatrix.NONE: no output at all, for headless tests at thousands of frames per second.
 
     Example usage:
 
         mock_matrix = MockNeoPixelMatrix(32, 8)
         mock_matrix.text('Hello World', 0, 0, color=Color.RED)
 
+        # Record a headless run and check it against golden frames
+        with open("run.npxr", "wb") as f:
+            mock_matrix = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.NONE, recorder=FrameRecorder(f, 32, 8))
+            mock_matrix.scroll_text("Hello", delay=0)
+
     """
 
-    def __init__(self, *args, **kwargs):
+    # Console modes
+    NONE = 0
+    TEXT = 1
+    ANSI = 2
+
+    def __init__(self, *args, console:int=TEXT, stream=None, recorder=None, **kwargs):
         super().__init__(0, *args, **kwargs)
+        self.console = console
+        self.stream = stream or sys.stdout
+        # Optional FrameRecorder getting every frame written, including those skipped as unchanged
+        self.recorder = recorder
+        self._clear_screen = True
+        self._cells = None
+        self._cells_version = None
+        # Colors of the cells on the terminal (row by row, r, g, b); None until the first ANSI frame
+        self._screen = None
+
+    def _build_cells(self) -> None:
+        """
+        Build the strip byte offset of every cell, row by row.
+        """
+        strip_index = self._strip_index
+        cells = array('H' if 3 * len(strip_index) <= 0xFFFF else 'L', [0] * len(strip_index))
+        for i in range(len(strip_index)):
+            cells[i] = strip_index[i] * 3
+        self._cells = cells
+        self._cells_version = self._output_version
+
+    def _write(self):
+        # Recorded before the unchanged-frame skip, so skipped frames keep their place and timing
+        # in the log (as frames without changed bytes)
+        if self.recorder is not None:
+            self.recorder.record(self.np.buf)
+        super()._write()
+
+    def _send(self):
+        if self._cells_version != self._output_version:
+            self._build_cells()
+        if self.console == MockNeoPixelMatrix.ANSI:
+            self._print_ansi()
+        elif self.console == MockNeoPixelMatrix.TEXT:
+            self._print_matrix(self._clear_screen)
 
     def _print_matrix(self, clear_screen=True):
+        if self._cells is None:
+            self._build_cells()
+        buf = self.np.buf
+        cells = self._cells
+        width = self.width
+        lines = []
         if clear_screen:
-            sys.stdout.write('\033[2J\033[H')  # Clear screen and move cursor to top-left corner
+            lines.append('\033[2J\033[H')  # Clear screen and move cursor to top-left corner
         for y in range(self.height):
-            row = ''
-            for x in range(self.width):
-                r, g, b = self._rgb565_to_rgb888(self.fb.pixel(x, y))
-                if (r, g, b) == self.bg_color:
-                    row += '-'
-                else:
-                    row += '#'
-            print(row)
-        print()
+            row = y * width
+            lines.append(''.join('-' if not (buf[cells[row + x]] or buf[cells[row + x] + 1] or buf[cells[row + x] + 2]) else '#'
+                                 for x in range(width)))
+        self.stream.write('\n'.join(lines) + '\n\n')
+
+    def _print_ansi(self):
+        buf = self.np.buf
+        cells = self._cells
+        o_r, o_g, o_b = self._order[0], self._order[1], self._order[2]
+        width = self.width
+        screen = self._screen
+        out = []
+        if screen is None or len(screen) != 3 * len(cells):
+            screen = self._screen = bytearray(3 * len(cells))
+            out.append('\033[2J')
+            changed_all = True
+        else:
+            changed_all = False
+
+        color = None
+        cursor = -1  # the cell the cursor is at
+        for cell in range(len(cells)):
+            j = cells[cell]
+            r, g, b = buf[j + o_r], buf[j + o_g], buf[j + o_b]
+            k = cell * 3
+            if not changed_all and screen[k] == r and screen[k + 1] == g and screen[k + 2] == b:
+                continue
+            screen[k] = r
+            screen[k + 1] = g
+            screen[k + 2] = b
+            if cursor != cell:
+                out.append('\033[{};{}H'.format(cell // width + 1, (cell % width) * 2 + 1))
+            if color != (r, g, b):
+                color = (r, g, b)
+                out.append('\033[38;2;{};{};{}m'.format(r, g, b))
+            out.append('\u2588\u2588')
+            # Writing moves the cursor to the next cell, except at the end of a row
+            cursor = cell + 1 if (cell + 1) % width else -1
+
+        if out:
+            out.append('\033[0m\033[{};1H'.format(self.height + 1))
+            self.stream.write(''.join(out))
 
     def show(self, clear_screen=True):
-        self._update_np_from_fb()
-        self._print_matrix(clear_screen=clear_screen)
+        self._clear_screen = clear_screen
+        super().show()
 
 
 # class MockNeoPixelMatrixAsync(MockNeoPixelMatrix):
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# outputs.py
+
+from array import array
+
+try: from backend import machine, neopixel, utime
+except ImportError: from micropython_neopixel_matrix.backend import machine, neopixel, utime
+
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
+
+class _OutputWorker:
+    """
+    A thread that writes one strip whenever `go` is released and releases `done` when finished.
+    An exception raised by the write is kept in `error` for `StripGroup.write()` to raise.
+    """
+
+    def __init__(self, group, index:int) -> None:
+        self.group = group
+        self.index = index
+        self.running = True
+        self.error = None
+        self.go = _thread.allocate_lock()
+        self.go.acquire()
+        self.done = _thread.allocate_lock()
+        self.done.acquire()
+        _thread.start_new_thread(self._run, ())
+
+    def _run(self) -> None:
+        group = self.group
+        while True:
+            self.go.acquire()
+            if not self.running:
+                self.done.release()
+                return
+            try:
+                group._write_strip(self.index)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.done.release()
+
+
+class StripGroup:
+    """
+    Several NeoPixel strips on their own data pins, driven as one strip.
+
+    A WS2812 line needs about 30 µs per LED, so splitting a large display over several pins is
+    the only way to raise its frame rate beyond what one line can carry. The strips share a
+    single byte buffer, `buf`; every strip sends its slice of it (a memoryview, no copy), so to
+    `NeoPixelMatrix` the group looks like one long strip. The segments follow each other in
+    strip order, e.g. one per panel of a `PanelLayout`.
+
+    By default the outputs are written one after the other. With `threaded`, every output but the
+    first is written by its own thread while the calling thread writes the first one. The writes
+    only really overlap where threads run in parallel and the NeoPixel driver lets go of the
+    interpreter while it sends: under a global interpreter lock (CPython, ESP32 builds) or on a
+    single core they still run one at a time. Call `close()` to stop the threads again.
+    `write_us` holds the time each output took in the last `write()`, to balance the segments.
+
+    Arguments:
+        - outputs  : list of tuple(pin:int, count:int):  The data pin and the number of LEDs of every output, in strip order.
+        (Optional:)
+        - threaded : bool:  Write the outputs from threads (needs `_thread`). Defaults to False.
+    """
+
+    def __init__(self, outputs:list, threaded:bool=False) -> None:
+        if not outputs:
+            raise ValueError("A strip group needs at least one output")
+
+        self.strips = []
+        self.starts = []
+        n = 0
+        for pin, count in outputs:
+            self.strips.append(neopixel.NeoPixel(machine.Pin(pin, machine.Pin.OUT), count))
+            self.starts.append(n)
+            n += count
+        self.n = n
+        self.bpp = getattr(self.strips[0], 'bpp', 3)
+        self.ORDER = getattr(self.strips[0], 'ORDER', (1, 0, 2, 3))
+
+        # One buffer for all outputs; every strip gets a view on its part of it
+        self.buf = bytearray(n * self.bpp)
+        view = memoryview(self.buf)
+        for strip, start, (pin, count) in zip(self.strips, self.starts, outputs):
+            strip.buf = view[start * self.bpp:(start + count) * self.bpp]
+
+        self.write_us = array('L', [0] * len(self.strips))
+        self.writes = 0
+
+        if threaded and _thread is None:
+            raise ValueError("Threaded writes need the _thread module")
+        self._workers = [_OutputWorker(self, i) for i in range(1, len(self.strips))] if threaded else []
+
+    @property
+    def threaded(self) -> bool:
+        return bool(self._workers)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _locate(self, i:int) -> tuple:
+        for index in range(len(self.strips) - 1, -1, -1):
+            if i >= self.starts[index]:
+                return self.strips[index], i - self.starts[index]
+        raise IndexError(i)
+
+    def __setitem__(self, i:int, v) -> None:
+        strip, i = self._locate(i)
+        strip[i] = v
+
+    def __getitem__(self, i:int) -> tuple:
+        strip, i = self._locate(i)
+        return strip[i]
+
+    def fill(self, v) -> None:
+        for strip in self.strips:
+            strip.fill(v)
+
+    def _write_strip(self, index:int) -> None:
+        start = utime.ticks_us()
+        self.strips[index].write()
+        self.write_us[index] = utime.ticks_diff(utime.ticks_us(), start)
+
+    def write(self) -> None:
+        """
+        Send the buffer to all outputs and wait until every one of them is done. If writing an
+        output fails, its exception is raised once all outputs are done.
+        """
+        workers = self._workers
+        error = None
+        if workers:
+            for worker in workers:
+                worker.go.release()
+            try:
+                self._write_strip(0)
+            except Exception as e:
+                error = e
+            for worker in workers:
+                worker.done.acquire()
+                if worker.error is not None:
+                    error = error or worker.error
+                    worker.error = None
+        else:
+            for index in range(len(self.strips)):
+                try:
+                    self._write_strip(index)
+                except Exception as e:
+                    error = error or e
+        if error is not None:
+            raise error
+        self.writes += 1
+
+    def close(self) -> None:
+        """
+        Stop the writer threads; `write()` then writes the outputs one after the other.
+        """
+        workers = self._workers
+        self._workers = []
+        for worker in workers:
+            worker.running = False
+            worker.go.release()
+            worker.done.acquire()
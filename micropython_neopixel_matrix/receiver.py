@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# receiver.py
+
+try: import usocket as socket
+except ImportError: import socket
+try: import uerrno as errno
+except ImportError: import errno
+
+try: from backend import asyncio
+except ImportError: from micropython_neopixel_matrix.backend import asyncio
+
+# DDP (Distributed Display Protocol) packets, as sent by tools/ddp_send.py, xLights, WLED, ...:
+#
+#   byte 0    : flags; version 1 (0x40), timecode (0x10: 4 more header bytes), push (0x01)
+#   byte 1    : sequence number 1-15 in the low nibble (0: not numbered)
+#   byte 2    : data type (ignored; the data are strip bytes)
+#   byte 3    : destination id (1: the display)
+#   bytes 4-7 : byte offset of the data in the strip buffer (big-endian)
+#   bytes 8-9 : length of the data (big-endian)
+#
+# The data are copied into the NeoPixel byte buffer as they are: strip order and the strip's byte
+# order, with brightness already applied. A packet with the push flag completes a frame.
+DDP_PORT = 4048
+DDP_VERSION = 0x40
+DDP_VERSION_MASK = 0xC0
+DDP_TIMECODE = 0x10
+DDP_PUSH = 0x01
+DDP_ID_DISPLAY = 1
+DDP_HEADER = 10
+DDP_MAX_DATA = 1440
+
+
+class FrameReceiver:
+    """
+    Receives raw frames over UDP (DDP) straight into the NeoPixel byte buffer of a matrix.
+
+    Every packet is received with `recv_into()` into one preallocated buffer, and its data are
+    copied into `np.buf` with a single slice assignment; no pixel is touched in Python. A packet
+    with the push flag sends the buffer to the strip. Packets are checked against the sequence
+    number of the previous one: gaps are counted as `dropped`, and late or repeated packets are
+    counted as `out_of_order` and ignored, so a stale fragment never lands in a newer frame.
+
+    Example usage:
+
+        receiver = FrameReceiver(matrix)
+        await receiver.run()
+
+    Arguments:
+        - matrix  : NeoPixelMatrix:  The matrix to show the frames on.
+        (Optional:)
+        - port    : int:             The UDP port; 0 picks a free one (see `port`). Defaults to 4048, the DDP port.
+        - bind    : str:             The address to listen on. Defaults to '0.0.0.0' (all interfaces).
+        - poll_ms : int:             How long `run()` sleeps when no packet is waiting. Defaults to 2.
+    """
+
+    def __init__(self, matrix, port:int=DDP_PORT, bind:str='0.0.0.0', poll_ms:int=2) -> None:
+        self.matrix = matrix
+        self.poll_ms = poll_ms
+        self._packet = bytearray(DDP_HEADER + 4 + DDP_MAX_DATA)
+        self._packet_view = memoryview(self._packet)
+        self._np_view = memoryview(matrix.np.buf)
+
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(socket.getaddrinfo(bind, port)[0][-1])
+        self.sock.setblocking(False)
+        # MicroPython sockets have readinto() instead of recv_into()
+        self._recv_into = getattr(self.sock, 'recv_into', None) or self.sock.readinto
+        self._running = False
+        self.reset_stats()
+
+    @property
+    def port(self) -> int:
+        return self.sock.getsockname()[1]
+
+    def reset_stats(self) -> None:
+        """
+        Reset the packet statistics.
+        """
+        self.packets = 0        # packets applied to the strip buffer
+        self.frames = 0         # frames pushed to the strip
+        self.dropped = 0        # packets missing according to the sequence numbers
+        self.out_of_order = 0   # late or repeated packets, ignored
+        self.invalid = 0        # packets that are not DDP, not for the display, or out of bounds
+        self._sequence = 0
+
+    def stop(self) -> None:
+        """
+        Make `run()` return after the current poll.
+        """
+        self._running = False
+
+    def close(self) -> None:
+        """
+        Close the socket.
+        """
+        self.sock.close()
+
+    async def run(self, frames:int=None) -> None:
+        """
+        Receive and show frames until `stop()` is called or, if given, `frames` frames were pushed.
+        """
+        until = None if frames is None else self.frames + frames
+        self._running = True
+        try:
+            while self._running and (until is None or self.frames < until):
+                if self.poll():
+                    await asyncio.sleep_ms(0)
+                else:
+                    await asyncio.sleep_ms(self.poll_ms)
+        finally:
+            self._running = False
+
+    def poll(self) -> int:
+        """
+        Handle the packets waiting on the socket, up to the end of the next frame.
+
+        Return value:
+            - packets : int:  The number of packets read.
+        """
+        count = 0
+        while True:
+            try:
+                n = self._recv_into(self._packet)
+            except OSError as e:
+                if e.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            if not n:
+                break  # MicroPython's readinto() returns None when nothing is waiting
+            count += 1
+            if self._handle(n):
+                break  # one frame per poll, so other tasks get their turn
+        return count
+
+    def _handle(self, n:int) -> bool:
+        """
+        Apply the packet of `n` bytes in the receive buffer. Returns True if it pushed a frame.
+        """
+        packet = self._packet
+        flags = packet[0]
+        if n < DDP_HEADER or flags & DDP_VERSION_MASK != DDP_VERSION or packet[3] != DDP_ID_DISPLAY:
+            self.invalid += 1
+            return False
+
+        header = DDP_HEADER + 4 if flags & DDP_TIMECODE else DDP_HEADER
+        offset = (packet[4] << 24) | (packet[5] << 16) | (packet[6] << 8) | packet[7]
+        length = (packet[8] << 8) | packet[9]
+        if header + length > n or offset + length > len(self._np_view):
+            self.invalid += 1
+            return False
+
+        sequence = packet[1] & 0x0F
+        if sequence:
+            if self._sequence:
+                # Sequence numbers run 1-15; a step of 1 is the next packet
+                step = (sequence - self._sequence) % 15
+                if step == 0 or step > 7:
+                    self.out_of_order += 1
+                    return False
+                self.dropped += step - 1
+            self._sequence = sequence
+
+        if length:
+            self._np_view[offset:offset + length] = self._packet_view[header:header + length]
+        self.packets += 1
+
+        if flags & DDP_PUSH:
+            matrix = self.matrix
+            matrix._write()
+            # The strip buffer no longer shows the framebuffer
+            matrix._dirty_full = True
+            self.frames += 1
+            return True
+        return False
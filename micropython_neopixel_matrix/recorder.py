@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# recorder.py
+
+try: import ustruct as struct
+except ImportError: import struct
+
+try: from backend import utime
+except ImportError: from micropython_neopixel_matrix.backend import utime
+
+# Frame log layout (little-endian):
+#
+#   header : magic b'NPXR', version (B), flags (B), width (H), height (H), frame size in bytes (I)
+#   frames : time since the previous frame in us (I), number of runs (H), runs
+#   run    : byte offset (H), length (H), the bytes
+#
+# A frame holds the strip bytes (strip order and byte order, as sent to the LEDs) and only
+# stores the runs of bytes that differ from the previous frame; the first one differs from zeros.
+MAGIC = b'NPXR'
+VERSION = 1
+HEADER = '<4sBBHHI'
+FRAME_HEADER = '<IH'
+RUN_HEADER = '<HH'
+# Unchanged stretches shorter than a run header are stored rather than starting a new run
+MIN_GAP = 4
+
+
+class FrameRecorder:
+    """
+    Records the frames sent to a strip, with their timing, into a compact binary log.
+
+    Example usage:
+
+        with open("soak.npxr", "wb") as f:
+            matrix = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.NONE, recorder=FrameRecorder(f, 32, 8))
+            ...
+
+    Arguments:
+        - stream : file:  The log file, opened in binary mode for writing.
+        - width  : int:   The width of the matrix.
+        - height : int:   The height of the matrix.
+        (Optional:)
+        - size   : int:   The size of a frame in bytes. Defaults to width * height * 3.
+    """
+
+    def __init__(self, stream, width:int, height:int, size:int=None) -> None:
+        self.stream = stream
+        self.size = size or width * height * 3
+        if self.size > 0xFFFF:
+            raise ValueError("Frames of {} bytes are too large for the frame log".format(self.size))
+        self._previous = bytearray(self.size)
+        self._last_us = None
+        self.frames = 0
+        stream.write(struct.pack(HEADER, MAGIC, VERSION, 0, width, height, self.size))
+
+    def record(self, buf) -> None:
+        """
+        Append a frame (the strip bytes) to the log.
+        """
+        now = utime.ticks_us()
+        delta = 0 if self._last_us is None else utime.ticks_diff(now, self._last_us)
+        self._last_us = now
+
+        previous = self._previous
+        runs = []
+        i = 0
+        n = self.size
+        while i < n:
+            if buf[i] == previous[i]:
+                i += 1
+                continue
+            start = i
+            end = i + 1
+            i += 1
+            while i < n and i - end < MIN_GAP:
+                if buf[i] != previous[i]:
+                    end = i + 1
+                i += 1
+            runs.append((start, end))
+            i = end
+
+        stream = self.stream
+        stream.write(struct.pack(FRAME_HEADER, delta, len(runs)))
+        for start, end in runs:
+            stream.write(struct.pack(RUN_HEADER, start, end - start))
+            stream.write(bytes(buf[start:end]))
+        previous[:] = buf
+        self.frames += 1
+
+
+class FrameLog:
+    """
+    Reads a frame log written by `FrameRecorder`.
+
+    Arguments:
+        - stream : file:  The log file, opened in binary mode.
+    """
+
+    def __init__(self, stream) -> None:
+        self.stream = stream
+        magic, version, _, self.width, self.height, self.size = struct.unpack(HEADER, stream.read(struct.calcsize(HEADER)))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a frame log of version {}".format(VERSION))
+
+    def frames(self):
+        """
+        Yield (time since the previous frame in us, strip bytes) for every frame. The bytes are one
+        bytearray that is updated in place; copy it to keep a frame.
+        """
+        stream = self.stream
+        frame = bytearray(self.size)
+        frame_header = struct.calcsize(FRAME_HEADER)
+        run_header = struct.calcsize(RUN_HEADER)
+        while True:
+            header = stream.read(frame_header)
+            if len(header) < frame_header:
+                return
+            delta, runs = struct.unpack(FRAME_HEADER, header)
+            for _ in range(runs):
+                offset, length = struct.unpack(RUN_HEADER, stream.read(run_header))
+                data = stream.read(length)
+                if len(data) != length:
+                    raise ValueError("Frame log is truncated")
+                frame[offset:offset + length] = data
+            yield delta, frame
+
+
+def replay(matrix, log:FrameLog, speed:float=None) -> int:
+    """
+    Show the frames of a log on a matrix of the same size.
+
+    Arguments:
+        - matrix : NeoPixelMatrix:  The matrix (or mock) to show them on.
+        - log    : FrameLog:        The recorded frames.
+        (Optional:)
+        - speed  : float:           1.0 replays in real time, 2.0 twice as fast; None doesn't wait at all. Defaults to None.
+
+    Return value:
+        - frames : int:             The number of frames replayed.
+    """
+    if (log.width, log.height) != (matrix.width, matrix.height) or log.size != len(matrix.np.buf):
+        raise ValueError("The log is {}x{}, not {}x{}".format(log.width, log.height, matrix.width, matrix.height))
+    np_buf = matrix.np.buf
+    count = 0
+    for delta, frame in log.frames():
+        if speed:
+            utime.sleep_us(int(delta / speed))
+        np_buf[:] = frame
+        matrix._write()
+        count += 1
+    matrix._dirty_full = True
+    return count
+
+
+def compare(log:FrameLog, golden:FrameLog) -> list:
+    """
+    Compare the frames of a log with golden frames, ignoring the timing.
+
+    Return value:
+        - mismatches : list:  The numbers of the frames that differ; a frame missing in either log counts as differing.
+    """
+    mismatches = []
+    frames = log.frames()
+    expected = golden.frames()
+    number = 0
+    while True:
+        a = next(frames, None)
+        b = next(expected, None)
+        if a is None and b is None:
+            return mismatches
+        if a is None or b is None or a[1] != b[1]:
+            mismatches.append(number)
+        number += 1
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# text_cache.py
+
+try: from backend import framebuf
+except ImportError: from micropython_neopixel_matrix.backend import framebuf
+
+try: from collections import OrderedDict
+except ImportError: from ucollections import OrderedDict
+
+
+class TextCache:
+    """
+    A least-recently-used cache of pre-rendered text bitmaps.
+
+    Every string is rasterized once into a 1-bit (MONO_HLSB) bitmap; drawing it again is a
+    single `FrameBuffer.blit()` with a two-entry palette, so the color is applied at blit time
+    and the same bitmap serves every color. Entries are evicted, least recently used first,
+    once the bitmaps together exceed `max_bytes`.
+
+    Example usage:
+
+        cache = TextCache(max_bytes=2048)
+        cache.prewarm(["Open", "Closed", "Back in 5 min"])
+        matrix = NeoPixelMatrix(23, 32, 8, text_cache=cache)
+    """
+
+    CHAR_WIDTH = 8
+    CHAR_HEIGHT = 8
+
+    def __init__(self, max_bytes:int=2048) -> None:
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        # Palette for blitting 1-bit bitmaps onto RGB565 framebuffers: index 0 -> key, index 1 -> color
+        self._palette = framebuf.FrameBuffer(bytearray(4), 2, 1, framebuf.RGB565)
+
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def reset_stats(self) -> None:
+        """
+        Reset the `hits`, `misses` and `evictions` counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self) -> None:
+        """
+        Drop all cached bitmaps.
+        """
+        self._entries = OrderedDict()
+        self.bytes_used = 0
+
+    def _render(self, string:str, font=None):
+        """
+        Rasterize the given string into a new 1-bit bitmap.
+
+        Return value:
+            - bitmap : FrameBuffer:  A MONO_HLSB framebuffer with the text drawn in color 1.
+            - size   : int:          The size of its buffer in bytes.
+        """
+        if font is None:
+            width, height = len(string) * TextCache.CHAR_WIDTH, TextCache.CHAR_HEIGHT
+        else:
+            width, height = font.text_width(string), font.height
+        width = max(1, width)
+        size = ((width + 7) // 8) * height
+        bitmap = framebuf.FrameBuffer(bytearray(size), width, height, framebuf.MONO_HLSB)
+        if font is None:
+            bitmap.text(string, 0, 0, 1)
+        else:
+            font.draw(bitmap, string, 0, 0, 1, width)
+        return bitmap, size
+
+    def get(self, string:str, font=None):
+        """
+        Return the 1-bit bitmap of the given string, rendering and caching it on a miss.
+
+        Arguments:
+            - string : str:   The text to look up.
+            (Optional:)
+            - font   : Font:  The font to render it in. Defaults to None (framebuf's 8x8 font).
+
+        Return value:
+            - bitmap : FrameBuffer:  A MONO_HLSB framebuffer with the text drawn in color 1.
+        """
+        # The same text in another font is another bitmap
+        key = string if font is None else (font, string)
+        entries = self._entries
+        entry = entries.pop(key, None)
+        if entry is not None:
+            # Re-inserting moves the entry to the most recently used end
+            entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        bitmap, size = self._render(string, font)
+        if size > self.max_bytes:
+            return bitmap  # would evict everything else; draw it uncached
+
+        while entries and self.bytes_used + size > self.max_bytes:
+            # The first key of an OrderedDict is the least recently used one
+            evicted = entries.pop(next(iter(entries)))
+            self.bytes_used -= evicted[1]
+            self.evictions += 1
+
+        entries[key] = (bitmap, size)
+        self.bytes_used += size
+        return bitmap
+
+    def prewarm(self, strings, font=None) -> None:
+        """
+        Render the given strings into the cache ahead of time, e.g. at boot, so their first
+        display is as fast as the following ones. Hit/miss counters are left untouched.
+
+        Arguments:
+            - strings : iterable of str:  The texts to render.
+            (Optional:)
+            - font    : Font:             The font they will be drawn in. Defaults to None (framebuf's 8x8 font).
+        """
+        hits, misses = self.hits, self.misses
+        for string in strings:
+            self.get(string, font)
+        self.hits, self.misses = hits, misses
+
+    def draw(self, buffer, string:str, x:int, y:int, color565:int, font=None) -> None:
+        """
+        Draw the given string onto an RGB565 framebuffer, like `FrameBuffer.text()` does.
+
+        Arguments:
+            - buffer   : FrameBuffer:  The RGB565 framebuffer to draw on.
+            - string   : str:          The text to draw.
+            - x        : int:          The x-coordinate of the top-left corner of the text.
+            - y        : int:          The y-coordinate of the top-left corner of the text.
+            - color565 : int:          The color of the text in the RGB565 format.
+            (Optional:)
+            - font     : Font:         The font to draw the text in. Defaults to None (framebuf's 8x8 font).
+        """
+        bitmap = self.get(string, font)
+        # Any value other than the text color works as the transparent key
+        key = color565 ^ 0xFFFF
+        palette = self._palette
+        palette.pixel(0, 0, key)
+        palette.pixel(1, 0, color565)
+        buffer.blit(bitmap, x, y, key, palette)
+
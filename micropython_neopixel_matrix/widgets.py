@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Used with ESP32 and 8x32 WS2812b LED matrix
+# widgets.py
+
+try: from neopixel_matrix import Color, NeoPixelMatrix
+except ImportError: from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+try: from backend import framebuf
+except ImportError: from micropython_neopixel_matrix.backend import framebuf
+
+
+class Widget:
+    """
+    Base class of the widgets: an element bound to an area of the matrix that remembers what it drew.
+
+    `update()` only draws what changed since the last update and marks just that area dirty (see
+    `NeoPixelMatrix.mark_dirty()`). Widgets don't refresh the matrix: update all of them, then call
+    `show()` once. They draw on the display-sized framebuffer; after something else drew over their
+    area (`clear()`, `text()`, `scroll_text()`), call `invalidate()` so the next update draws them whole.
+
+    Arguments:
+        - matrix : NeoPixelMatrix:              The matrix to draw on.
+        - x      : int:                         The x-coordinate of the top-left corner of the area.
+        - y      : int:                         The y-coordinate of the top-left corner of the area.
+        - width  : int:                         The width of the area.
+        - height : int:                         The height of the area.
+        - color  : tuple(r:int, g:int, b:int):  The color of the widget.
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, height:int, color:tuple) -> None:
+        if x < 0 or y < 0 or x + width > matrix.width or y + height > matrix.height:
+            raise ValueError("The widget area {}x{} at ({}, {}) is not on the display".format(width, height, x, y))
+        self.matrix = matrix
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self._valid = False
+
+    def invalidate(self) -> None:
+        """
+        Forget what was drawn; the next `update()` draws the whole widget.
+        """
+        self._valid = False
+
+    def _erase(self, x:int, y:int, w:int, h:int) -> None:
+        """
+        Fill an area, clipped to the widget, with the background color and mark it dirty.
+        """
+        x0, y0 = max(x, self.x), max(y, self.y)
+        x1, y1 = min(x + w, self.x + self.width), min(y + h, self.y + self.height)
+        if x0 < x1 and y0 < y1:
+            matrix = self.matrix
+            matrix.fb.fill_rect(x0, y0, x1 - x0, y1 - y0, matrix._color(matrix.bg_color))
+            matrix.mark_dirty(x0, y0, x1 - x0, y1 - y0)
+
+
+class TextField(Widget):
+    """
+    A line of text that only redraws the characters that changed (or moved).
+
+    With the 8x8 font every character has a fixed cell, so updating "12:30" to "12:31" draws one
+    character. With a variable-width `font` on the matrix, characters after one of another width
+    move and are drawn again as well. Text wider than the field is clipped to whole characters:
+    only those that fit in the field completely are drawn.
+
+    Example usage:
+
+        status = TextField(matrix, 0, 0, 32, Color.GREEN)
+        status.update("RUN")
+        matrix.show()
+
+    Arguments:
+        - matrix      : NeoPixelMatrix:              The matrix to draw on.
+        - x           : int:                         The x-coordinate of the left edge of the field.
+        - y           : int:                         The y-coordinate of the top edge of the field.
+        - width       : int:                         The width of the field.
+        (Optional:)
+        - color       : tuple(r:int, g:int, b:int):  The color of the text. Defaults to Color.RED.
+        - align_right : bool:                        Align the text to the right edge of the field. Defaults to False.
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, color:tuple=Color.RED, align_right:bool=False) -> None:
+        font = matrix.font
+        super().__init__(matrix, x, y, width, font.height if font is not None else 8, color)
+        self.align_right = align_right
+        self.text = ""
+        self._positions = []  # x-coordinate of every character drawn
+
+    def _layout(self, text:str) -> list:
+        """
+        Return the x-coordinate of every character of the text in the field.
+        """
+        x = self.x
+        if self.align_right:
+            x += self.width - self.matrix._get_text_width(text)
+        positions = []
+        for char in text:
+            positions.append(x)
+            x += self._cell_width(char)
+        return positions
+
+    def _cell_width(self, char:str) -> int:
+        """
+        Return the width of a character with the spacing after it.
+        """
+        font = self.matrix.font
+        return font.char_width(char) + font.spacing if font is not None else NeoPixelMatrix.GLYPH_WIDTH
+
+    def _fits(self, char:str, x:int) -> bool:
+        """
+        Return whether the glyph of a character drawn at x lies inside the field.
+        """
+        font = self.matrix.font
+        width = font.char_width(char) if font is not None else NeoPixelMatrix.GLYPH_WIDTH
+        return self.x <= x and x + width <= self.x + self.width
+
+    def update(self, text:str) -> bool:
+        """
+        Show a new text, drawing only the characters that differ from the last one.
+
+        Return value:
+            - changed : bool:  False if the field already showed this text.
+        """
+        if self._valid and text == self.text:
+            return False
+
+        positions = self._layout(text)
+        if self._valid:
+            old_text, old_positions = self.text, self._positions
+        else:
+            old_text, old_positions = "", []
+            self._erase(self.x, self.y, self.width, self.height)
+
+        # Erase every cell that changes first, then draw: old and new cells may overlap
+        changed = []
+        for i in range(max(len(text), len(old_text))):
+            if i < len(text) and i < len(old_text) and text[i] == old_text[i] and positions[i] == old_positions[i]:
+                continue
+            if i < len(old_text):
+                self._erase(old_positions[i], self.y, self._cell_width(old_text[i]), self.height)
+            if i < len(text):
+                self._erase(positions[i], self.y, self._cell_width(text[i]), self.height)
+                changed.append(i)
+
+        matrix = self.matrix
+        for i in changed:
+            # Erasing is clipped to the field; a glyph sticking out of it is left out altogether
+            if self._fits(text[i], positions[i]):
+                matrix._draw_text_to_buffer(text[i], positions[i], self.y, self.color, matrix.fb)
+
+        self.text = text
+        self._positions = positions
+        self._valid = True
+        return True
+
+
+class NumberField(TextField):
+    """
+    A right-aligned number that only redraws the digits that changed.
+
+    Arguments:
+        - matrix : NeoPixelMatrix:              The matrix to draw on.
+        - x      : int:                         The x-coordinate of the left edge of the field.
+        - y      : int:                         The y-coordinate of the top edge of the field.
+        - width  : int:                         The width of the field.
+        (Optional:)
+        - color  : tuple(r:int, g:int, b:int):  The color of the digits. Defaults to Color.RED.
+        - fmt    : str:                         The format of the number, e.g. "{:3d}%". Defaults to "{}".
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, color:tuple=Color.RED, fmt:str="{}") -> None:
+        super().__init__(matrix, x, y, width, color, align_right=True)
+        self.fmt = fmt
+
+    def update(self, value) -> bool:
+        return super().update(self.fmt.format(value))
+
+
+class Clock(TextField):
+    """
+    A "HH:MM" (or "HH:MM:SS") clock that only redraws the digits that changed.
+
+    Arguments:
+        - matrix  : NeoPixelMatrix:              The matrix to draw on.
+        - x       : int:                         The x-coordinate of the left edge of the clock.
+        - y       : int:                         The y-coordinate of the top edge of the clock.
+        - width   : int:                         The width of the clock.
+        (Optional:)
+        - color   : tuple(r:int, g:int, b:int):  The color of the digits. Defaults to Color.RED.
+        - seconds : bool:                        Show the seconds as well. Defaults to False.
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, color:tuple=Color.RED, seconds:bool=False) -> None:
+        super().__init__(matrix, x, y, width, color)
+        self.seconds = seconds
+
+    def update(self, t:tuple) -> bool:
+        """
+        Show a time, given as a `utime.localtime()` tuple (year, month, mday, hour, minute, second, ...).
+        """
+        if self.seconds:
+            return super().update("{:02d}:{:02d}:{:02d}".format(t[3], t[4], t[5]))
+        return super().update("{:02d}:{:02d}".format(t[3], t[4]))
+
+
+class ProgressBar(Widget):
+    """
+    A horizontal progress bar that only paints the columns by which it grew or shrank.
+
+    Arguments:
+        - matrix    : NeoPixelMatrix:              The matrix to draw on.
+        - x         : int:                         The x-coordinate of the left edge of the bar.
+        - y         : int:                         The y-coordinate of the top edge of the bar.
+        - width     : int:                         The width of the bar, outline included.
+        - height    : int:                         The height of the bar, outline included.
+        (Optional:)
+        - max_value : int:                         The value of a full bar. Defaults to 100.
+        - color     : tuple(r:int, g:int, b:int):  The color of the bar. Defaults to Color.RED.
+        - outline   : bool:                        Draw an outline around the bar. Defaults to True.
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, height:int, max_value:int=100, color:tuple=Color.RED, outline:bool=True) -> None:
+        super().__init__(matrix, x, y, width, height, color)
+        self.max_value = max_value
+        self.outline = outline
+        self.value = 0
+        self._filled = 0  # columns of the inner area that are filled
+
+    def update(self, value) -> bool:
+        """
+        Show a new value.
+
+        Return value:
+            - changed : bool:  False if the bar didn't change by a single column.
+        """
+        border = 1 if self.outline else 0
+        inner_x, inner_y = self.x + border, self.y + border
+        inner_w, inner_h = self.width - 2 * border, self.height - 2 * border
+        filled = round(inner_w * min(max(value, 0), self.max_value) / self.max_value)
+        self.value = value
+        if self._valid and filled == self._filled:
+            return False
+
+        matrix = self.matrix
+        fb = matrix.fb
+        c = matrix._color(self.color)
+        if not self._valid:
+            self._erase(self.x, self.y, self.width, self.height)
+            if self.outline:
+                fb.rect(self.x, self.y, self.width, self.height, c)
+            self._filled = 0
+            self._valid = True
+
+        # Only the columns between the old and the new end of the bar
+        lo, hi = min(self._filled, filled), max(self._filled, filled)
+        if filled > self._filled:
+            fb.fill_rect(inner_x + lo, inner_y, hi - lo, inner_h, c)
+            matrix.mark_dirty(inner_x + lo, inner_y, hi - lo, inner_h)
+        elif filled < self._filled:
+            self._erase(inner_x + lo, inner_y, hi - lo, inner_h)
+        self._filled = filled
+        return True
+
+
+class Ticker(Widget):
+    """
+    Text scrolling through an area of the matrix, e.g. one line of a dashboard.
+
+    The text is rendered once into a strip of its own; every `update()` copies the visible window of
+    it into the framebuffer, so no glyph is drawn again while it scrolls. The text scrolls in from the
+    right, out to the left and starts over. Needs a framebuf canvas (RGB565 or indexed).
+
+    Arguments:
+        - matrix : NeoPixelMatrix:              The matrix to draw on.
+        - x      : int:                         The x-coordinate of the left edge of the ticker.
+        - y      : int:                         The y-coordinate of the top edge of the ticker.
+        - width  : int:                         The width of the ticker.
+        - text   : str:                         The text to scroll.
+        (Optional:)
+        - color  : tuple(r:int, g:int, b:int):  The color of the text. Defaults to Color.RED.
+        - speed  : int:                         Columns to scroll per update. Defaults to 1.
+    """
+
+    def __init__(self, matrix, x:int, y:int, width:int, text:str, color:tuple=Color.RED, speed:int=1) -> None:
+        if matrix.canvas_mode == NeoPixelMatrix.CANVAS_GRB888:
+            raise ValueError("A ticker needs a framebuf canvas")
+        font = matrix.font
+        height = font.height if font is not None else 8
+        super().__init__(matrix, x, y, width, height, color)
+        self.speed = speed
+        self.offset = 0
+
+        # The strip: as wide as the ticker (blank, to scroll in from) and the text after that
+        length = self.length = width + matrix._get_text_width(text)
+        if matrix.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED4:
+            self._bytes_per_pixel = 0  # nibbles; copied pixel by pixel
+            self._buf = bytearray(((length + 1) // 2) * height)
+            self._fb = framebuf.FrameBuffer(self._buf, length, height, framebuf.GS4_HMSB)
+        elif matrix.canvas_mode == NeoPixelMatrix.CANVAS_INDEXED8:
+            self._bytes_per_pixel = 1
+            self._buf = bytearray(length * height)
+            self._fb = framebuf.FrameBuffer(self._buf, length, height, framebuf.GS8)
+        else:
+            self._bytes_per_pixel = 2
+            self._buf = bytearray(length * height * 2)
+            self._fb = framebuf.FrameBuffer(self._buf, length, height, framebuf.RGB565)
+        self._fb.fill(matrix._color(matrix.bg_color))
+        if font is not None:
+            font.draw(self._fb, text, width, 0, matrix._color(color), length)
+        else:
+            self._fb.text(text, width, 0, matrix._color(color))
+
+    def update(self) -> bool:
+        """
+        Show the text at the current position and move it on by `speed` columns.
+        """
+        # The window may wrap around the end of the strip: copy it in up to two pieces
+        first = min(self.width, self.length - self.offset)
+        self._copy(self.offset, self.x, first)
+        if first < self.width:
+            self._copy(0, self.x + first, self.width - first)
+        self.matrix.mark_dirty(self.x, self.y, self.width, self.height)
+        self.offset = (self.offset + self.speed) % self.length
+        self._valid = True
+        return True
+
+    def _copy(self, source_x:int, x:int, w:int) -> None:
+        """
+        Copy `w` columns of the strip, from `source_x` on, to the framebuffer at column `x`.
+        """
+        matrix = self.matrix
+        bpp = self._bytes_per_pixel
+        if bpp:
+            # Row by row; the rows of the framebuffer and of the strip are contiguous bytes
+            fb_buf = matrix.fb_buf
+            source = memoryview(self._buf)
+            stride, length = matrix.fb_width, self.length
+            n = w * bpp
+            for row in range(self.height):
+                d = ((self.y + row) * stride + x) * bpp
+                s = (row * length + source_x) * bpp
+                fb_buf[d:d + n] = source[s:s + n]
+        else:
+            pixel = matrix.fb.pixel
+            source = self._fb.pixel
+            for row in range(self.height):
+                for column in range(w):
+                    pixel(x + column, self.y + row, source(source_x + column, row))
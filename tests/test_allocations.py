@@ -0,0 +1,76 @@
+import os
+import tracemalloc
+
+import micropython_neopixel_matrix
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+PACKAGE_FILES = os.path.join(os.path.dirname(micropython_neopixel_matrix.__file__), "*")
+
+
+def heap_growth(refresh, frames=1000):
+    """
+    Net bytes still allocated by the package after `frames` calls of `refresh(i)`.
+    """
+    filters = [tracemalloc.Filter(True, PACKAGE_FILES)]
+    tracemalloc.start()
+    try:
+        # Steady state; past 256 frames the counters are no longer CPython's cached small ints,
+        # and the int objects holding them are traced before and after
+        for i in range(300):
+            refresh(i)
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        for i in range(frames):
+            refresh(i)
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def test_show_does_not_grow_the_heap():
+    matrix = NeoPixelMatrix(23, 32, 8, brightness=0.5)
+    matrix.text("Hi", color=Color.GREEN)
+
+    def refresh(i):
+        matrix.fb.pixel(i % 32, i % 8, i & 0xFFFF)
+        matrix.mark_dirty(i % 32, i % 8, 1, 1)
+        matrix.show()
+
+    assert heap_growth(refresh) <= 0
+    assert matrix.frames_written > 1000
+
+
+def test_full_frame_refresh_does_not_grow_the_heap():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    colors = (Color.RED, Color.BLUE)
+
+    def refresh(i):
+        matrix.fill(colors[i & 1])
+        matrix.show()
+
+    assert heap_growth(refresh) <= 0
+
+
+def test_gc_policy():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    collections = []
+
+    class Collector:
+        @staticmethod
+        def collect():
+            collections.append(True)
+
+    import micropython_neopixel_matrix.neopixel_matrix as module
+    gc = module.gc
+    module.gc = Collector
+    try:
+        for _ in range(10):
+            matrix.show()
+        assert collections == []  # left to the application by default
+
+        matrix.gc_every = 4
+        for _ in range(10):
+            matrix.show()
+        assert len(collections) == 2
+    finally:
+        module.gc = gc
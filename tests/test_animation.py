@@ -0,0 +1,81 @@
+import asyncio
+import io
+
+import pytest
+
+from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix
+from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
+from tools.anim_encode import decode, encode
+
+WIDTH, HEIGHT = 32, 8
+
+
+def source_frames(count=40):
+    """A gradient background with a dot moving over it, plus a full-color flash halfway."""
+    background = [(x * 8, y // 2 * 64, 64) for y in range(HEIGHT) for x in range(WIDTH)]
+    frames = []
+    for n in range(count):
+        frame = list(background)
+        if n == count // 2:
+            frame = [(255, 255, 255)] * (WIDTH * HEIGHT)
+        frame[(n % HEIGHT) * WIDTH + n % WIDTH] = (255, 0, 0)
+        frames.append(frame)
+    return frames
+
+
+def strip_frame(matrix, frame):
+    """What the strip should show for a source frame (row by row) on this matrix."""
+    return [frame[y * WIDTH + x] for x, y in sorted(
+        ((x, y) for y in range(HEIGHT) for x in range(WIDTH)),
+        key=lambda p: matrix._strip_index[p[1] * WIDTH + p[0]])]
+
+
+def recorded_frames(matrix):
+    frames = []
+    matrix.np.write = lambda: frames.append([matrix.np[i] for i in range(len(matrix.np))])
+    return frames
+
+
+def test_encoder_round_trip_and_compression():
+    frames = source_frames()
+    data = encode(frames, WIDTH, HEIGHT, 33)
+    assert decode(data) == (WIDTH, HEIGHT, frames, [33] * len(frames))
+    assert len(data) < len(frames) * WIDTH * HEIGHT * 3 // 10
+
+    with pytest.raises(ValueError):
+        encode([[(i, 0, 0) for i in range(256)] + [(0, 1, 0)]], 257, 1, 33)
+
+
+@pytest.mark.parametrize("direction", [NeoPixelMatrix.HORIZONTAL, NeoPixelMatrix.VERTICAL])
+def test_playback_matches_the_source_frame_by_frame(direction, tmp_path):
+    frames = source_frames()
+    path = tmp_path / "test.npxa"
+    path.write_bytes(encode(frames, WIDTH, HEIGHT, 0, key_interval=16))
+
+    matrix = NeoPixelMatrix(23, WIDTH, HEIGHT, direction=direction)
+    shown = recorded_frames(matrix)
+    matrix.play_animation(str(path), loops=2)
+
+    assert len(shown) == 2 * len(frames)
+    for played, frame in zip(shown, frames + frames):
+        assert played == strip_frame(matrix, frame)
+
+
+def test_playback_applies_brightness_and_checks_the_size():
+    frames = source_frames(4)
+    matrix = NeoPixelMatrix(23, WIDTH, HEIGHT, brightness=0.5)
+    shown = recorded_frames(matrix)
+    matrix.play_animation(io.BytesIO(encode(frames, WIDTH, HEIGHT, 0)))
+    first = matrix._strip_index[0]
+    assert shown[0][first] == (127, 0, 0) and shown[-1][first] == (0, 0, 32)
+
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(23, 16, 8).play_animation(io.BytesIO(encode(frames, WIDTH, HEIGHT, 0)))
+
+
+def test_async_playback():
+    frames = source_frames(8)
+    matrix = NeoPixelMatrixAsync(23, WIDTH, HEIGHT)
+    shown = recorded_frames(matrix)
+    asyncio.run(matrix.play_animation(io.BytesIO(encode(frames, WIDTH, HEIGHT, 1)), speed=2.0))
+    assert shown == [strip_frame(matrix, frame) for frame in frames]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
+
+
+def draw(matrix, frame):
+    matrix.rect((frame, 1), (frame + 5, 6), Color.ORANGE)
+    matrix.line((0, 7), (31, frame % 8), Color.CYAN)
+
+
+def reference(frames, **kwargs):
+    matrix = NeoPixelMatrix(23, 32, 8, **kwargs)
+    matrix.manual_refresh = True
+    for frame in frames:
+        draw(matrix, frame)
+    matrix.show()
+    return bytes(matrix.np.buf)
+
+
+@pytest.mark.parametrize("canvas", [NeoPixelMatrix.CANVAS_RGB565, NeoPixelMatrix.CANVAS_GRB888, NeoPixelMatrix.CANVAS_INDEXED4])
+def test_chunked_refresh_yields_and_matches_the_sync_refresh(canvas):
+    async def main():
+        matrix = NeoPixelMatrixAsync(23, 32, 8, canvas=canvas, brightness=0.5, time_slice_ms=0)
+        matrix.manual_refresh = True
+        ticks = []
+
+        async def other_task():
+            while True:
+                ticks.append(matrix.frames_written)
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(other_task())
+        for frame in range(3):
+            draw(matrix, frame)
+            await matrix.show()
+            assert bytes(matrix.np.buf) == reference(range(frame + 1), canvas=canvas, brightness=0.5)
+        task.cancel()
+        return matrix, ticks
+
+    matrix, ticks = asyncio.run(main())
+    assert matrix.refresh_yields >= 32 // NeoPixelMatrixAsync.CHUNK_COLUMNS
+    assert ticks.count(0) > 1  # the other task ran while the first frame was converted
+
+
+def test_double_buffering_draws_the_next_frame_while_one_is_written():
+    async def main():
+        matrix = NeoPixelMatrixAsync(23, 32, 8, double_buffer=True, time_slice_ms=0)
+        matrix.manual_refresh = True
+        draw(matrix, 0)
+        await matrix.show()
+        assert matrix.frames_written == 0  # handed over, not written yet
+
+        draw(matrix, 1)  # the back buffer; not part of the frame being converted
+        await matrix.flush()
+        assert matrix.frames_written == 1 and bytes(matrix.np.buf) == reference([0])
+
+        await matrix.show()
+        await matrix.show()  # waits for the previous frame
+        await matrix.flush()
+        assert matrix.frames_written == 2 and matrix.frames_skipped == 1
+        assert bytes(matrix.np.buf) == reference([0, 1])
+
+        # The color tables change halfway through a frame: it is converted again, whole, from the
+        # front buffer; the drawing done in the meantime stays in the back buffer for the next frame
+        draw(matrix, 2)
+        await matrix.show()
+        await asyncio.sleep(0)
+        draw(matrix, 3)
+        matrix.brightness = 0.5
+        await matrix.flush()
+        assert bytes(matrix.np.buf) == reference([0, 1, 2], brightness=0.5)
+        assert matrix._dirty_box is not None
+
+        await matrix.show()
+        await matrix.flush()
+        assert bytes(matrix.np.buf) == reference([0, 1, 2, 3], brightness=0.5)
+
+    asyncio.run(main())
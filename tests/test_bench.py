@@ -0,0 +1,14 @@
+from benchmarks.bench import compare
+
+
+def record(fps, kernels="python", bench="show"):
+    return {"bench": bench, "geometry": "8x32", "backend": "device", "kernels": kernels, "fps": fps}
+
+
+def test_compare_only_matches_runs_with_the_same_kernels():
+    old = [record(100.0, "python"), record(400.0, "viper")]
+    assert compare(old, [record(380.0, "viper"), record(95.0, "python")]) == []
+    assert compare(old, [record(300.0, "viper")]) == [("show", "8x32", 400.0, 300.0)]
+    # A viper run is no regression against a slower pure-Python baseline, nor hidden by it
+    assert compare([record(100.0, "python")], [record(50.0, "viper")]) == []
+    assert compare([record(400.0, "viper")], [record(150.0, "python")]) == []
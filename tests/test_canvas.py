@@ -0,0 +1,64 @@
+import pytest
+
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+GRB888 = NeoPixelMatrix.CANVAS_GRB888
+
+
+def lit(matrix):
+    buf = matrix.np.buf
+    return [i for i in range(len(matrix.np)) if buf[3 * i] or buf[3 * i + 1] or buf[3 * i + 2]]
+
+
+def draw(matrix):
+    matrix.manual_refresh = True
+    matrix.text("Hi", 1, 0, Color.PINK)
+    matrix.line((0, 0), (31, 7), Color.ORANGE)
+    matrix.rect((20, 2), (25, 5), Color.CYAN, fill=False)
+    matrix.rect((27, 1), (29, 6), Color.GREEN)
+    matrix.show()
+
+
+@pytest.mark.parametrize("direction", [NeoPixelMatrix.HORIZONTAL, NeoPixelMatrix.VERTICAL])
+def test_draws_the_same_pixels_as_rgb565(direction):
+    rgb565 = NeoPixelMatrix(23, 32, 8, direction=direction)
+    grb888 = NeoPixelMatrix(23, 32, 8, direction=direction, canvas=GRB888)
+    draw(rgb565)
+    draw(grb888)
+    assert lit(grb888) == lit(rgb565)
+
+
+def test_full_precision_and_brightness():
+    matrix = NeoPixelMatrix(23, 32, 8, canvas=GRB888)
+    matrix.fill((255, 3, 129))
+    matrix.show()
+    assert matrix.np[0] == (255, 3, 129)  # no RGB565 rounding
+    assert matrix.np.buf == matrix.fb.buf  # full brightness: a plain copy
+
+    matrix.brightness = 0.5
+    matrix.show()
+    assert matrix.np[0] == (127, 1, 64)
+    assert matrix.fb.pixel(0, 0) == 0xFF0381
+
+
+def test_scroll_text_matches_framebuffer_scrolling():
+    def frames(matrix):
+        result = []
+        for _ in matrix._scroll_steps("Hey!", 0, 0, Color.RED, True, True):
+            matrix.show()
+            result.append(lit(matrix))
+        return result
+
+    assert frames(NeoPixelMatrix(23, 32, 8, canvas=GRB888)) == frames(NeoPixelMatrix(23, 32, 8))
+
+
+def test_direction_change_keeps_the_picture():
+    matrix = NeoPixelMatrix(23, 32, 8, canvas=GRB888)
+    matrix.fb.pixel(3, 5, 0x123456)
+    matrix.direction = NeoPixelMatrix.VERTICAL
+    assert matrix.fb.pixel(3, 5) == 0x123456
+
+
+def test_layers_need_rgb565():
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(23, 32, 8, canvas=GRB888).add_layer("overlay")
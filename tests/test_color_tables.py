@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+BRIGHTNESSES = (1.0, 0.75, 0.5, 0.33, 0.1, 0.0)
+
+
+def old_strip_color(matrix, rgb565):
+    """The strip color of the per-pixel refresh the tables replaced."""
+    return matrix._apply_brightness(Color.rgb565_to_rgb888(rgb565))
+
+
+@pytest.mark.parametrize("brightness", BRIGHTNESSES)
+def test_tables_match_the_old_formula_for_every_rgb565_value(brightness):
+    matrix = NeoPixelMatrix(23, 32, 8, brightness=brightness)
+    lut_r, lut_g, lut_b = matrix._lut_r, matrix._lut_g, matrix._lut_b
+    for c in range(0x10000):
+        assert (lut_r[c >> 11], lut_g[(c >> 5) & 0x3F], lut_b[c & 0x1F]) == old_strip_color(matrix, c)
+
+
+@pytest.mark.parametrize("brightness", BRIGHTNESSES)
+def test_refresh_matches_the_old_formula_on_random_frames(brightness):
+    rng = random.Random(brightness)
+    matrix = NeoPixelMatrix(23, 32, 8, brightness=brightness)
+    for _ in range(4):
+        colors = [rng.getrandbits(16) for _ in range(32 * 8)]
+        for y in range(8):
+            for x in range(32):
+                matrix.fb.pixel(x, y, colors[y * 32 + x])
+        matrix.mark_dirty()
+        matrix.show()
+        for y in range(8):
+            for x in range(32):
+                assert matrix.np[matrix._strip_index[y * 32 + x]] == old_strip_color(matrix, colors[y * 32 + x])
+
+
+def test_gamma_changes_the_tables():
+    linear = NeoPixelMatrix(23, 32, 8)
+    corrected = NeoPixelMatrix(23, 32, 8, gamma=2.2)
+    for name in ("_lut_r", "_lut_g", "_lut_b"):
+        table = getattr(corrected, name)
+        assert table != getattr(linear, name)
+        assert table[0] == 0 and list(table) == sorted(table)
+        assert table[len(table) // 2] < getattr(linear, name)[len(table) // 2]  # darker mid tones
+    assert corrected._lut_888 is not None and linear._lut_888 is None
+
+    corrected.gamma = None
+    assert corrected._lut_g == linear._lut_g
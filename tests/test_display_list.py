@@ -0,0 +1,111 @@
+import asyncio
+
+from micropython_neopixel_matrix import font_petme128
+from micropython_neopixel_matrix.display_list import DisplayList, SceneCache
+from micropython_neopixel_matrix.font import Font
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
+
+
+def scene(label="12:30"):
+    scene = DisplayList()
+    scene.rect((0, 0), (31, 7), Color.BLUE, fill=False)
+    scene.line((0, 7), (31, 0), Color.ORANGE)
+    scene.text(label, 1, 0, Color.WHITE)
+    scene.progress_bar(30, 100, Color.GREEN, margin=5, height=2)
+    return scene
+
+
+def immediate(matrix, label="12:30"):
+    """The same scene drawn with the immediate-mode methods."""
+    matrix.manual_refresh = True
+    matrix.clear()
+    matrix.rect((0, 0), (31, 7), Color.BLUE, fill=False)
+    matrix.line((0, 7), (31, 0), Color.ORANGE)
+    matrix._draw_text_to_buffer(label, 1, 0, Color.WHITE, matrix.fb)
+    matrix.fb.fill_rect(2, 5, 8, 2, Color.rgb_to_rgb565(Color.GREEN))
+    matrix.fb.rect(2, 5, 22, 2, Color.rgb_to_rgb565(Color.GREEN))
+    matrix.show()
+
+
+def test_a_scene_is_drawn_in_one_pass_with_one_refresh():
+    expected = NeoPixelMatrix(23, 32, 8)
+    immediate(expected)
+
+    matrix = NeoPixelMatrix(23, 32, 8)
+    matrix.show_list(scene())
+    assert matrix.np.buf == expected.np.buf
+    assert matrix.frames_written == 1
+    assert scene().key == scene().key != scene("9:30").key
+
+
+def test_cached_scenes_are_not_drawn_or_converted_again():
+    cache = SceneCache()
+    matrix = NeoPixelMatrix(23, 32, 8, scene_cache=cache)
+    matrix.show_list(scene())
+    first = bytes(matrix.np.buf)
+    matrix.show_list(scene("9:30"))
+    assert bytes(matrix.np.buf) != first and len(cache) == 2
+
+    converted = matrix.pixels_converted
+    matrix.show_list(scene())
+    assert bytes(matrix.np.buf) == first
+    assert matrix.pixels_converted == converted and cache.hits == 1
+
+    matrix.show_list(scene())  # unchanged: the strip isn't even written
+    assert matrix.frames_skipped == 1 and matrix.frames_written == 3
+
+    matrix.brightness = 0.5  # the cached strip bytes are stale now: the cache starts over
+    matrix.show_list(scene())
+    expected = NeoPixelMatrix(23, 32, 8, brightness=0.5)
+    expected.show_list(scene())
+    assert matrix.np.buf == expected.np.buf and matrix.pixels_converted > converted
+    assert len(cache) == 1 and cache.bytes_used == 512 + 768
+
+
+def test_colors_given_as_lists_are_recorded_as_tuples():
+    listed, tupled = DisplayList(), DisplayList()
+    for display_list, red in ((listed, [255, 0, 0]), (tupled, (255, 0, 0))):
+        display_list.fill(list(Color.BLUE) if display_list is listed else Color.BLUE)
+        display_list.rect((1, 1), (6, 6), red)
+        display_list.text("Hi", 10, 0, red)
+    assert listed.key == tupled.key and hash(listed.key) == hash(tupled.key)
+
+    matrix = NeoPixelMatrix(23, 32, 8, scene_cache=SceneCache())
+    matrix.show_list(listed)
+    matrix.show_list(tupled)
+    assert matrix.scene_cache.hits == 1
+
+
+def test_the_cache_evicts_the_least_recently_used_scene():
+    matrix = NeoPixelMatrix(23, 32, 8, scene_cache=SceneCache(max_bytes=2 * (512 + 768)))
+    for label in ("1", "2", "1", "3"):
+        matrix.show_list(scene(label))
+    cache = matrix.scene_cache
+    key = lambda label: (scene(label).key, Color.BLACK, None)  # on the background color, without a font
+    assert key("1") in cache and key("3") in cache and key("2") not in cache
+    assert cache.evictions == 1 and cache.bytes_used == 2 * (512 + 768)
+
+
+def test_async_and_grb888_canvas():
+    matrix = NeoPixelMatrixAsync(23, 32, 8, canvas=NeoPixelMatrix.CANVAS_GRB888, scene_cache=SceneCache())
+    asyncio.run(matrix.show_list(scene()))
+    reference = NeoPixelMatrix(23, 32, 8, canvas=NeoPixelMatrix.CANVAS_GRB888)
+    reference.show_list(scene())
+    assert matrix.np.buf == reference.np.buf and matrix.frames_written == 1
+
+
+def test_a_background_or_font_change_is_not_served_from_the_cache():
+    matrix = NeoPixelMatrix(23, 32, 8, scene_cache=SceneCache())
+    matrix.show_list(scene())
+    matrix.bg_color = Color.BLUE
+    matrix.show_list(scene())
+    expected = NeoPixelMatrix(23, 32, 8, bg_color=Color.BLUE)
+    expected.show_list(scene())
+    assert matrix.np.buf == expected.np.buf
+    assert matrix.np[matrix._strip_index[1 * 32 + 1]] == (0, 0, 248)  # inside the frame, outside the text
+    assert matrix.scene_cache.hits == 0
+
+    matrix.font = Font(font_petme128)
+    matrix.show_list(scene())
+    assert matrix.scene_cache.hits == 0
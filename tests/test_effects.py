@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from micropython_neopixel_matrix.effects import HUE_B, HUE_G, HUE_R, Fire, Gradient, Plasma, Rainbow, Sparkle
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
+
+
+def at(matrix, x, y):
+    return matrix.np[matrix._strip_index[y * matrix.width + x]]
+
+
+def test_hue_wheel():
+    assert (HUE_R[0], HUE_G[0], HUE_B[0]) == Color.RED
+    assert HUE_G[85] == 255 and HUE_B[170] == 255  # green a third, blue two thirds around the wheel
+    assert all(max(HUE_R[h], HUE_G[h], HUE_B[h]) == 255 for h in range(256))
+
+
+@pytest.mark.parametrize("direction", [NeoPixelMatrix.HORIZONTAL, NeoPixelMatrix.VERTICAL])
+def test_rainbow_follows_the_wiring_and_brightness(direction):
+    matrix = NeoPixelMatrix(23, 32, 8, direction=direction)
+    Rainbow(matrix, speed=4, spread=8).render(3)
+    for x, y in ((0, 0), (5, 7), (31, 3)):
+        h = (3 * 4 + x * 8) & 0xFF
+        assert at(matrix, x, y) == (HUE_R[h], HUE_G[h], HUE_B[h])
+
+    rainbow = Rainbow(matrix, speed=4, spread=8)
+    rainbow.render(0)
+    matrix.brightness = 0.5  # the effect picks up the new tables
+    rainbow.render(0)
+    assert at(matrix, 0, 0) == (127, 0, 0)
+
+
+def test_gradient_runs_from_start_to_end():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    Gradient(matrix, Color.BLUE, Color.ORANGE).render(0)
+    assert at(matrix, 0, 4) == Color.BLUE and at(matrix, 31, 4) == Color.ORANGE
+
+
+def test_random_effects_are_deterministic_and_change_every_frame():
+    frames = {}
+    for effect_class in (Fire, Sparkle, Plasma):
+        runs = []
+        for _ in range(2):
+            matrix = NeoPixelMatrix(23, 32, 8)
+            effect = effect_class(matrix)
+            run = []
+            for frame in range(20):
+                effect.render(frame)
+                run.append(bytes(matrix.np.buf))
+            runs.append(run)
+        assert runs[0] == runs[1]
+        assert len(set(runs[0][1:])) == 19
+        frames[effect_class] = (matrix, runs[0])
+
+    matrix, _ = frames[Fire]
+    bottom = sum(sum(at(matrix, x, 7)) for x in range(32))
+    top = sum(sum(at(matrix, x, 0)) for x in range(32))
+    assert bottom > top
+
+
+def test_play_effect_shows_every_frame():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    matrix.play_effect(Rainbow(matrix), frames=5, fps=1000)
+    assert matrix.frames_written == 5
+
+    matrix = NeoPixelMatrixAsync(23, 32, 8)
+    asyncio.run(matrix.play_effect(Plasma(matrix), frames=5, fps=1000))
+    assert matrix.frames_written == 5
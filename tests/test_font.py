@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+from micropython_neopixel_matrix import font_petme128
+from micropython_neopixel_matrix.font import Font
+from micropython_neopixel_matrix.host_backend import FrameBuffer, MONO_HLSB
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.text_cache import TextCache
+from tools.bdf2font import convert
+
+# A 3x5 font with two glyphs, 'A' and '?'
+BDF = """STARTFONT 2.1
+FONTBOUNDINGBOX 3 5 0 0
+STARTPROPERTIES 2
+FONT_ASCENT 5
+FONT_DESCENT 0
+ENDPROPERTIES
+CHARS 2
+STARTCHAR A
+ENCODING 65
+DWIDTH 4 0
+BBX 3 5 0 0
+BITMAP
+40
+A0
+E0
+A0
+A0
+ENDCHAR
+STARTCHAR question
+ENCODING 63
+DWIDTH 3 0
+BBX 2 3 0 2
+BITMAP
+C0
+40
+80
+ENDCHAR
+ENDFONT
+"""
+
+
+def render(fb, width, height):
+    return ["".join("#" if fb.pixel(x, y) else "-" for x in range(width)) for y in range(height)]
+
+
+def test_bdf_conversion():
+    font = Font(SimpleNamespace(**convert(BDF, first=63, last=66)))
+    assert font.height == 5
+    assert font.char_width("A") == 4 and font.char_width("?") == 3
+    assert font.char_width("B") == 3  # missing glyphs fall back to '?'
+    assert font.text_width("AA") == 8
+
+    fb = FrameBuffer(bytearray(5), 8, 5, MONO_HLSB)
+    assert font.draw(fb, "A?", 0, 0, 1) == 7
+    assert render(fb, 7, 5) == [
+        "-#--##-",
+        "#-#--#-",
+        "###-#--",
+        "#-#----",
+        "#-#----",
+    ]
+
+
+def test_trimmed_petme128_matches_framebuf_glyphs():
+    font = Font(font_petme128)
+    assert font.text_width("Hi") == font.char_width("H") + 1 + font.char_width("i") < 16
+    assert font.char_width(" ") == 3
+
+    ours = FrameBuffer(bytearray(8), 8, 8, MONO_HLSB)
+    framebuf_text = FrameBuffer(bytearray(8), 8, 8, MONO_HLSB)
+    font.draw(ours, "H", 1, 0, 1)  # 'H' has one blank column on the left in the 8x8 font
+    framebuf_text.text("H", 0, 0, 1)
+    assert render(ours, 8, 8) == render(framebuf_text, 8, 8)
+
+
+def test_matrix_uses_the_font_for_width_and_scrolling():
+    font = Font(font_petme128)
+    matrix = NeoPixelMatrix(23, 32, 8, font=font)
+    fixed = NeoPixelMatrix(23, 32, 8)
+    text = "Proportional"
+
+    assert matrix._get_text_width(text) == font.text_width(text) < fixed._get_text_width(text)
+    steps = sum(1 for _ in matrix._scroll_steps(text, 0, 0, Color.RED, True, True))
+    assert steps == font.text_width(text) + 32
+
+    matrix.text("Hi", color=Color.RED)
+    assert matrix.fb.pixel(0, 0) != 0 and matrix.fb.pixel(6, 0) == 0  # one column of spacing after 'H'
+
+
+def test_viewport_scrolling_with_a_font_matches_framebuffer_scrolling():
+    def frames(mode):
+        matrix = NeoPixelMatrix(23, 32, 8, font=Font(font_petme128))
+        matrix.scroll_mode = mode
+        result = []
+        for _ in matrix._scroll_steps("Wide Mmm text", 0, 0, Color.RED, True, True):
+            matrix.show()
+            result.append(bytes(matrix.np.buf))
+        return result
+
+    assert frames(NeoPixelMatrix.SCROLL_VIEWPORT) == frames(NeoPixelMatrix.SCROLL_FRAMEBUFFER)
+
+
+def test_text_cache_keys_include_the_font():
+    font = Font(font_petme128)
+    cache = TextCache()
+    cache.get("Hi")
+    cache.get("Hi", font)
+    assert len(cache) == 2 and cache.misses == 2
+    cache.get("Hi", font)
+    assert cache.hits == 1
+
+
+def test_viewport_scrolling_with_a_font_draws_only_the_glyphs_in_the_window():
+    font = Font(font_petme128)
+    drawn = []
+    draw = font.draw
+
+    def spy(buffer, string, x, *args):
+        drawn.append((len(string), x))
+        return draw(buffer, string, x, *args)
+
+    font.draw = spy
+    matrix = NeoPixelMatrix(23, 32, 8, font=font)
+    matrix.scroll_mode = NeoPixelMatrix.SCROLL_VIEWPORT
+    text = "A much longer text, scrolled through a window of the display " * 4
+    for _ in matrix._scroll_steps(text, 0, 0, Color.RED, True, True):
+        pass
+    # Every redraw starts at most one glyph left of the window and takes no more glyphs than it has columns
+    assert drawn and all(n <= matrix.fb_width and -font.max_width - font.spacing < x <= 32 for n, x in drawn)
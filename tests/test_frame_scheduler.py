@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from micropython_neopixel_matrix import host_backend, neopixel_matrix_async
+from micropython_neopixel_matrix.neopixel_matrix_async import FrameScheduler, NeoPixelMatrixAsync
+
+
+class FakeClock:
+    """
+    A `utime` and `uasyncio` stand-in: time only passes when an animation renders or the scheduler sleeps.
+    """
+
+    ticks_add = staticmethod(host_backend.ticks_add)
+    ticks_diff = staticmethod(host_backend.ticks_diff)
+
+    def __init__(self, now=0):
+        self.now = now
+        self.sleeps = []
+
+    def ticks_ms(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now = host_backend.ticks_add(self.now, ms)
+
+    async def sleep_ms(self, ms):
+        self.sleeps.append(ms)
+        self.advance(ms)
+
+
+class FakeMatrix:
+    def __init__(self, clock):
+        self.clock = clock
+        self.manual_refresh = False
+        self.shows = []
+
+    async def show(self):
+        self.shows.append(self.clock.now)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(neopixel_matrix_async, "utime", clock)
+    monkeypatch.setattr(neopixel_matrix_async, "asyncio", clock)
+    return clock
+
+
+def run(scheduler, frames=None):
+    asyncio.run(scheduler.run(frames))
+
+
+def animation(clock, calls, cost=0, costs=None, until=None):
+    def render(frame):
+        calls.append((frame, clock.now))
+        clock.advance((costs or {}).get(frame, cost))
+        return until is None or frame < until
+    return render
+
+
+@pytest.mark.parametrize("start", [0, host_backend._TICKS_MAX - 60])  # the second run crosses the wrap-around of the ticks
+def test_deadlines_follow_the_start_time(clock, start):
+    clock.now = start
+    matrix = FakeMatrix(clock)
+    scheduler = FrameScheduler(matrix, fps=30)
+    calls = []
+    scheduler.add(animation(clock, calls, cost=5))
+    run(scheduler, frames=9)
+
+    # start + frame * 1000 // fps: 33.3 ms periods without accumulating the rounding
+    assert [(frame, clock.ticks_diff(t, start)) for frame, t in calls] == [(i, i * 1000 // 30) for i in range(9)]
+    assert clock.sleeps == [i * 1000 // 30 - (i - 1) * 1000 // 30 - 5 for i in range(1, 10)]
+    assert (scheduler.frames_rendered, scheduler.frames_dropped) == (9, 0)
+    assert (scheduler.jitter_ms, scheduler.max_jitter_ms) == (0, 0)
+    assert scheduler.fps == 9 * 1000 / 300
+    assert matrix.manual_refresh is False
+
+
+def test_a_late_tick_drops_the_missed_frames(clock):
+    matrix = FakeMatrix(clock)
+    scheduler = FrameScheduler(matrix, fps=20)
+    calls = []
+    # Frame 2 takes 120 ms: the next tick starts at 220 ms, 70 ms after the deadline of frame 3
+    scheduler.add(animation(clock, calls, costs={2: 120}, until=7))
+    run(scheduler)
+
+    assert [frame for frame, _ in calls] == [0, 1, 2, 4, 5, 6, 7]
+    assert [t for _, t in calls] == [0, 50, 100, 220, 250, 300, 350]
+    assert (scheduler.frames_rendered, scheduler.frames_dropped) == (7, 1)
+    # Frame 4 ran 20 ms behind its deadline, every other frame on time
+    assert scheduler.max_jitter_ms == 20
+    assert scheduler.jitter_ms == pytest.approx(20 / 7)
+    assert scheduler.fps == pytest.approx(7 * 1000 / 400)
+
+
+def test_animations_share_one_refresh_per_tick(clock):
+    matrix = FakeMatrix(clock)
+    scheduler = FrameScheduler(matrix, fps=10)
+    short, long = [], []
+    scheduler.add(animation(clock, short, until=2))
+    scheduler.add(animation(clock, long, cost=3, until=4))
+    run(scheduler)
+
+    assert [frame for frame, _ in short] == [0, 1, 2]
+    assert [frame for frame, _ in long] == [0, 1, 2, 3, 4]
+    assert matrix.shows == [3, 103, 203, 303, 403]
+    assert scheduler.frames_rendered == 5
+
+    # stop() ends the run after the current tick
+    scheduler.reset_stats()
+    scheduler.add(lambda frame: scheduler.stop())
+    run(scheduler)
+    assert scheduler.frames_rendered == 1
+
+
+@pytest.mark.parametrize("period_ms", [2000, 700, 1000 / 3])
+def test_a_period_sets_the_deadlines(clock, period_ms):
+    matrix = FakeMatrix(clock)
+    scheduler = FrameScheduler(matrix, period_ms=period_ms)
+    calls = []
+    scheduler.add(animation(clock, calls, cost=5, until=4))
+    run(scheduler)
+    # The period is kept in whole microseconds
+    assert [t for _, t in calls] == [i * round(period_ms * 1000) // 1000 for i in range(5)]
+    assert scheduler.frames_dropped == 0
+
+
+@pytest.mark.parametrize("delay", [2.0, 0.7, 0.4])
+def test_scroll_text_steps_every_delay(clock, delay):
+    matrix = NeoPixelMatrixAsync(23, 32, 8)
+    shows = []
+    show = matrix.show
+
+    async def timed_show():
+        shows.append(clock.now)
+        await show()
+
+    matrix.show = timed_show
+    asyncio.run(matrix.scroll_text("Hi", delay=delay))
+    assert len(shows) > 3
+    assert shows == [round(i * delay * 1000) for i in range(len(shows))]
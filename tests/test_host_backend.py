@@ -0,0 +1,115 @@
+from micropython_neopixel_matrix import backend, host_backend
+from micropython_neopixel_matrix.host_backend import FrameBuffer, NeoPixel, RGB565, MONO_HLSB, MONO_VLSB, GS4_HMSB
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+# Console output of the Readme ("Hello" on a 32x8 matrix)
+HELLO = [
+    "-##--##-----------###-----###---",
+    "-##--##------------##------##---",
+    "-##--##---####-----##------##---",
+    "-######--##--##----##------##---",
+    "-##--##--######----##------##---",
+    "-##--##--##--------##------##---",
+    "-##--##---#####---####----####--",
+    "--------------------------------",
+]
+
+
+def render(fb):
+    return ["".join("#" if fb.pixel(x, y) else "-" for x in range(fb.width)) for y in range(fb.height)]
+
+
+def rgb565_fb(width, height):
+    return FrameBuffer(bytearray(width * height * 2), width, height, RGB565)
+
+
+def test_backend_selected_on_host():
+    assert backend.HOST
+    assert backend.framebuf is host_backend
+
+
+def test_text_matches_device_font():
+    fb = rgb565_fb(32, 8)
+    fb.text("Hello", 0, 0, 0xF800)
+    assert render(fb) == HELLO
+    # Little-endian RGB565, like on the ESP32
+    assert fb.buf[2:4] == bytes((0x00, 0xF8))
+
+
+def test_fill_rect_clips_and_rect_outline():
+    fb = rgb565_fb(6, 4)
+    fb.fill_rect(-2, -2, 4, 4, 1)
+    fb.rect(2, 1, 4, 3, 2)
+    assert [[fb.pixel(x, y) for x in range(6)] for y in range(4)] == [
+        [1, 1, 0, 0, 0, 0],
+        [1, 1, 2, 2, 2, 2],
+        [0, 0, 2, 0, 0, 2],
+        [0, 0, 2, 2, 2, 2],
+    ]
+    assert fb.pixel(6, 0) is None
+
+
+def test_line_and_filled_poly():
+    fb = rgb565_fb(8, 8)
+    fb.line(0, 0, 7, 3, 1)
+    assert render(fb)[:4] == ["##------", "--##----", "----##--", "------##"]
+
+    poly, ref = rgb565_fb(8, 8), rgb565_fb(8, 8)
+    poly.poly(0, 0, bytearray([1, 2, 5, 2, 5, 6, 1, 6]), 3, True)
+    ref.fill_rect(1, 2, 5, 5, 3)
+    assert poly.buf == ref.buf
+
+
+def test_scroll_keeps_vacated_columns():
+    fb = rgb565_fb(4, 1)
+    for x in range(4):
+        fb.pixel(x, 0, x + 1)
+    fb.scroll(-1, 0)
+    assert [fb.pixel(x, 0) for x in range(4)] == [2, 3, 4, 4]
+
+
+def test_blit_with_key_and_palette():
+    mono = FrameBuffer(bytearray(8), 8, 8, MONO_HLSB)
+    mono.text("/", 0, 0, 1)
+    palette = rgb565_fb(2, 1)
+    palette.pixel(0, 0, 0x1234)
+    palette.pixel(1, 0, 0x07E0)
+
+    fb = rgb565_fb(8, 8)
+    fb.fill(0x001F)
+    fb.blit(mono, 0, 0, 0x1234, palette)
+    for y in range(8):
+        for x in range(8):
+            assert fb.pixel(x, y) == (0x07E0 if mono.pixel(x, y) else 0x001F)
+
+
+def test_packed_formats_round_trip():
+    for fmt in (MONO_HLSB, MONO_VLSB, GS4_HMSB):
+        fb = FrameBuffer(bytearray(64), 10, 8, fmt)
+        fb.pixel(9, 7, 1)
+        fb.pixel(3, 2, 1)
+        assert [(x, y) for y in range(8) for x in range(10) if fb.pixel(x, y)] == [(3, 2), (9, 7)]
+
+
+def test_neopixel_buffer_is_grb():
+    np = NeoPixel(None, 2)
+    np[1] = (1, 2, 3)
+    assert np.buf == bytearray((0, 0, 0, 2, 1, 3))
+    assert np[1] == (1, 2, 3)
+
+
+def test_ticks_diff_wraps():
+    assert host_backend.ticks_diff(host_backend.ticks_add(host_backend._TICKS_MAX, 5), host_backend._TICKS_MAX) == 5
+
+
+def test_matrix_renders_on_host():
+    matrix = NeoPixelMatrix(0, 32, 8, brightness=0.5)
+    matrix.text("Hello", color=Color.BLUE)
+    # The framebuffer grows to the text width (40); the matrix shows its first 32 columns
+    assert [row[:32] for row in render(matrix.fb)] == HELLO
+    assert matrix.np.writes == 1
+
+    # Strip index 1 is the second LED of the first (serpentine) column: x=0, y=1
+    assert matrix.np[1] == (0, 0, 0)
+    # ... and index 8 + 6 = 14 is x=1, y=1 (second column runs bottom to top)
+    assert matrix.np[14] == (0, 0, 124)
@@ -0,0 +1,80 @@
+import pytest
+
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+INDEXED4 = NeoPixelMatrix.CANVAS_INDEXED4
+INDEXED8 = NeoPixelMatrix.CANVAS_INDEXED8
+
+
+def lit(matrix):
+    buf = matrix.np.buf
+    return [i for i in range(len(matrix.np)) if buf[3 * i] or buf[3 * i + 1] or buf[3 * i + 2]]
+
+
+def draw(matrix):
+    matrix.manual_refresh = True
+    matrix.text("Hi", 1, 0, Color.PINK)
+    matrix.line((0, 0), (31, 7), Color.ORANGE)
+    matrix.rect((20, 2), (25, 5), Color.CYAN, fill=False)
+    matrix.rect((27, 1), (29, 6), Color.GREEN)
+    matrix.show()
+
+
+@pytest.mark.parametrize("canvas", [INDEXED4, INDEXED8])
+@pytest.mark.parametrize("direction", [NeoPixelMatrix.HORIZONTAL, NeoPixelMatrix.VERTICAL])
+def test_draws_the_same_pixels_as_rgb565(canvas, direction):
+    rgb565 = NeoPixelMatrix(23, 32, 8, direction=direction)
+    indexed = NeoPixelMatrix(23, 32, 8, direction=direction, canvas=canvas)
+    draw(rgb565)
+    draw(indexed)
+    assert lit(indexed) == lit(rgb565)
+    assert indexed.np[indexed._strip_index[28 + 3 * 32]] == Color.GREEN  # exact palette colors
+
+    assert len(indexed.fb_buf) == len(rgb565.fb_buf) // (4 if canvas == INDEXED4 else 2)
+
+
+def test_palette_changes_recolor_without_redrawing():
+    matrix = NeoPixelMatrix(23, 32, 8, brightness=0.5, canvas=INDEXED4)
+    matrix.manual_refresh = True
+    matrix.rect((0, 0), (15, 7), 5)  # palette index 5: yellow
+    matrix.show()
+    pixel = matrix._strip_index[0]
+    assert matrix.np[pixel] == (127, 127, 0)
+
+    fb_before = bytes(matrix.fb_buf)
+    matrix.set_palette_color(5, (200, 0, 100))
+    matrix.show()
+    assert bytes(matrix.fb_buf) == fb_before
+    assert matrix.np[pixel] == (100, 0, 50) and matrix.frames_written == 2
+
+    matrix.brightness = 1.0
+    matrix.show()
+    assert matrix.np[pixel] == (200, 0, 100)
+    assert matrix.palette_index((200, 0, 100)) == 5 and matrix.palette_color(5) == (200, 0, 100)
+
+
+def test_viewport_scrolling_matches_framebuffer_scrolling():
+    def frames(mode):
+        matrix = NeoPixelMatrix(23, 32, 8, canvas=INDEXED4)
+        matrix.scroll_mode = mode
+        result = []
+        for _ in matrix._scroll_steps("Indexed!", 0, 0, Color.BLUE, True, True):
+            matrix.show()
+            result.append(bytes(matrix.np.buf))
+        return result
+
+    assert frames(NeoPixelMatrix.SCROLL_VIEWPORT) == frames(NeoPixelMatrix.SCROLL_FRAMEBUFFER)
+
+
+def test_palette_errors():
+    matrix = NeoPixelMatrix(23, 32, 8, canvas=INDEXED4, palette=[Color.BLACK, Color.RED])
+    with pytest.raises(ValueError):
+        matrix.fill((1, 2, 3))  # not in the palette
+    with pytest.raises(IndexError):
+        matrix.set_palette_color(16, Color.RED)
+    with pytest.raises(ValueError):
+        matrix.add_layer("overlay")
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(23, 32, 8, canvas=INDEXED4, palette=[Color.RED] * 17)
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(23, 32, 8).set_palette_color(0, Color.RED)
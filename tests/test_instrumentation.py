@@ -0,0 +1,52 @@
+from micropython_neopixel_matrix.instrumentation import FrameProbe
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+
+def test_disabled_by_default():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    assert matrix.probe is None
+    matrix.fill(Color.RED)
+    matrix.show()
+    assert matrix.frames_written == 1
+
+
+def test_records_every_stage_and_calls_back():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    records = []
+    probe = matrix.enable_instrumentation(frames=4, callback=lambda record: records.append(list(record)))
+
+    for color in (Color.RED, Color.GREEN, Color.BLUE):
+        matrix.fill(color)
+        matrix.show()
+
+    assert probe.count == 3 and len(probe) == 3
+    assert len(records) == 3
+    assert records[0][FrameProbe.DRAW] == 0  # no previous frame to measure from
+    assert all(record[FrameProbe.CONVERT] > 0 for record in records)
+
+    summary = probe.summary()
+    assert set(summary) == {"draw", "gc", "convert", "write", "total"}
+    convert = summary["convert"]
+    assert convert["min"] <= convert["avg"] <= convert["max"]
+    assert convert["min"] <= convert["p95"] <= convert["max"]
+    assert summary["total"]["max"] >= convert["max"]
+
+    matrix.disable_instrumentation()
+    matrix.show()
+    assert probe.count == 3
+
+
+def test_ring_buffer_keeps_the_latest_frames():
+    probe = FrameProbe(frames=3)
+    for frame in range(5):
+        probe.begin()
+        probe._record[FrameProbe.CONVERT] = frame * 10
+        probe.end()
+
+    assert len(probe) == 3
+    assert probe.values(FrameProbe.CONVERT) == [20, 30, 40]
+    assert probe.stats(FrameProbe.CONVERT)["min"] == 20
+
+    probe.reset()
+    assert probe.values() == []
+    assert probe.stats()["max"] == 0
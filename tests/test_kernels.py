@@ -0,0 +1,95 @@
+import os
+import random
+import sys
+import types
+
+import pytest
+
+from micropython_neopixel_matrix import kernels
+from micropython_neopixel_matrix.canvas import GRBCanvas
+from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix
+
+NAMES = ('rgb565', 'indexed', 'scale', 'shift')
+CANVASES = (NeoPixelMatrix.CANVAS_RGB565, NeoPixelMatrix.CANVAS_GRB888, NeoPixelMatrix.CANVAS_INDEXED4, NeoPixelMatrix.CANVAS_INDEXED8)
+
+
+def emulated_viper(monkeypatch):
+    """
+    Load kernels_viper.py on CPython with viper's pointer types emulated: loads are unsigned
+    and int() reinterprets a 32-bit word as signed, as the viper emitter does.
+    """
+    micropython = types.ModuleType('micropython')
+    micropython.viper = lambda function: function
+    micropython.const = lambda value: value
+    monkeypatch.setitem(sys.modules, 'micropython', micropython)
+
+    path = os.path.join(os.path.dirname(kernels.__file__), 'kernels_viper.py')
+    namespace = {
+        'ptr8': lambda buf: memoryview(buf).cast('B'),
+        'ptr16': lambda buf: memoryview(buf).cast('B').cast('H'),
+        'ptr32': lambda buf: memoryview(buf).cast('B').cast('I'),
+        'int': lambda value: value - (1 << 32) if value >= 1 << 31 else value,
+    }
+    with open(path) as f:
+        exec(compile(f.read(), path, 'exec'), namespace)
+    return {name: namespace[name] for name in NAMES}
+
+
+@pytest.fixture
+def compiled(monkeypatch):
+    """The kernels to hold against the pure-Python ones: the viper ones where they are in use, else their emulation."""
+    if kernels.NATIVE:
+        return {name: getattr(kernels, name) for name in NAMES}
+    return emulated_viper(monkeypatch)
+
+
+def use(monkeypatch, implementation):
+    for name in NAMES:
+        monkeypatch.setattr(kernels, name, implementation[name])
+
+
+@pytest.mark.parametrize("canvas", CANVASES)
+def test_conversion_kernels_match_on_random_frames(monkeypatch, compiled, canvas):
+    rng = random.Random(canvas)
+    for _ in range(12):
+        width, height = rng.choice(((32, 8), (16, 16), (7, 5)))
+        matrix = NeoPixelMatrix(23, width, height, canvas=canvas, direction=rng.randrange(2), brightness=rng.choice((1.0, 0.6, 0.1)), gamma=rng.choice((None, 2.2)))
+        if canvas != NeoPixelMatrix.CANVAS_GRB888:
+            matrix._update_framebuffer_size(width + rng.randrange(9))
+            matrix._view_x = rng.randrange(matrix.fb_width - width + 1)
+        for i in range(len(matrix.fb_buf)):
+            matrix.fb_buf[i] = rng.getrandbits(8)
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        box = (matrix._view_x + x0, y0, matrix._view_x + rng.randrange(x0, width) + 1, rng.randrange(y0, height) + 1)
+        start = bytes(rng.getrandbits(8) for _ in range(len(matrix.np.buf)))
+
+        outputs = []
+        for implementation in (kernels.PYTHON, compiled):
+            use(monkeypatch, implementation)
+            matrix.np.buf[:] = start
+            if canvas == NeoPixelMatrix.CANVAS_GRB888:
+                matrix._convert_canvas()
+            elif canvas == NeoPixelMatrix.CANVAS_RGB565:
+                matrix._convert_frame()
+                matrix._convert_region(*box)
+            else:
+                matrix._convert_indexed(*box)
+            outputs.append(bytes(matrix.np.buf))
+        assert outputs[0] == outputs[1]
+        assert outputs[0] != start
+
+
+def test_shift_kernel_matches_on_random_scrolls(monkeypatch, compiled):
+    rng = random.Random(7)
+    matrix = NeoPixelMatrix(23, 16, 8, direction=NeoPixelMatrix.VERTICAL)
+    canvas = GRBCanvas(16, 8, matrix._strip_index)
+    picture = bytes(rng.getrandbits(8) for _ in range(len(canvas.buf)))
+    for _ in range(40):
+        xstep, ystep = rng.randrange(-17, 18), rng.randrange(-9, 10)
+        outputs = []
+        for implementation in (kernels.PYTHON, compiled):
+            use(monkeypatch, implementation)
+            canvas.buf[:] = picture
+            canvas.scroll(xstep, ystep)
+            outputs.append(bytes(canvas.buf))
+        assert outputs[0] == outputs[1]
@@ -0,0 +1,86 @@
+import pytest
+
+from micropython_neopixel_matrix.backend import framebuf
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+
+def naive_composite(matrix):
+    """Every pixel of every visible layer, bottom to top, over the background, ignoring damage tracking."""
+    buf = bytearray(len(matrix.fb_buf))
+    fb = framebuf.FrameBuffer(buf, matrix.fb_width, matrix.height, framebuf.RGB565)
+    fb.fill(Color.rgb_to_rgb565(matrix.bg_color))
+    for layer in sorted(matrix._layers, key=lambda layer: layer.z):
+        if not layer.visible:
+            continue
+        for y in range(layer.height):
+            for x in range(layer.width):
+                c = layer.fb.pixel(x, y)
+                if c != layer.key:
+                    fb.pixel(layer.x + x, layer.y + y, c)
+    return buf
+
+
+def strip_bytes(buf, **kwargs):
+    reference = NeoPixelMatrix(23, 32, 8, **kwargs)
+    reference.fb_buf[:] = buf
+    reference.mark_dirty()
+    reference.show()
+    return bytes(reference.np.buf)
+
+
+def shown(matrix):
+    """Refresh and return the number of pixels converted."""
+    converted = matrix.pixels_converted
+    matrix.show()
+    assert matrix.fb_buf == naive_composite(matrix)
+    assert bytes(matrix.np.buf) == strip_bytes(matrix.fb_buf, brightness=0.5)
+    return matrix.pixels_converted - converted
+
+
+@pytest.fixture
+def matrix():
+    matrix = NeoPixelMatrix(23, 32, 8, brightness=0.5, bg_color=Color.PURPLE)
+    matrix.manual_refresh = True
+    back = matrix.add_layer("back")
+    for x in range(32):
+        back.fb.vline(x, 0, 8, Color.rgb_to_rgb565((x * 8, 255 - x * 8, 40)))
+    back.mark_dirty()
+    middle = matrix.add_layer("middle", 10, 8, x=12, z=1, key=Color.BLACK)
+    middle.text("M", 1, 0, Color.WHITE)
+    sprite = matrix.add_layer("sprite", 6, 4, x=2, y=2, z=2, key=Color.BLACK)
+    sprite.fb.fill_rect(1, 1, 4, 2, Color.rgb_to_rgb565(Color.RED))  # a keyed border around it
+    matrix.show()
+    return matrix
+
+
+def test_layers_compose_in_z_order_with_transparent_keys(matrix):
+    assert matrix.fb_buf == naive_composite(matrix)
+    sprite, middle = matrix.get_layer("sprite"), matrix.get_layer("middle")
+    assert matrix.fb.pixel(2, 2) == matrix.get_layer("back").fb.pixel(2, 2)  # keyed pixel of the sprite
+    assert matrix.fb.pixel(3, 3) == Color.rgb_to_rgb565(Color.RED)
+
+    sprite.move(14, 3)  # into the middle layer, but below it
+    assert shown(matrix) == (20 - 2) * (7 - 2)  # the old and the new position only
+    middle.z = 3
+    shown(matrix)
+    sprite.z = 4
+    shown(matrix)
+    assert matrix.fb.pixel(15, 4) == Color.rgb_to_rgb565(Color.RED)
+
+
+def test_hiding_and_removing_layers_uncovers_the_area(matrix):
+    matrix.get_layer("sprite").visible = False
+    assert shown(matrix) == 6 * 4
+    assert matrix.fb.pixel(3, 3) == matrix.get_layer("back").fb.pixel(3, 3)
+
+    matrix.remove_layer("back")
+    assert shown(matrix) == 32 * 8
+    assert matrix.fb.pixel(0, 0) == Color.rgb_to_rgb565(Color.PURPLE)
+
+    matrix.remove_layer("middle")
+    assert shown(matrix) == 10 * 8
+    assert matrix.fb_buf == naive_composite(matrix)
+    assert set(matrix.fb_buf[i] for i in range(0, len(matrix.fb_buf), 2)) == {Color.rgb_to_rgb565(Color.PURPLE) & 0xFF}
+
+    matrix.get_layer("sprite").visible = True
+    assert shown(matrix) == 6 * 4
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from benchmarks.refresh_fps import legacy_update_np_from_fb
+from micropython_neopixel_matrix.layout import Panel, PanelLayout
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+
+
+def strip_position(matrix, x, y):
+    """
+    Index of the LED showing canvas pixel (x, y).
+    """
+    return matrix._strip_index[y * matrix.width + x]
+
+
+def test_default_panel_matches_the_single_matrix_wiring():
+    single = NeoPixelMatrix(23, 32, 8)
+    tiled = NeoPixelMatrix(23, 32, 8, layout=PanelLayout([Panel(32, 8)]))
+    assert list(tiled._strip_index) == list(single._strip_index)
+
+
+@pytest.mark.parametrize("direction", [NeoPixelMatrix.HORIZONTAL, NeoPixelMatrix.VERTICAL])
+def test_refresh_matches_the_legacy_per_pixel_loop(direction):
+    rng = random.Random(direction)
+    for width, height in ((32, 8), (16, 16), (7, 5)):
+        for brightness in (1.0, 0.4, 0.07):
+            matrix = NeoPixelMatrix(23, width, height, direction=direction, brightness=brightness)
+            for i in range(len(matrix.fb_buf)):
+                matrix.fb_buf[i] = rng.getrandbits(8)
+            matrix.mark_dirty()
+            matrix.show()
+            refreshed = bytes(matrix.np.buf)
+            legacy_update_np_from_fb(matrix)
+            assert refreshed == bytes(matrix.np.buf)
+
+
+def test_panel_wiring_and_mounting():
+    # 3x2 panel, column serpentine from the top-left: LEDs 0,1 in column 0 (down), 2,3 in column 1 (up)
+    assert list(Panel(3, 2).coordinates()) == [(0, 0), (0, 1), (1, 1), (1, 0), (2, 0), (2, 1)]
+    assert list(Panel(3, 2, columns=False, serpentine=False).coordinates())[:4] == [(0, 0), (1, 0), (2, 0), (0, 1)]
+    assert list(Panel(3, 2, start=Panel.BOTTOM_RIGHT).coordinates())[0] == (2, 1)
+
+    rotated = Panel(3, 2, x=4, rotation=90)
+    assert rotated.mounted_size == (2, 3)
+    assert list(rotated.coordinates())[:2] == [(5, 0), (4, 0)]
+    assert list(Panel(3, 2, rotation=180, flip_x=True).coordinates())[0] == (0, 1)
+
+
+def test_chained_panels_form_one_canvas():
+    # Four 8x32 panels stacked, every other one mounted upside down
+    layout = PanelLayout.grid(1, 4, 32, 8, rotation=(0, 180, 0, 180))
+    assert (layout.width, layout.height) == (32, 32)
+
+    matrix = NeoPixelMatrix(23, 32, 32, layout=layout)
+    assert strip_position(matrix, 0, 0) == 0
+    assert strip_position(matrix, 31, 15) == 256  # first LED of the rotated second panel
+    assert strip_position(matrix, 0, 16) == 512
+
+    matrix.fill(Color.BLACK)
+    matrix.fb.pixel(31, 15, Color.rgb_to_rgb565(Color.WHITE))
+    matrix.mark_dirty(31, 15, 1, 1)
+    matrix.show()
+    lit = [i for i in range(len(matrix.np)) if matrix.np[i] != (0, 0, 0)]
+    assert lit == [256]
+
+
+def test_invalid_layouts():
+    with pytest.raises(ValueError):
+        PanelLayout([Panel(8, 8), Panel(8, 8, x=4)])  # overlap
+    with pytest.raises(ValueError):
+        PanelLayout([Panel(8, 8), Panel(8, 8, x=16)])  # gap
+    with pytest.raises(ValueError):
+        Panel(8, 8, rotation=45)
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(23, 32, 8, layout=PanelLayout([Panel(8, 8)]))
+    with pytest.raises(ValueError, match="Non-square panels"):
+        PanelLayout.grid(2, 1, 16, 8, rotation=(0, 90))
+
+
+def test_grids_with_per_panel_rotations():
+    turned = PanelLayout.grid(2, 1, 16, 8, rotation=(90, 270))
+    assert (turned.width, turned.height) == (16, 16)
+    square = PanelLayout.grid(2, 2, 8, 8, rotation=(0, 90, 180, 270))
+    assert (square.width, square.height) == (16, 16)
+    assert [(panel.x, panel.y) for panel in square.panels] == [(0, 0), (8, 0), (0, 8), (8, 8)]
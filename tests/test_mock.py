@@ -0,0 +1,97 @@
+import io
+import re
+
+from micropython_neopixel_matrix.neopixel_matrix import Color
+from micropython_neopixel_matrix.neopixel_matrix_mock import MockNeoPixelMatrix
+from micropython_neopixel_matrix.recorder import FrameLog, FrameRecorder, compare, replay
+
+ANSI = re.compile(r'\x1b\[(\d+);(\d+)H|\x1b\[38;2;(\d+);(\d+);(\d+)m|\x1b\[2J|\x1b\[0m|(██)')
+
+
+def terminal(output, width, height, screen=None):
+    """A minimal terminal: applies the cursor moves, colors and blocks of the output to a grid of cells."""
+    screen = screen or [[None] * width for _ in range(height)]
+    row = column = 0
+    color = None
+    for match in ANSI.finditer(output):
+        if match.group(1):
+            row, column = int(match.group(1)) - 1, int(match.group(2)) - 1
+        elif match.group(3):
+            color = tuple(int(match.group(i)) for i in (3, 4, 5))
+        elif match.group(6):
+            screen[row][column // 2] = color
+            column += 2
+            if column >= 2 * width:
+                row, column = row + 1, 0
+    return screen
+
+
+def strip_colors(matrix):
+    return [[matrix.np[matrix._strip_index[y * matrix.width + x]] for x in range(matrix.width)] for y in range(matrix.height)]
+
+
+def test_ansi_output_redraws_only_changed_cells():
+    stream = io.StringIO()
+    matrix = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.ANSI, stream=stream, brightness=0.5)
+    matrix.text("Hi", color=Color.CYAN)
+    screen = terminal(stream.getvalue(), 32, 8)
+    assert screen == strip_colors(matrix)
+
+    stream.seek(0)
+    stream.truncate()
+    matrix.fb.pixel(31, 7, Color.rgb_to_rgb565(Color.ORANGE))
+    matrix.mark_dirty(31, 7, 1, 1)
+    matrix.show()
+    assert stream.getvalue().count('██') == 1
+    assert terminal(stream.getvalue(), 32, 8, screen) == strip_colors(matrix)
+
+
+def test_text_output():
+    stream = io.StringIO()
+    matrix = MockNeoPixelMatrix(32, 8, stream=stream)
+    matrix.show(clear_screen=False)
+    matrix.rect((1, 1), (2, 2), Color.RED)
+    first, second = stream.getvalue().split("\x1b[2J\x1b[H")
+    assert first.split() == ["-" * 32] * 8
+    assert second.split()[:3] == ["-" * 32, "-##" + "-" * 29, "-##" + "-" * 29]
+
+
+def test_recorded_runs_replay_and_compare_with_golden_frames():
+    def run(stream, text):
+        matrix = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.NONE, recorder=FrameRecorder(stream, 32, 8))
+        matrix.scroll_text(text, color=Color.YELLOW, delay=0)
+        return matrix
+
+    golden = io.BytesIO()
+    matrix = run(golden, "Soak test")
+    frames = matrix.frames_written + matrix.frames_skipped
+    assert matrix.recorder.frames == frames and matrix.frames_written > 32
+    assert len(golden.getvalue()) < frames * len(matrix.np.buf) // 4  # only changed bytes are stored
+
+    replayed = io.BytesIO()
+    player = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.NONE, recorder=FrameRecorder(replayed, 32, 8))
+    golden.seek(0)
+    assert replay(player, FrameLog(golden)) == frames
+    golden.seek(0)
+    replayed.seek(0)
+    assert compare(FrameLog(replayed), FrameLog(golden)) == []
+
+    other = io.BytesIO()
+    run(other, "Soak tesT")
+    golden.seek(0)
+    other.seek(0)
+    mismatches = compare(FrameLog(other), FrameLog(golden))
+    assert mismatches and mismatches[0] > 32
+
+
+def test_frames_skipped_as_unchanged_are_recorded():
+    log = io.BytesIO()
+    matrix = MockNeoPixelMatrix(32, 8, console=MockNeoPixelMatrix.NONE, recorder=FrameRecorder(log, 32, 8))
+    matrix.fill(Color.GREEN)
+    matrix.show()
+    matrix.show()
+    assert (matrix.frames_written, matrix.frames_skipped) == (1, 1)
+
+    log.seek(0)
+    frames = [bytes(frame) for _, frame in FrameLog(log).frames()]
+    assert len(frames) == 2 and frames[0] == frames[1] == bytes(matrix.np.buf)
@@ -2,7 +2,8 @@ import time
 from micropython_neopixel_matrix.neopixel_matrix_mock import MockNeoPixelMatrix
 from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
 from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
-import uasyncio as asyncio
+try: import uasyncio as asyncio
+except ImportError: from micropython_neopixel_matrix.backend import asyncio
 import random
 
 DATA_PIN = 23  # GPIO5 on ESP8266, change this to the pin you have connected to the Neopixels
@@ -0,0 +1,65 @@
+import pytest
+
+from micropython_neopixel_matrix.layout import PanelLayout
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.outputs import StripGroup
+
+
+def test_outputs_share_one_buffer():
+    group = StripGroup([(23, 4), (22, 2)], threaded=False)
+    assert len(group) == 6 and len(group.buf) == 18
+
+    group[5] = (1, 2, 3)
+    assert group.strips[1][1] == (1, 2, 3)
+    group.strips[0][0] = (4, 5, 6)
+    assert group.buf[:3] == bytes((5, 4, 6))  # GRB
+
+    group.write()
+    assert [strip.writes for strip in group.strips] == [1, 1]
+    assert len(group.write_us) == 2
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_matrix_drives_one_output_per_panel(threaded):
+    layout = PanelLayout.grid(1, 2, 32, 8)
+    matrix = NeoPixelMatrix(None, 32, 16, layout=layout, outputs=[(23, 256), (22, 256)], threaded_outputs=threaded)
+    assert matrix.np.threaded == threaded
+
+    matrix.fill(Color.BLACK)
+    matrix.fb.pixel(0, 8, Color.rgb_to_rgb565(Color.BLUE))
+    for _ in range(3):
+        matrix.mark_dirty()
+        matrix.fb.pixel(1, 8, matrix.fb.pixel(1, 8) ^ 1)
+        matrix.show()
+
+    first, second = matrix.np.strips
+    assert first.writes == second.writes == 3
+    assert second[0] == (0, 0, 248)  # (0, 8) is the first LED of the second panel
+    assert sum(first.buf) == 0
+    matrix.close()
+    assert not matrix.np.threaded
+    matrix.fb.pixel(1, 8, 0)
+    matrix.show()
+    assert second.writes == 4
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_a_failed_write_is_raised_after_all_outputs_are_done(monkeypatch, threaded):
+    group = StripGroup([(23, 4), (22, 2), (21, 2)], threaded=threaded)
+
+    def broken():
+        raise OSError("write failed")
+    monkeypatch.setattr(group.strips[1], "write", broken)
+    with pytest.raises(OSError):
+        group.write()
+    assert group.strips[0].writes == group.strips[2].writes == 1
+
+    monkeypatch.undo()
+    group.write()  # no output is left waiting
+    assert [strip.writes for strip in group.strips] == [2, 1, 2]
+    group.close()
+
+
+def test_outputs_must_cover_the_matrix():
+    with pytest.raises(ValueError):
+        NeoPixelMatrix(None, 32, 8, outputs=[(23, 128)])
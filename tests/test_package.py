@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from micropython_neopixel_matrix.neopixel_matrix import Color
+
+
+def test_package_loads_submodules_on_first_access():
+    script = (
+        "import sys\n"
+        "import micropython_neopixel_matrix as package\n"
+        "loaded = lambda: sorted(name for name in sys.modules if name.startswith('micropython_neopixel_matrix.') or name == 'asyncio')\n"
+        "print(loaded())\n"
+        "from micropython_neopixel_matrix import NeoPixelMatrix\n"
+        "print(loaded())\n"
+        "print(package.neopixel_matrix_mock.MockNeoPixelMatrix.__name__, package.NeoPixelMatrixAsync.__name__)\n"
+    )
+    lines = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.splitlines()
+    assert lines[0] == "[]"
+    assert "micropython_neopixel_matrix.neopixel_matrix" in lines[1]
+    assert "asyncio" not in lines[1] and "micropython_neopixel_matrix.neopixel_matrix_async" not in lines[1]
+    assert lines[2] == "MockNeoPixelMatrix NeoPixelMatrixAsync"
+
+
+def test_color_encodings_are_looked_up_for_the_constants_only():
+    assert Color._rgb565[Color.ORANGE] == Color.rgb_to_rgb565(Color.ORANGE)
+    assert Color._rgb888[Color.PINK] == Color.rgb_to_rgb888(Color.PINK)
+    constants = len(Color._rgb565)
+    for i in range(48):
+        rgb = (i, 255 - i, 7 * i % 256)
+        assert Color.to_rgb565(rgb) == Color.rgb_to_rgb565(rgb)
+        assert Color.to_rgb888(rgb) == Color.rgb_to_rgb888(rgb)
+    assert len(Color._rgb565) == len(Color._rgb888) == constants == 11
+    assert Color.to_rgb565([8, 4, 8]) == Color.rgb_to_rgb565((8, 4, 8))
+    assert Color.to_rgb888([255, 140, 0]) == Color.rgb_to_rgb888(Color.ORANGE)
@@ -0,0 +1,74 @@
+import asyncio
+import struct
+import time
+
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.neopixel_matrix_async import NeoPixelMatrixAsync
+from micropython_neopixel_matrix.receiver import FrameReceiver
+from tools.ddp_send import DDPSender
+
+
+def rendered_frames():
+    """Strip buffers rendered on the host, the way tools/ddp_send.py sends them."""
+    source = NeoPixelMatrix(0, 32, 8, brightness=0.5)
+    source.manual_refresh = True
+    frames = []
+    for i, color in enumerate((Color.RED, Color.GREEN, Color.BLUE)):
+        source.fill(Color.BLACK)
+        source.rect((i, 1), (i + 10, 6), color)
+        source._update_np_from_fb()
+        frames.append(bytes(source.np.buf))
+    return frames
+
+
+def poll_until(receiver, packets, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    seen = 0
+    while seen < packets and time.monotonic() < deadline:
+        seen += receiver.poll()
+    return seen
+
+
+def test_frames_arrive_in_the_strip_buffer():
+    matrix = NeoPixelMatrixAsync(23, 32, 8)
+    shown = []
+    matrix.np.write = lambda: shown.append(bytes(matrix.np.buf))
+    receiver = FrameReceiver(matrix, port=0, bind='127.0.0.1')
+    sender = DDPSender('127.0.0.1', receiver.port, fragment=300)  # three fragments per frame
+
+    frames = rendered_frames()
+    for frame in frames:
+        sender.send(frame)
+
+    async def receive():
+        await asyncio.wait_for(receiver.run(frames=len(frames)), 5)
+
+    try:
+        asyncio.run(receive())
+    finally:
+        receiver.close()
+        sender.close()
+    assert shown == frames
+    assert (receiver.frames, receiver.packets, receiver.dropped, receiver.out_of_order) == (3, 9, 0, 0)
+
+
+def test_dropped_late_and_invalid_packets_are_counted():
+    matrix = NeoPixelMatrix(23, 32, 8)
+    receiver = FrameReceiver(matrix, port=0, bind='127.0.0.1')
+    sender = DDPSender('127.0.0.1', receiver.port)
+    try:
+        first = sender.packet(b'\x01\x02\x03', 0, False)   # sequence 1
+        sender.packet(b'', 0, False)                         # sequence 2 is never sent
+        third = sender.packet(b'\x04\x05\x06', 3, True)      # sequence 3
+        for packet in (first, third, first):                 # the repeated first one is late
+            sender.sock.sendto(packet, sender.address)
+        sender.sock.sendto(struct.pack('>BBBBIH', 0x41, 0, 0, 1, len(matrix.np.buf), 3) + b'\xff' * 3, sender.address)
+        sender.sock.sendto(b'not ddp', sender.address)
+        assert poll_until(receiver, 5) == 5
+    finally:
+        receiver.close()
+        sender.close()
+
+    assert bytes(matrix.np.buf[:6]) == b'\x01\x02\x03\x04\x05\x06'
+    assert (receiver.packets, receiver.frames) == (2, 1)
+    assert (receiver.dropped, receiver.out_of_order, receiver.invalid) == (1, 1, 2)
@@ -0,0 +1,52 @@
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.text_cache import TextCache
+
+
+def test_lru_eviction_and_accounting():
+    # 8x8 font: every character is an 8 byte bitmap
+    cache = TextCache(max_bytes=40)
+    cache.prewarm(["ab", "cd"])
+    assert (len(cache), cache.bytes_used) == (2, 32)
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+    cache.get("ab")  # now "cd" is the least recently used entry
+    cache.get("efg")
+    assert "cd" not in cache and "ab" in cache and "efg" in cache
+    assert (cache.bytes_used, cache.hits, cache.misses, cache.evictions) == (40, 1, 1, 1)
+
+    bitmap = cache.get("abcdef")  # larger than the whole budget: drawn uncached, nothing evicted
+    assert bitmap is not None and "abcdef" not in cache
+    assert (len(cache), cache.bytes_used, cache.misses, cache.evictions) == (2, 40, 2, 1)
+
+    cache.prewarm(["hi"])  # evicts "ab" (least recently used), but counts no hit or miss
+    assert "ab" not in cache and "efg" in cache and "hi" in cache
+    assert (cache.bytes_used, cache.hits, cache.misses, cache.evictions) == (40, 1, 2, 2)
+
+    cache.clear()
+    assert (len(cache), cache.bytes_used) == (0, 0)
+
+
+def test_cached_text_matches_framebuf_text():
+    plain = NeoPixelMatrix(23, 32, 8)
+    cached = NeoPixelMatrix(23, 32, 8, text_cache=TextCache())
+    for matrix in (plain, cached):
+        matrix.fill(Color.BLUE)
+        matrix._draw_text_to_buffer("Hi!", 3, 0, Color.YELLOW, matrix.fb)
+        matrix._draw_text_to_buffer("Hi!", -5, 1, Color.RED, matrix.fb)  # the same bitmap in another color
+    assert cached.fb_buf == plain.fb_buf
+    assert (cached.text_cache.hits, cached.text_cache.misses) == (1, 1)
+
+
+def test_viewport_scrolling_does_not_cache_the_whole_text():
+    def frames(text_cache):
+        matrix = NeoPixelMatrix(23, 32, 8, text_cache=text_cache)
+        matrix.scroll_mode = NeoPixelMatrix.SCROLL_VIEWPORT
+        result = []
+        for _ in matrix._scroll_steps("A long text scrolled through a window", 0, 0, Color.RED, True, True):
+            matrix.show()
+            result.append(bytes(matrix.np.buf))
+        return result
+
+    cache = TextCache()
+    assert frames(cache) == frames(None)
+    assert (len(cache), cache.bytes_used, cache.misses) == (0, 0, 0)
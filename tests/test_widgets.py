@@ -0,0 +1,108 @@
+import pytest
+
+from micropython_neopixel_matrix import font_petme128
+from micropython_neopixel_matrix.font import Font
+from micropython_neopixel_matrix.neopixel_matrix import Color, NeoPixelMatrix
+from micropython_neopixel_matrix.widgets import Clock, NumberField, ProgressBar, TextField, Ticker
+
+
+def new_matrix(**kwargs):
+    matrix = NeoPixelMatrix(23, 32, 8, **kwargs)
+    matrix.manual_refresh = True
+    matrix.show()
+    return matrix
+
+
+def drawn(matrix, string, x, color):
+    """The framebuffer with nothing but the text, drawn from scratch."""
+    reference = new_matrix(canvas=matrix.canvas_mode, font=matrix.font)
+    reference._draw_text_to_buffer(string, x, 0, color, reference.fb)
+    return bytes(reference.fb_buf)
+
+
+def dirty(matrix):
+    box = matrix._dirty_box
+    matrix.show()
+    return list(box)
+
+
+@pytest.mark.parametrize("canvas", [NeoPixelMatrix.CANVAS_RGB565, NeoPixelMatrix.CANVAS_INDEXED8])
+def test_number_field_redraws_only_the_changed_digits(canvas):
+    matrix = new_matrix(canvas=canvas)
+    field = NumberField(matrix, 0, 0, 32, Color.GREEN)
+    assert field.update(1234)
+    assert dirty(matrix) == [0, 0, 32, 8]
+
+    assert field.update(1239) and not field.update(1239)
+    assert dirty(matrix) == [24, 0, 32, 8]
+    assert bytes(matrix.fb_buf) == drawn(matrix, "1239", 0, Color.GREEN)
+
+    field.update(99)  # shorter: the leading digits are erased
+    assert bytes(matrix.fb_buf) == drawn(matrix, "99", 16, Color.GREEN)
+
+
+def test_text_wider_than_the_field_is_clipped_to_it():
+    matrix = new_matrix()
+    field = TextField(matrix, 8, 0, 16, Color.WHITE)
+    field.update("ABCDE")
+    assert dirty(matrix) == [8, 0, 24, 8]
+    assert bytes(matrix.fb_buf) == drawn(matrix, "AB", 8, Color.WHITE)
+
+    field.update("ABXDE")  # only a character outside the field changed: nothing to draw
+    assert matrix._dirty_box is None
+    assert bytes(matrix.fb_buf) == drawn(matrix, "AB", 8, Color.WHITE)
+
+    number = NumberField(matrix, 8, 0, 16, Color.WHITE)
+    number.update(12345)  # right-aligned: the leading digits are cut off
+    assert dirty(matrix) == [8, 0, 24, 8]
+    assert bytes(matrix.fb_buf) == drawn(matrix, "45", 8, Color.WHITE)
+
+
+def test_clock_with_a_variable_width_font():
+    matrix = new_matrix(font=Font(font_petme128))
+    clock = Clock(matrix, 0, 0, 32, Color.WHITE)
+    clock.update((2026, 10, 18, 12, 30, 0, 6, 291))
+    matrix.show()
+    converted = matrix.pixels_converted
+
+    clock.update((2026, 10, 18, 12, 31, 0, 6, 291))
+    matrix.show()
+    assert matrix.pixels_converted - converted == 7 * 8  # the last digit and its spacing
+    assert bytes(matrix.fb_buf) == drawn(matrix, "12:31", 0, Color.WHITE)
+
+    clock.update((2026, 10, 18, 12, 41, 0, 6, 291))  # the "4" is wider: the "1" after it moves
+    assert bytes(matrix.fb_buf) == drawn(matrix, "12:41", 0, Color.WHITE)
+
+
+def test_progress_bar_paints_only_the_delta_columns():
+    matrix = new_matrix()
+    bar = ProgressBar(matrix, 2, 2, 28, 4, max_value=26, color=Color.BLUE)
+    bar.update(10)
+    matrix.show()
+    for value, box in ((15, [13, 3, 18, 5]), (4, [7, 3, 18, 5]), (26, [7, 3, 29, 5])):
+        assert bar.update(value)
+        assert dirty(matrix) == box
+
+        reference = new_matrix()
+        reference.fb.rect(2, 2, 28, 4, Color.rgb_to_rgb565(Color.BLUE))
+        reference.fb.fill_rect(3, 3, value, 2, Color.rgb_to_rgb565(Color.BLUE))
+        assert matrix.fb_buf == reference.fb_buf
+    assert not bar.update(26)
+
+
+@pytest.mark.parametrize("canvas", [NeoPixelMatrix.CANVAS_RGB565, NeoPixelMatrix.CANVAS_INDEXED4, NeoPixelMatrix.CANVAS_INDEXED8])
+def test_ticker_scrolls_through_its_area(canvas):
+    matrix = new_matrix(canvas=canvas)
+    ticker = Ticker(matrix, 0, 0, 32, "News", Color.YELLOW, speed=3)
+    length = 32 + 4 * 8
+    assert ticker.length == length
+    for step in range(30):
+        ticker.update()
+        assert dirty(matrix) == [0, 0, 32, 8]
+        offset = step * 3 % length
+        reference = new_matrix(canvas=canvas)
+        for x in (32 - offset, 32 - offset + length):
+            reference._draw_text_to_buffer("News", x, 0, Color.YELLOW, reference.fb)
+        assert matrix.fb_buf == reference.fb_buf
+    with pytest.raises(ValueError):
+        Ticker(new_matrix(canvas=NeoPixelMatrix.CANVAS_GRB888), 0, 0, 32, "News")
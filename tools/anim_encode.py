@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Encodes animations into the file format played by NeoPixelMatrix.play_animation() (runs on a PC)
+# anim_encode.py
+#
+# python tools/anim_encode.py ANIMATION.gif -o animation.npxa [--width 32] [--height 8] [--duration 33] [--key-interval 0]
+#
+# Reading GIF/PNG/... files needs Pillow (pip install pillow); `encode()` itself takes plain frames.
+# See micropython_neopixel_matrix/animation.py for the file layout.
+
+import struct
+import sys
+
+MAGIC = b'NPXA'
+VERSION = 1
+KEY_FRAME = 0x01
+
+
+def _triples(frame:list, previous:list, palette:dict) -> bytearray:
+    """
+    Encode a frame as (skip, count, index) triples against the previous frame (None: key frame).
+    """
+    payload = bytearray()
+    skip = 0
+    i = 0
+    n = len(frame)
+    while i < n:
+        if previous is not None and frame[i] == previous[i]:
+            skip += 1
+            i += 1
+            continue
+        while skip > 255:
+            payload += bytes((255, 0, 0))  # skip only
+            skip -= 255
+        color = frame[i]
+        count = 1
+        while i + count < n and count < 255 and frame[i + count] == color:
+            count += 1
+        payload += bytes((skip, count, palette[color]))
+        skip = 0
+        i += count
+    return payload
+
+
+def encode(frames:list, width:int, height:int, durations, key_interval:int=0) -> bytes:
+    """
+    Encode an animation.
+
+    Arguments:
+        - frames       : list:          The frames; each a list of width * height (r, g, b) tuples, row by row.
+        - width        : int:           The width of the animation in pixels.
+        - height       : int:           The height of the animation in pixels.
+        - durations    : int or list:   The time every frame is shown in ms, or one duration per frame.
+        (Optional:)
+        - key_interval : int:           Make every n-th frame a key frame (0: only the first one). Defaults to 0.
+
+    Return value:
+        - data         : bytes:         The animation file.
+    """
+    if not frames:
+        raise ValueError("An animation needs at least one frame")
+    if isinstance(durations, int):
+        durations = [durations] * len(frames)
+
+    palette = {}
+    for frame in frames:
+        if len(frame) != width * height:
+            raise ValueError("Every frame needs {} pixels, not {}".format(width * height, len(frame)))
+        for color in frame:
+            if color not in palette:
+                palette[color] = len(palette)
+    if len(palette) > 256:
+        raise ValueError("The animation has {} colors; at most 256 are supported".format(len(palette)))
+
+    data = bytearray(struct.pack('<4sBBHHHH', MAGIC, VERSION, 0, width, height, len(frames), len(palette)))
+    for color in palette:  # dicts keep the insertion order, i.e. the palette index
+        data += bytes(color)
+
+    previous = None
+    for number, frame in enumerate(frames):
+        key = previous is None or (key_interval and number % key_interval == 0)
+        payload = _triples(frame, None if key else previous, palette)
+        data += struct.pack('<HBI', durations[number], KEY_FRAME if key else 0, len(payload))
+        data += payload
+        previous = frame
+    return bytes(data)
+
+
+def decode(data:bytes) -> tuple:
+    """
+    Decode an animation file into its frames, as a reference for tests and tools.
+
+    Return value:
+        - width     : int:   The width of the animation.
+        - height    : int:   The height of the animation.
+        - frames    : list:  The frames as lists of (r, g, b) tuples, row by row.
+        - durations : list:  The duration of every frame in ms.
+    """
+    magic, version, _, width, height, count, colors = struct.unpack_from('<4sBBHHHH', data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an animation file of version {}".format(VERSION))
+    offset = struct.calcsize('<4sBBHHHH')
+    palette = [tuple(data[offset + 3 * i:offset + 3 * i + 3]) for i in range(colors)]
+    offset += 3 * colors
+
+    frames, durations = [], []
+    pixels = [(0, 0, 0)] * (width * height)
+    for _ in range(count):
+        duration, _, length = struct.unpack_from('<HBI', data, offset)
+        offset += struct.calcsize('<HBI')
+        i = 0
+        for k in range(offset, offset + length, 3):
+            i += data[k]
+            for _ in range(data[k + 1]):
+                pixels[i] = palette[data[k + 2]]
+                i += 1
+        offset += length
+        frames.append(list(pixels))
+        durations.append(duration)
+    return width, height, frames, durations
+
+
+def load_frames(path:str, width:int, height:int) -> tuple:
+    """
+    Read the frames of an animated image (GIF, APNG, WebP, ...) with Pillow, scaled to width x height.
+    """
+    try:
+        from PIL import Image, ImageSequence
+    except ImportError:
+        raise SystemExit("Reading {} needs Pillow: pip install pillow".format(path))
+
+    frames, durations = [], []
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            rgb = frame.convert('RGB').resize((width, height))
+            frames.append(list(rgb.getdata()))
+            durations.append(frame.info.get('duration'))
+    return frames, durations
+
+
+def main(argv:list) -> int:
+    usage = "usage: anim_encode.py ANIMATION -o OUTPUT.npxa [--width 32] [--height 8] [--duration MS] [--key-interval N]"
+    args = list(argv)
+    source = output = duration = None
+    width, height, key_interval = 32, 8, 0
+    while args:
+        arg = args.pop(0)
+        if arg == "-o":
+            output = args.pop(0)
+        elif arg == "--width":
+            width = int(args.pop(0))
+        elif arg == "--height":
+            height = int(args.pop(0))
+        elif arg == "--duration":
+            duration = int(args.pop(0))
+        elif arg == "--key-interval":
+            key_interval = int(args.pop(0))
+        elif source is None and not arg.startswith("-"):
+            source = arg
+        else:
+            print(usage)
+            return 2
+    if source is None or output is None:
+        print(usage)
+        return 2
+
+    frames, durations = load_frames(source, width, height)
+    durations = [duration or d or 33 for d in durations]
+    data = encode(frames, width, height, durations, key_interval)
+    with open(output, "wb") as f:
+        f.write(data)
+    print("{}: {} frames, {} bytes ({} bytes raw)".format(output, len(frames), len(data), len(frames) * width * height * 3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Converts BDF bitmap fonts into font modules for font.py (runs on a PC)
+# bdf2font.py
+#
+# python tools/bdf2font.py FONT.bdf -o font_name.py [--first 32] [--last 126] [--trim] [--spacing 1] [--height N]
+#
+# The generated module only holds `bytes` tables (see `Font`), so it can be frozen into the
+# firmware and its glyphs are then read from flash.
+
+import sys
+
+
+class Glyph:
+    def __init__(self, encoding:int, advance:int, bbx:tuple, rows:list) -> None:
+        self.encoding = encoding
+        self.advance = advance
+        self.bbx = bbx    # (width, height, x offset, y offset from the baseline)
+        self.rows = rows  # one int per bitmap row, most significant bit left
+
+
+def parse_bdf(text:str) -> tuple:
+    """
+    Parse the text of a BDF font.
+
+    Return value:
+        - ascent  : int:   The font ascent in pixels.
+        - descent : int:   The font descent in pixels.
+        - glyphs  : dict:  Glyph by code point.
+    """
+    ascent = descent = None
+    bounding_box = None
+    glyphs = {}
+    glyph = None
+    bitmap = None
+
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        keyword = parts[0]
+
+        if bitmap is not None:
+            if keyword == "ENDCHAR":
+                glyph.rows = [int(row, 16) >> (len(row) * 4 - glyph.bbx[0]) for row in bitmap]
+                if glyph.encoding >= 0:
+                    glyphs[glyph.encoding] = glyph
+                glyph = bitmap = None
+            else:
+                bitmap.append(keyword)
+        elif keyword == "FONTBOUNDINGBOX":
+            bounding_box = tuple(int(v) for v in parts[1:5])
+        elif keyword == "FONT_ASCENT":
+            ascent = int(parts[1])
+        elif keyword == "FONT_DESCENT":
+            descent = int(parts[1])
+        elif keyword == "STARTCHAR":
+            glyph = Glyph(-1, 0, bounding_box, [])
+        elif keyword == "ENCODING":
+            glyph.encoding = int(parts[1])
+        elif keyword == "DWIDTH":
+            glyph.advance = int(parts[1])
+        elif keyword == "BBX":
+            glyph.bbx = tuple(int(v) for v in parts[1:5])
+        elif keyword == "BITMAP":
+            bitmap = []
+
+    if ascent is None or descent is None:
+        if bounding_box is None:
+            raise ValueError("BDF font without FONT_ASCENT/FONT_DESCENT or FONTBOUNDINGBOX")
+        ascent = bounding_box[1] + bounding_box[3]
+        descent = -bounding_box[3]
+    return ascent, descent, glyphs
+
+
+def glyph_columns(glyph:Glyph, ascent:int, height:int, trim:bool) -> list:
+    """
+    Rasterize a glyph into column bit masks (bit 0 at the top of the cell).
+    """
+    width, rows, x_offset, y_offset = glyph.bbx
+    cell_width = max(glyph.advance, x_offset + width, 1)
+    columns = [0] * cell_width
+    top = ascent - (rows + y_offset)  # cell row of the bitmap's first row
+    for r, bits in enumerate(glyph.rows):
+        y = top + r
+        if not 0 <= y < height:
+            continue
+        for c in range(width):
+            if bits & (1 << (width - 1 - c)):
+                x = x_offset + c
+                if 0 <= x < cell_width:
+                    columns[x] |= 1 << y
+
+    if trim:
+        ink = [i for i, column in enumerate(columns) if column]
+        if ink:
+            columns = columns[ink[0]:ink[-1] + 1]
+    return columns
+
+
+def convert(text:str, first:int=32, last:int=126, trim:bool=False, spacing:int=None, height:int=None) -> dict:
+    """
+    Convert the text of a BDF font into the tables of a font module.
+
+    Arguments:
+        - text    : str:   The BDF font.
+        (Optional:)
+        - first   : int:   The first code point to include. Defaults to 32 (space).
+        - last    : int:   The last code point to include. Defaults to 126 (~).
+        - trim    : bool:  Crop the blank columns left and right of every glyph, making a monospaced font
+                           proportional; blank glyphs get half their advance width. Defaults to False.
+        - spacing : int:   Empty columns between glyphs. Defaults to 1 with `trim`, else 0 (the advance widths include it).
+        - height  : int:   The glyph height. Defaults to the font's ascent plus descent.
+
+    Return value:
+        - tables  : dict:  HEIGHT, FIRST, SPACING, WIDTHS, OFFSETS and COLUMNS.
+    """
+    ascent, descent, glyphs = parse_bdf(text)
+    if height is None:
+        height = ascent + descent
+    if spacing is None:
+        spacing = 1 if trim else 0
+    column_bytes = (height + 7) // 8
+
+    widths = bytearray()
+    offsets = bytearray()
+    data = bytearray()
+    n_columns = 0
+    for code in range(first, last + 1):
+        glyph = glyphs.get(code, glyphs.get(ord('?')))
+        if glyph is None:
+            columns = [0]
+        else:
+            columns = glyph_columns(glyph, ascent, height, trim)
+            if trim and not any(columns):
+                columns = [0] * max(1, glyph.advance // 2 - spacing)  # blank glyphs (space) get half their advance
+        if len(columns) > 255 or n_columns > 0xFFFF:
+            raise ValueError("Glyph {} is too wide for the font format".format(code))
+
+        widths.append(len(columns))
+        offsets += bytes((n_columns & 0xFF, n_columns >> 8))
+        for column in columns:
+            data += column.to_bytes(column_bytes, "little")
+        n_columns += len(columns)
+
+    return {
+        "HEIGHT": height,
+        "FIRST": first,
+        "SPACING": spacing,
+        "WIDTHS": bytes(widths),
+        "OFFSETS": bytes(offsets),
+        "COLUMNS": bytes(data),
+    }
+
+
+def _bytes_literal(data:bytes, indent:str="    ", per_line:int=16) -> str:
+    lines = []
+    for i in range(0, len(data), per_line):
+        lines.append(indent + "b'" + "".join("\\x{:02x}".format(b) for b in data[i:i + per_line]) + "'")
+    return "(\n" + "\n".join(lines) + "\n)"
+
+
+def write_module(tables:dict, name:str, source:str) -> str:
+    """
+    Return the source code of a font module with the given tables.
+    """
+    return "\n".join((
+        "# -*- coding: utf-8 -*-",
+        "# NeoPixel Matrix for MicroPython",
+        "# Font tables generated by tools/bdf2font.py from {} - do not edit".format(source),
+        "# {}.py".format(name),
+        "",
+        "HEIGHT = {}".format(tables["HEIGHT"]),
+        "FIRST = {}".format(tables["FIRST"]),
+        "SPACING = {}".format(tables["SPACING"]),
+        "WIDTHS = " + _bytes_literal(tables["WIDTHS"]),
+        "OFFSETS = " + _bytes_literal(tables["OFFSETS"]),
+        "COLUMNS = " + _bytes_literal(tables["COLUMNS"]),
+        "",
+    ))
+
+
+def main(argv:list) -> int:
+    usage = "usage: bdf2font.py FONT.bdf -o OUTPUT.py [--first N] [--last N] [--trim] [--spacing N] [--height N]"
+    args = list(argv)
+    source = output = None
+    options = {}
+    while args:
+        arg = args.pop(0)
+        if arg == "-o":
+            output = args.pop(0)
+        elif arg in ("--first", "--last", "--spacing", "--height"):
+            options[arg[2:]] = int(args.pop(0))
+        elif arg == "--trim":
+            options["trim"] = True
+        elif source is None and not arg.startswith("-"):
+            source = arg
+        else:
+            print(usage)
+            return 2
+    if source is None or output is None:
+        print(usage)
+        return 2
+
+    with open(source) as f:
+        tables = convert(f.read(), **options)
+    name = output.replace("\\", "/").split("/")[-1][:-3] if output.endswith(".py") else output
+    with open(output, "w") as f:
+        f.write(write_module(tables, name, source.replace("\\", "/").split("/")[-1]))
+    print("{}: {} glyphs, {} bytes of glyph data".format(output, len(tables["WIDTHS"]), len(tables["COLUMNS"])))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
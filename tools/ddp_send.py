@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# NeoPixel Matrix for MicroPython
+# Sends frames to a matrix running FrameReceiver / NeoPixelMatrixAsync.receive_frames() (runs on a PC)
+# ddp_send.py
+#
+# python -m tools.ddp_send HOST "Some text" [--port 4048] [--width 32] [--height 8] [--fps 30] [--brightness 0.3]
+#
+# Frames are rendered with NeoPixelMatrix on the host backend, so `np.buf` already holds the bytes
+# the device's strip needs (same wiring, byte order and brightness), and is sent as it is.
+
+import socket
+import struct
+import sys
+import time
+
+DDP_PORT = 4048
+DDP_VERSION = 0x40
+DDP_PUSH = 0x01
+DDP_ID_DISPLAY = 1
+DDP_MAX_DATA = 1440
+
+
+class DDPSender:
+    """
+    Sends strip buffers as DDP packets of at most `fragment` data bytes; the last one has the push flag.
+    """
+
+    def __init__(self, host:str, port:int=DDP_PORT, fragment:int=DDP_MAX_DATA) -> None:
+        self.address = (host, port)
+        self.fragment = fragment
+        self.sequence = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def packet(self, data:bytes, offset:int, push:bool) -> bytes:
+        """
+        Return the next DDP packet with the given data, numbered 1-15.
+        """
+        self.sequence = self.sequence % 15 + 1
+        flags = DDP_VERSION | (DDP_PUSH if push else 0)
+        return struct.pack('>BBBBIH', flags, self.sequence, 0, DDP_ID_DISPLAY, offset, len(data)) + bytes(data)
+
+    def send(self, buf:bytes) -> None:
+        """
+        Send a whole strip buffer as one frame.
+        """
+        for offset in range(0, len(buf), self.fragment):
+            data = buf[offset:offset + self.fragment]
+            self.sock.sendto(self.packet(data, offset, offset + self.fragment >= len(buf)), self.address)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def main(argv:list) -> int:
+    usage = 'usage: ddp_send.py HOST TEXT [--port 4048] [--width 32] [--height 8] [--fps 30] [--brightness 0.3]'
+    args = list(argv)
+    positional = []
+    options = {"port": DDP_PORT, "width": 32, "height": 8, "fps": 30, "brightness": 0.3}
+    while args:
+        arg = args.pop(0)
+        if arg[2:] in options and arg.startswith("--"):
+            options[arg[2:]] = float(args.pop(0)) if arg == "--brightness" else int(args.pop(0))
+        elif not arg.startswith("-"):
+            positional.append(arg)
+        else:
+            print(usage)
+            return 2
+    if len(positional) != 2:
+        print(usage)
+        return 2
+
+    from micropython_neopixel_matrix.neopixel_matrix import NeoPixelMatrix
+
+    host, text = positional
+    matrix = NeoPixelMatrix(0, options["width"], options["height"], brightness=options["brightness"])
+    sender = DDPSender(host, options["port"])
+    try:
+        for _ in matrix._scroll_steps(text, 0, 0, (255, 0, 0), True, True):
+            matrix._update_np_from_fb()
+            sender.send(matrix.np.buf)
+            time.sleep(1 / options["fps"])
+    finally:
+        sender.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))